@@ -3,103 +3,177 @@
 
 import json
 import os
-import sys
-import io
+import argparse
 
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from catalog_tools import instrument
+from catalog_tools.console import utf8_stdout
+from catalog_tools.manifest import BadgeManifest, rebadge_batches, rebadge_incremental
+from catalog_tools.parallel import add_jobs_argument, map_stores, print_summary, resolve_jobs
+from catalog_tools.registry import discover_stores
+from catalog_tools.storeio import save_store as save_store_files
+from catalog_tools.stream import rewrite_store
 
-def calculate_badge(product):
-    """حساب التمييز بناءً على الإحصائيات"""
-    quantity = product.get('quantity', 0)
-    orders = product.get('orders', 0)
-    likes = product.get('likes', 0)
-    views = product.get('views', 0)
-    rating = product.get('rating', 0)
-    price = product.get('price', 0)
-    original_price = product.get('originalPrice', 0)
-    
-    # حساب نسبة التخفيف
-    discount = 0
-    if original_price > 0:
-        discount = ((original_price - price) / original_price) * 100
-    
-    # أولويات التمييز
-    if quantity <= 0:
-        return "غير متوفر"
-    elif discount > 10:
-        return "تخفيضات"
-    elif orders > 100 and likes > 200:
-        return "مميزة"
-    elif orders > 100:
-        return "أكثر مبيعاً"
-    elif likes > 200:
-        return "أكثر إعجاباً"
-    elif orders > 50:
-        return "أكثر طلباً"
-    elif views > 400:
-        return "أكثر مشاهدة"
-    else:
-        return "جديد"
+REQUIRED_FIELDS = ('rating', 'orders')
 
-def process_store(store_folder, store_name):
-    """معالجة ملف store.json لمتجر معين"""
+# المتاجر الأكبر من هذا الحجم تُقرأ وتُكتب متدفقة بدلاً من تحميلها كاملة
+LARGE_STORE_BYTES = 64 * 1024 * 1024
+
+# عدد المنتجات في كل دفعة عند المعالجة المتدفقة
+STREAM_BATCH_SIZE = 10_000
+
+def load_store(store_folder, store_name):
+    """تحميل ملف store.json لمتجر معين"""
     store_path = f"public/assets/{store_folder}/store.json"
     
     if not os.path.exists(store_path):
         print(f"WARNING: {store_path} لم يتم العثور عليه")
-        return False
+        return None
     
     try:
         with open(store_path, 'r', encoding='utf-8') as f:
-            store_data = json.load(f)
-        
-        products = store_data.get('products', [])
-        updated_count = 0
-        
-        for product in products:
-            if 'rating' in product and 'orders' in product:
-                old_badge = product.get('badge', '')
-                new_badge = calculate_badge(product)
-                product['badge'] = new_badge
-                
-                if old_badge != new_badge:
-                    updated_count += 1
-        
-        # حفظ البيانات المحدثة
-        with open(store_path, 'w', encoding='utf-8') as f:
-            json.dump(store_data, f, ensure_ascii=False, indent=2)
-        
-        # حفظ نسخة في dist
-        dist_path = f"dist/assets/{store_folder}/store.json"
-        os.makedirs(os.path.dirname(dist_path), exist_ok=True)
-        with open(dist_path, 'w', encoding='utf-8') as f:
-            json.dump(store_data, f, ensure_ascii=False, indent=2)
+            return json.load(f)
+    except Exception as e:
+        print(f"ERROR - {store_name}: {str(e)}")
+        return None
+
+def save_store(store_folder, store_name, store_data, updated_count, recomputed_count=None):
+    """حفظ ملف store.json المحدث ونسخته في dist (فقط إذا تغير المحتوى)"""
+    store_path = f"public/assets/{store_folder}/store.json"
+    dist_path = f"dist/assets/{store_folder}/store.json"
+    products = store_data.get('products', [])
+    
+    try:
+        written, mirrored = save_store_files(store_path, store_data, dist_path)
+        written = written or mirrored
         
-        print(f"OK - {store_name}: تم تحديث {updated_count} منتج من {len(products)}")
+        status = "تم الحفظ" if written else "بدون تغيير في الملفات"
+        if recomputed_count is None:
+            recomputed_count = len(products)
+        print(f"OK - {store_name}: تم تحديث {updated_count} منتج من {len(products)}"
+              f" (أعيد حساب {recomputed_count}) - {status}")
         return True
         
     except Exception as e:
         print(f"ERROR - {store_name}: {str(e)}")
         return False
 
-def main():
+def rebadge_store(store_folder, full=False):
+    """إعادة حساب شارات متجر واحد وحفظه وإرجاع إحصائيات المعالجة
+
+    يُقرأ الملف ويُكتب متدفقاً على دفعات، فالذاكرة لا تعتمد على حجم المتجر.
+    تعمل داخل عملية مستقلة في وضع --jobs، لذلك تعيد النتيجة بدلاً من طباعتها.
+    """
+    store_path = f"public/assets/{store_folder}/store.json"
+    dist_path = f"dist/assets/{store_folder}/store.json"
+    
+    with instrument.stage(f'store:{store_folder}'):
+        manifest = BadgeManifest(store_folder)
+        if full:
+            manifest.reset()
+        stats = {}
+        written, mirrored = rewrite_store(
+            store_path, dist_path,
+            transform=lambda batches: rebadge_batches(batches, manifest, REQUIRED_FIELDS, stats=stats),
+            batch_size=STREAM_BATCH_SIZE,
+        )
+        manifest.save()
+        instrument.count('products', stats.get('total', 0))
+        instrument.count('recomputed', stats.get('recomputed', 0))
+        instrument.count('badgesChanged', stats.get('updated', 0))
+    return {'updated': stats.get('updated', 0), 'recomputed': stats.get('recomputed', 0),
+            'total': stats.get('total', 0), 'written': written or mirrored}
+
+def describe_result(result):
+    """وصف نتيجة rebadge_store بنفس صيغة save_store"""
+    status = "تم الحفظ" if result['written'] else "بدون تغيير في الملفات"
+    return (f"تم تحديث {result['updated']} منتج من {result['total']}"
+            f" (أعيد حساب {result['recomputed']}) - {status}")
+
+def process_store(store_folder, store_name, full=False):
+    """معالجة ملف store.json لمتجر معين"""
+    try:
+        result = rebadge_store(store_folder, full)
+    except Exception as e:
+        print(f"ERROR - {store_name}: {str(e)}")
+        return False
+    print(f"OK - {store_name}: {describe_result(result)}")
+    return True
+
+def process_stores_parallel(stores, full, jobs):
+    """توزيع المتاجر على مجموعة عمليات (عملية لكل متجر)
+
+    كل عملية تعالج متجرها متدفقاً، فالمتاجر الكبيرة جداً لا تحتاج لتقسيم.
+    """
+    tasks = []
+    for folder, name in stores:
+        store_path = f"public/assets/{folder}/store.json"
+        if not os.path.exists(store_path):
+            print(f"WARNING: {store_path} لم يتم العثور عليه")
+            continue
+        tasks.append((name, (folder, full)))
+    
+    return print_summary(map_stores(rebadge_store, tasks, jobs), describe_result)
+
+def main(argv=None):
     """الدالة الرئيسية"""
-    stores = [
-        ('nawaem', 'نواعم'),
-        ('sheirine', 'شيرين'),
-        ('delta-store', 'دالتا ستور'),
-        ('pretty', 'بريتي'),
-        ('magna-beauty', 'ماغنا بيوتي')
-    ]
+    utf8_stdout()
+    parser = argparse.ArgumentParser(description="تطبيق نظام التمييز على المتاجر")
+    parser.add_argument('--full', action='store_true',
+                        help="إعادة حساب جميع المنتجات وتجاهل بيان الشارات")
+    add_jobs_argument(parser)
+    instrument.add_report_argument(parser)
+    args = parser.parse_args(argv)
+    jobs = resolve_jobs(args.jobs)
+    instrument.configure('apply_badges', args.report)
+    
+    stores = [(entry.folder, entry.name) for entry in discover_stores()]
     
     print("=" * 60)
     print("تطبيق نظام التمييز على المتاجر")
     print("=" * 60)
     
+    if jobs > 1:
+        success_count = process_stores_parallel(stores, args.full, jobs)
+        print("=" * 60)
+        print(f"تم معالجة {success_count} متجر بنجاح")
+        print("=" * 60)
+        return
+    
+    # تحميل المتاجر العادية ثم حساب الشارات للمنتجات المتغيرة في استدعاء واحد،
+    # أما المتاجر الكبيرة فتُعالج متدفقة كل منها على حدة
+    loaded = []
     success_count = 0
-    for folder, name in stores:
-        if process_store(folder, name):
-            success_count += 1
+    with instrument.stage('load'):
+        for folder, name in stores:
+            store_path = f"public/assets/{folder}/store.json"
+            if os.path.exists(store_path) and os.path.getsize(store_path) > LARGE_STORE_BYTES:
+                success_count += process_store(folder, name, args.full)
+                continue
+            store_data = load_store(folder, name)
+            if store_data is not None:
+                loaded.append((folder, name, store_data))
+                instrument.count('products', len(store_data.get('products', [])))
+    
+    # المنتجات التي لم تتغير مدخلاتها منذ آخر تشغيل لا يعاد حسابها
+    with instrument.stage('badges'):
+        manifests = [BadgeManifest(folder) for folder, _, _ in loaded]
+        if args.full:
+            for manifest in manifests:
+                manifest.reset()
+        counts = rebadge_incremental(
+            [store_data.get('products', []) for _, _, store_data in loaded],
+            manifests,
+            required=REQUIRED_FIELDS,
+        )
+        instrument.count('recomputed', sum(recomputed for _, recomputed in counts))
+        instrument.count('badgesChanged', sum(updated for updated, _ in counts))
+    
+    with instrument.stage('save'):
+        for (folder, name, store_data), manifest, (updated_count, recomputed_count) in zip(loaded, manifests, counts):
+            if save_store(folder, name, store_data, updated_count, recomputed_count):
+                manifest.save()
+                success_count += 1
+        instrument.count('stores', success_count)
     
     print("=" * 60)
     print(f"تم معالجة {success_count} متجر بنجاح")
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""أدوات صيانة كتالوجات المتاجر (public/assets/<store>/store.json).
+
+الحزمة تجمع المنطق المشترك بين سكربتات الصيانة في جذر المشروع
+(apply_badges.py و fix_badges.py و verify_badges.py ...) بدلاً من نسخه
+في كل سكربت.
+"""
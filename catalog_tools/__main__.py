@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""واجهة أوامر موحدة لأدوات الكتالوج.
+
+    python -m catalog_tools <command> [options]
+
+كل أمر يُستورد عند تشغيله فقط، فالأوامر الخفيفة (verify, lint-braces ...)
+لا تدفع تكلفة استيراد NumPy أو matplotlib. يعمل الأمر من جذر المشروع مهما
+كان المجلد الحالي، لأن السكربتات تستخدم مسارات نسبية (public/assets/...).
+"""
+
+import os
+import sys
+
+# الأمر: (الوحدة، الدالة، الوصف)
+COMMANDS = {
+    'badges': ('apply_badges', 'main', "إعادة حساب شارات المنتجات المتغيرة في كل المتاجر"),
+    'watch': ('catalog_tools.watch', 'main', "مراقبة المتاجر وإعادة حساب الشارات عند تعديلها"),
+    'verify': ('verify_badges', 'main', "التحقق من الشارات من اللقطات العمودية"),
+    'report': ('catalog_tools.report', 'main', "تقرير الشارات والمخزون والتخفيضات والفئات لكل المتاجر"),
+    'sync': ('catalog_tools.sync', 'main', "مزامنة dist/assets مع public/assets للمتاجر المتغيرة فقط"),
+    'assets': ('catalog_tools.assets', 'main', "التحقق من ملفات الصور المشار إليها في المتاجر"),
+    'dedup': ('catalog_tools.dedup', 'main', "كشف الصور المكررة بالمحتوى وتوحيد مراجعها في المتاجر"),
+    'variants': ('catalog_tools.derivatives', 'main', "توليد أحجام WebP لصور المنتجات (يتطلب Pillow)"),
+    'sprites': ('catalog_tools.sprites', 'main', "بناء أطالس شعارات البنوك والدفع والشحن (يتطلب Pillow)"),
+    'near-dups': ('catalog_tools.phash', 'main', "كشف الصور شبه المكررة بالبصمة الإدراكية (يتطلب Pillow)"),
+    'populate': ('populate_stores', 'main', "ملء المتاجر الفارغة من allStoreProducts.ts"),
+    'fill-stats': ('update_stores', 'main', "ملء الإحصائيات الناقصة للمنتجات"),
+    'diagrams': ('create_diagrams', 'main', "رسم مخطط البنية (يتطلب matplotlib)"),
+    'ids': ('catalog_tools.idindex', 'main', "مواضع معرفات المنتجات وكشف التعارضات"),
+    'splice': ('catalog_tools.splice', 'main', "تعديلات متعددة محددة بمراسٍ على ملف مصدر في مرور واحد"),
+    'codemod': ('catalog_tools.codemod', 'main', "تطبيق مجموعة قواعد إعادة كتابة على ملفات src/"),
+    'lint-braces': ('catalog_tools.braces', 'main', "فحص توازن الأقواس في ملفات المصدر"),
+}
+
+
+def usage(stream=sys.stdout):
+    stream.write("usage: python -m catalog_tools <command> [options]\n\n")
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, _, description) in COMMANDS.items():
+        stream.write(f"  {name:<{width}}  {description}\n")
+    stream.write("\n`python -m catalog_tools <command> --help` لخيارات كل أمر\n")
+
+
+def main(argv=None):
+    from .console import utf8_stdout
+
+    utf8_stdout()
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        usage()
+        return 0
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        sys.stderr.write(f"أمر غير معروف: {command}\n\n")
+        usage(sys.stderr)
+        return 2
+
+    module_name, func_name, _ = COMMANDS[command]
+    from importlib import import_module
+    from .paths import ROOT
+
+    root = str(ROOT)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    os.chdir(root)
+    sys.argv = [f'python -m catalog_tools {command}'] + args
+    result = getattr(import_module(module_name), func_name)(args)
+    return result if isinstance(result, int) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""التحقق من ملفات الأصول (الصور) المشار إليها في كل store.json.
+
+يجمع كل مسار /assets/... في كل متجر (صور المنتجات، الشعار، الشرائح، وأي
+حقل آخر) ويتحقق منه مقابل public/ و dist/ و backend/public، مثل
+tools/verify-assets.js لكن للأسطول كله في تشغيل واحد:
+
+    missing          - غير موجود في أي من المجلدات
+    case-mismatch    - موجود باختلاف حالة الأحرف فقط (يعمل على ويندوز/ماك
+                       ويفشل على خادم لينكس)
+    unused           - ملف وسائط تحت public/assets لا يشير إليه أي متجر ولا
+                       أي نص في src/
+
+لا يُستدعى stat لكل مسار: تُقرأ قوائم المجلدات مرة واحدة وتُخزن في
+.catalog-cache/assets.json مع وقت تعديل كل مجلد، فالمجلد الذي لم يتغير وقت
+تعديله (لم يُضف أو يُحذف منه ملف) لا يُعاد سرده. مراجع كل متجر تُخزن أيضاً
+حسب حجم store.json ووقت تعديله، وما تغير يُقرأ متدفقاً على عدة عمليات.
+
+    python -m catalog_tools assets [--format text|json] [--unused] [-j 0]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from .parallel import add_jobs_argument, map_stores, resolve_jobs
+from .paths import CACHE_DIR, ROOT
+from .registry import discover_stores
+from .storeio import write_if_changed
+
+CACHE_PATH = CACHE_DIR / 'assets.json'
+CACHE_VERSION = 1
+
+# المجلدات التي تُحل فيها مسارات /assets/... بالترتيب
+ASSET_ROOTS = ('public', 'dist', 'backend/public')
+
+MEDIA_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.webp', '.gif', '.svg', '.avif', '.ico',
+                              '.mp4', '.webm'))
+
+# ملفات مولدة من غيرها (أحجام الصور والأطالس): لا تُعد نسخاً مكررة ولا تُجزأ كأصول
+GENERATED_PREFIXES = ('assets/variants/', 'assets/sprites/')
+
+_ASSET_REF = re.compile(r'^/?assets/[^?#]*\.[A-Za-z0-9]+(?:[?#].*)?$')
+_SOURCE_REF = re.compile(r'''["'`(]/?(assets/[^"'`\s)$]+\.[A-Za-z0-9]+)''')
+
+
+def normalize(ref):
+    """المسار النسبي داخل الجذر ('assets/...') بدون ?query أو #fragment"""
+    ref = re.split(r'[?#]', ref, 1)[0]
+    return ref.lstrip('/')
+
+
+def is_generated(name):
+    return name.startswith(GENERATED_PREFIXES)
+
+
+def collect_refs(value, found):
+    """جمع كل النصوص التي تبدو كمسارات أصول في قيمة JSON (بشكل متكرر)"""
+    if isinstance(value, str):
+        if _ASSET_REF.match(value):
+            found.add(normalize(value))
+    elif isinstance(value, dict):
+        for item in value.values():
+            collect_refs(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            collect_refs(item, found)
+    return found
+
+
+def replace_refs(value, mapping):
+    """استبدال مسارات الأصول في قيمة JSON حسب mapping {'assets/..': 'assets/..'}
+
+    القواميس والقوائم تُعدل في مكانها مع الحفاظ على "/" البادئة و ?query.
+    تعيد (القيمة، عدد الاستبدالات).
+    """
+    if isinstance(value, str):
+        if _ASSET_REF.match(value):
+            ref = normalize(value)
+            target = mapping.get(ref)
+            if target is not None:
+                start = value.index(ref)
+                return value[:start] + target + value[start + len(ref):], 1
+        return value, 0
+    count = 0
+    if isinstance(value, dict):
+        for key, item in value.items():
+            new, replaced = replace_refs(item, mapping)
+            if replaced:
+                value[key] = new
+                count += replaced
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            new, replaced = replace_refs(item, mapping)
+            if replaced:
+                value[i] = new
+                count += replaced
+    return value, count
+
+
+def store_refs(store_path):
+    """كل مراجع الأصول في store.json بالقارئ المتدفق"""
+    from .stream import StoreReader
+
+    found = set()
+    with StoreReader(store_path) as reader:
+        for product in reader.products():
+            collect_refs(product, found)
+        collect_refs(reader.header, found)
+        collect_refs(reader.trailer, found)
+    return sorted(found)
+
+
+def source_refs(src_dir=ROOT / 'src'):
+    """مسارات /assets/... الثابتة المكتوبة في ملفات المصدر (للكشف عن غير المستخدم فقط)"""
+    from .braces import iter_sources
+
+    found = set()
+    for path in iter_sources([src_dir]):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            found.update(normalize(match) for match in _SOURCE_REF.findall(f.read()))
+    return found
+
+
+class AssetCache:
+    """قوائم المجلدات ومراجع المتاجر المخزنة مع أوقات التعديل"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.dirs = {}
+        self.stores = {}
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.dirs = data.get('dirs', {})
+            self.stores = data.get('stores', {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        payload = json.dumps({'version': CACHE_VERSION, 'dirs': self.dirs, 'stores': self.stores},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        write_if_changed(self.path, payload)
+
+    def listing(self, directory, key):
+        """(الملفات، المجلدات الفرعية) لمجلد، من الذاكرة إذا لم يتغير وقت تعديله"""
+        mtime_ns = os.stat(directory).st_mtime_ns
+        cached = self.dirs.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+        files, subdirs = [], []
+        with os.scandir(directory) as it:
+            for entry in it:
+                (subdirs if entry.is_dir() else files).append(entry.name)
+        files.sort()
+        subdirs.sort()
+        self.dirs[key] = [mtime_ns, files, subdirs]
+        self.dirty = True
+        return files, subdirs
+
+    def walk(self, root):
+        """كل الملفات تحت root/assets كمسارات نسبية ('assets/...')"""
+        base = ROOT / root
+        if not (base / 'assets').is_dir():
+            return []
+        result = []
+        pending = ['assets']
+        while pending:
+            relative = pending.pop()
+            files, subdirs = self.listing(base / relative, f'{root}:{relative}')
+            result.extend(f'{relative}/{name}' for name in files)
+            pending.extend(f'{relative}/{name}' for name in subdirs)
+        return result
+
+
+def fleet_refs(cache, jobs=1):
+    """{المتجر: [المراجع]} مع قراءة المتاجر المتغيرة فقط"""
+    entries = discover_stores()
+    stale = [entry for entry in entries
+             if cache.stores.get(entry.folder, {}).get('stat') != [entry.size, entry.mtime_ns]]
+    results = map_stores(store_refs, [(entry.folder, (entry.path,)) for entry in stale], jobs)
+    errors = {}
+    by_folder = {entry.folder: entry for entry in stale}
+    for result in results:
+        if result.ok:
+            entry = by_folder[result.key]
+            cache.stores[result.key] = {'stat': [entry.size, entry.mtime_ns], 'refs': result.value}
+            cache.dirty = True
+        else:
+            errors[result.key] = result.error.splitlines()[0]
+    folders = {entry.folder for entry in entries}
+    for folder in list(cache.stores):
+        if folder not in folders:
+            del cache.stores[folder]
+            cache.dirty = True
+    refs = {folder: cache.stores[folder]['refs'] for folder in sorted(folders) if folder in cache.stores}
+    return refs, errors
+
+
+def verify(jobs=1, check_unused=True):
+    """تقرير الأصول: missing و case-mismatch لكل متجر، و unused للأسطول"""
+    cache = AssetCache()
+    # سرد المجلدات عمل إدخال/إخراج، فيتم بالتوازي لكل جذر
+    with ThreadPoolExecutor(max_workers=len(ASSET_ROOTS)) as pool:
+        listings = dict(zip(ASSET_ROOTS, pool.map(cache.walk, ASSET_ROOTS)))
+    refs, errors = fleet_refs(cache, jobs)
+    cache.save()
+
+    existing = set()
+    by_lower = {}
+    for files in listings.values():
+        existing.update(files)
+        for name in files:
+            by_lower.setdefault(name.lower(), name)
+
+    stores = {}
+    referenced = set()
+    for folder, store_ref_list in refs.items():
+        missing, mismatched = [], []
+        for ref in store_ref_list:
+            referenced.add(ref)
+            if ref in existing:
+                continue
+            actual = by_lower.get(ref.lower())
+            if actual is not None:
+                mismatched.append({'ref': '/' + ref, 'actual': '/' + actual})
+            else:
+                missing.append('/' + ref)
+        stores[folder] = {'refs': len(store_ref_list), 'missing': missing, 'caseMismatch': mismatched}
+
+    unused = []
+    if check_unused:
+        referenced |= source_refs()
+        referenced_lower = {ref.lower() for ref in referenced}
+        unused = ['/' + name for name in sorted(listings['public'])
+                  if os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS and name.lower() not in referenced_lower]
+
+    return {
+        'roots': {root: len(files) for root, files in listings.items()},
+        'stores': stores,
+        'unused': unused,
+        'errors': errors,
+    }
+
+
+def format_text(report, show_unused=False):
+    lines = []
+    roots = ', '.join(f"{root}: {count}" for root, count in report['roots'].items())
+    lines.append(f"الملفات: {roots}")
+    for folder, summary in report['stores'].items():
+        problems = len(summary['missing']) + len(summary['caseMismatch'])
+        mark = '✅' if not problems else '❌'
+        lines.append(f"{mark} {folder}: {summary['refs']} مرجع، {len(summary['missing'])} مفقود،"
+                     f" {len(summary['caseMismatch'])} باختلاف حالة الأحرف")
+        for ref in summary['missing']:
+            lines.append(f"   missing: {ref}")
+        for item in summary['caseMismatch']:
+            lines.append(f"   case-mismatch: {item['ref']} -> {item['actual']}")
+    lines.append(f"ملفات غير مستخدمة في public/assets: {len(report['unused'])}")
+    if show_unused:
+        lines.extend(f"   unused: {ref}" for ref in report['unused'])
+    for folder, error in report['errors'].items():
+        lines.append(f"ERROR - {folder}: {error}")
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools assets',
+                                     description="التحقق من ملفات الصور المشار إليها في كل المتاجر")
+    parser.add_argument('--format', '-f', choices=('text', 'json'), default='text', help="صيغة المخرجات")
+    parser.add_argument('--unused', action='store_true', help="سرد الملفات غير المستخدمة (وليس عددها فقط)")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    report = verify(resolve_jobs(args.jobs))
+    if args.format == 'json':
+        sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+    else:
+        sys.stdout.write(format_text(report, args.unused))
+    failed = report['errors'] or any(summary['missing'] or summary['caseMismatch']
+                                     for summary in report['stores'].values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
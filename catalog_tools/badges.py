@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""محرك التمييز (الشارات) المشترك.
+
+تُحسب الشارات لكتالوج كامل دفعة واحدة: تُستخرج إحصائيات المنتجات كأعمدة
+NumPy ثم تُقيَّم القواعد كأقنعة منطقية على الأعمدة كلها بدلاً من سلسلة
+if/elif لكل منتج على حدة.
+
+القواعد مرتبة حسب الأولوية، وكل ملف تعريف (profile) هو ترتيب مختلف لنفس
+القواعد:
+    default    - القواعد المستخدمة في apply_badges.py و generate_store_json.py
+    low_stock  - نفس القواعد مع شارة "متوفر" للكميات الأقل من 5
+                 (كما في fix_badges.py و populate_pretty_store.py)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+STAT_FIELDS = ('quantity', 'price', 'originalPrice', 'orders', 'likes', 'views')
+
+DEFAULT_BADGE = 'جديد'
+
+BADGE_COLORS = {
+    'جديد': 'bg-teal-600 text-white',
+    'أكثر مبيعاً': 'bg-red-500 text-white',
+    'أكثر إعجاباً': 'bg-yellow-500 text-black',
+    'مميزة': 'bg-yellow-800 text-white',
+    'أكثر مشاهدة': 'bg-blue-900 text-white',
+    'أكثر طلباً': 'bg-orange-500 text-white',
+    'تخفيضات': 'bg-pink-600 text-white',
+    'غير متوفر': 'bg-orange-700 text-white',
+    'متوفر': 'bg-green-500 text-white',
+}
+DEFAULT_BADGE_COLOR = 'bg-gray-500 text-white'
+
+# حجم الجزء (shard) عند توزيع متجر كبير جداً على عدة عمليات
+SHARD_SIZE = 250_000
+
+
+def _out_of_stock(c):
+    return c['quantity'] <= 0
+
+
+def _low_stock(c):
+    return (c['quantity'] > 0) & (c['quantity'] < 5)
+
+
+def _discounted(c):
+    original = c['originalPrice']
+    safe = np.where(original > 0, original, 1)
+    discount = np.where(original > 0, (original - c['price']) / safe * 100, 0)
+    return discount > 10
+
+
+def _featured(c):
+    return (c['orders'] > 100) & (c['likes'] > 200)
+
+
+def _best_seller(c):
+    return c['orders'] > 100
+
+
+def _most_liked(c):
+    return c['likes'] > 200
+
+
+def _most_ordered(c):
+    return c['orders'] > 50
+
+
+def _most_viewed(c):
+    return c['views'] > 400
+
+
+PROFILES = {
+    'default': (
+        ('غير متوفر', _out_of_stock),
+        ('تخفيضات', _discounted),
+        ('مميزة', _featured),
+        ('أكثر مبيعاً', _best_seller),
+        ('أكثر إعجاباً', _most_liked),
+        ('أكثر طلباً', _most_ordered),
+        ('أكثر مشاهدة', _most_viewed),
+    ),
+    'low_stock': (
+        ('غير متوفر', _out_of_stock),
+        ('متوفر', _low_stock),
+        ('تخفيضات', _discounted),
+        ('مميزة', _featured),
+        ('أكثر مبيعاً', _best_seller),
+        ('أكثر إعجاباً', _most_liked),
+        ('أكثر طلباً', _most_ordered),
+        ('أكثر مشاهدة', _most_viewed),
+    ),
+}
+
+
+def _number(value):
+    """تحويل قيمة إحصائية إلى رقم (القيم الفارغة أو غير الرقمية = 0)"""
+    if value is None or isinstance(value, bool):
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def extract_columns(products):
+    """استخراج إحصائيات المنتجات كأعمدة float64"""
+    count = len(products)
+    return {
+        field: np.fromiter((_number(p.get(field, 0)) for p in products),
+                           dtype=np.float64, count=count)
+        for field in STAT_FIELDS
+    }
+
+
+def compute_badges(columns, profile='default'):
+    """حساب الشارات لأعمدة كاملة دفعة واحدة
+
+    تعيد مصفوفتين بنفس الطول: الشارات وألوانها (badgeColor).
+    """
+    try:
+        rules = PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"ملف تعريف غير معروف: {profile}") from None
+
+    labels = [label for label, _ in rules] + [DEFAULT_BADGE]
+    conditions = [rule(columns) for _, rule in rules]
+    index = np.select(conditions, np.arange(len(rules)), default=len(rules))
+
+    badges = np.array(labels, dtype=object)[index]
+    colors = np.array([BADGE_COLORS.get(label, DEFAULT_BADGE_COLOR) for label in labels],
+                      dtype=object)[index]
+    return badges, colors
+
+
+def compute_badges_sharded(columns, profile='default', jobs=1, shard_size=SHARD_SIZE):
+    """مثل compute_badges مع توزيع الأعمدة الكبيرة على عدة عمليات"""
+    count = len(columns['quantity'])
+    if jobs <= 1 or count <= shard_size:
+        return compute_badges(columns, profile)
+
+    shards = [{field: column[start:start + shard_size] for field, column in columns.items()}
+              for start in range(0, count, shard_size)]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(shards))) as pool:
+        parts = list(pool.map(compute_badges, shards, [profile] * len(shards)))
+    return (np.concatenate([badges for badges, _ in parts]),
+            np.concatenate([colors for _, colors in parts]))
+
+
+def calculate_badge(product, profile='default'):
+    """حساب شارة منتج واحد (واجهة متوافقة مع النسخ القديمة)"""
+    badges, _ = compute_badges(extract_columns([product]), profile)
+    return badges[0]
+
+
+def get_badge_color(badge):
+    """الحصول على لون الشارة"""
+    return BADGE_COLORS.get(badge, DEFAULT_BADGE_COLOR)
+
+
+def apply_badges(products, profile='default', with_color=False, required=(), jobs=1):
+    """تطبيق الشارات على قائمة منتجات وإرجاع عدد المنتجات التي تغيرت شارتها
+
+    المنتجات التي ينقصها أي من الحقول في `required` تبقى كما هي.
+    """
+    return apply_badges_to_catalogs([products], profile, with_color, required, jobs)[0]
+
+
+def apply_badges_to_catalogs(catalogs, profile='default', with_color=False, required=(), jobs=1):
+    """تطبيق الشارات على عدة كتالوجات في استدعاء واحد للمحرك
+
+    `catalogs` قائمة من قوائم المنتجات (قائمة لكل متجر). تُدمج المنتجات
+    كلها في أعمدة واحدة ثم تُوزع النتائج، وتُعاد قائمة بعدد المنتجات التي
+    تغيرت في كل كتالوج. مع jobs > 1 تُوزع الكتالوجات الكبيرة على عدة عمليات.
+    """
+    selected = []
+    owners = []
+    for owner, products in enumerate(catalogs):
+        for product in products:
+            if all(k in product for k in required):
+                selected.append(product)
+                owners.append(owner)
+
+    changed = [0] * len(catalogs)
+    if not selected:
+        return changed
+
+    badges, colors = compute_badges_sharded(extract_columns(selected), profile, jobs)
+    for product, owner, badge, color in zip(selected, owners, badges.tolist(), colors.tolist()):
+        if product.get('badge') != badge:
+            changed[owner] += 1
+        product['badge'] = badge
+        if with_color:
+            product['badgeColor'] = color
+    return changed
+
+
+def badge_summary(products):
+    """عدد المنتجات لكل شارة"""
+    summary = {}
+    for product in products:
+        badge = product.get('badge', DEFAULT_BADGE)
+        summary[badge] = summary.get(badge, 0) + 1
+    return summary
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""قياس أداء أدوات الكتالوج على كتالوجات اصطناعية حتمية.
+
+    python -m catalog_tools.bench --sizes 1000,10000,100000 --output bench.json
+
+synth يولد الكتالوجات، و run يقيس كل مرحلة (استخراج TS، تحميل JSON، حساب
+الشارات، التحويل إلى JSON، نسخ dist، التحقق) ويُخرج النتائج كـ JSON.
+"""
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""تشغيل مراحل القياس وإخراج النتائج كـ JSON.
+
+كل مرحلة تُشغل `--repeat` مرات على نفس الكتالوج ويُسجل أسرع زمن والمتوسط.
+الملفات تُولد في مجلد مؤقت (أو `--workdir`) ولا تُلمس ملفات المشروع أو
+ذاكرة .catalog-cache.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from . import synth
+from ..badges import apply_badges
+from ..snapshot import Snapshot, build_snapshot
+from ..storeio import atomic_write, dump_store, load_store, mirror
+from ..stream import rewrite_store
+from ..tsparse import parse_source
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+class Workload:
+    """ملفات كتالوج اصطناعي واحد والحالة المشتركة بين المراحل"""
+
+    def __init__(self, root, size, seed):
+        self.size = size
+        self.dir = Path(root) / f'bench-{size}'
+        self.store_path = self.dir / 'store.json'
+        self.dist_path = self.dir / 'dist' / 'store.json'
+        self.ts_path = self.dir / 'products.ts'
+        self.snapshot_path = self.dir / 'store.cols'
+        os.makedirs(self.dir, exist_ok=True)
+        synth.write_store(self.store_path, size, seed)
+        synth.write_products_ts(self.ts_path, size, seed)
+        self.store = None
+        self.payload = None
+
+
+def _ts_extract(w):
+    with open(w.ts_path, 'r', encoding='utf-8') as f:
+        return len(parse_source(f.read())['products'])
+
+
+def _json_load(w):
+    w.store = load_store(w.store_path)
+    return len(w.store['products'])
+
+
+def _badges(w):
+    return apply_badges(w.store['products'], with_color=True)
+
+
+def _serialize(w):
+    w.payload = dump_store(w.store)
+    return len(w.payload)
+
+
+def _write(w):
+    atomic_write(w.store_path, w.payload)
+    return len(w.payload)
+
+
+def _clear_dist(w):
+    shutil.rmtree(w.dist_path.parent, ignore_errors=True)
+
+
+def _mirror(w):
+    return mirror(w.store_path, w.dist_path, w.payload)
+
+
+def _snapshot(w):
+    payload = build_snapshot(w.store, w.store_path.stat())
+    atomic_write(w.snapshot_path, payload)
+    return len(payload)
+
+
+def _verify(w):
+    with Snapshot(w.snapshot_path) as snapshot:
+        badges = Counter(snapshot.column('badge'))
+        return {snapshot.string(index): count for index, count in badges.items()}
+
+
+def _stream_rebadge(w):
+    def rebadge(batches):
+        for batch in batches:
+            apply_badges(batch, with_color=True)
+            yield batch
+    rewrite_store(w.store_path, w.dist_path, transform=rebadge, snapshot=False)
+
+
+def _need_store(w):
+    if w.store is None:
+        _json_load(w)
+
+
+def _need_payload(w):
+    _need_store(w)
+    if w.payload is None:
+        _serialize(w)
+
+
+def _need_snapshot(w):
+    if not w.snapshot_path.exists():
+        _need_store(w)
+        _snapshot(w)
+
+
+# (الاسم، الدالة، تهيئة قبل كل تكرار، متطلبات من مراحل سابقة لا تُقاس)
+STAGES = (
+    ('ts_extract', _ts_extract, None, None),
+    ('json_load', _json_load, None, None),
+    ('badges', _badges, None, _need_store),
+    ('serialize', _serialize, None, _need_store),
+    ('write', _write, None, _need_payload),
+    ('mirror', _mirror, _clear_dist, _need_payload),
+    ('snapshot', _snapshot, None, _need_store),
+    ('verify', _verify, None, _need_snapshot),
+    ('stream_rebadge', _stream_rebadge, None, None),
+)
+STAGE_NAMES = tuple(name for name, _, _, _ in STAGES)
+
+
+def run_stage(workload, func, setup=None, repeat=3):
+    """تشغيل مرحلة repeat مرات وإرجاع الأزمنة بالثواني"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup(workload)
+        start = time.perf_counter()
+        func(workload)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_size(root, size, seed=0, repeat=3, stages=STAGE_NAMES, log=None):
+    """قياس كل المراحل لكتالوج بحجم size"""
+    start = time.perf_counter()
+    workload = Workload(root, size, seed)
+    generate = time.perf_counter() - start
+    entry = {
+        'products': size,
+        'storeBytes': workload.store_path.stat().st_size,
+        'tsBytes': workload.ts_path.stat().st_size,
+        'generateSeconds': generate,
+        'stages': {},
+    }
+    for name, func, setup, requires in STAGES:
+        if name not in stages:
+            continue
+        if requires is not None:
+            requires(workload)
+        timings = run_stage(workload, func, setup, repeat)
+        entry['stages'][name] = {
+            'best': min(timings),
+            'mean': sum(timings) / len(timings),
+            'runs': timings,
+            'perProductUs': min(timings) / size * 1e6 if size else 0.0,
+        }
+        if log is not None:
+            log(f"  {name}: {min(timings):.4f}s")
+    return entry
+
+
+def environment():
+    """وصف البيئة المرفق بالنتائج لمقارنة التشغيلات"""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': numpy_version,
+    }
+
+
+def run(sizes=DEFAULT_SIZES, seed=0, repeat=3, stages=STAGE_NAMES, workdir=None, log=None):
+    """تشغيل القياس لكل الأحجام وإرجاع قاموس النتائج"""
+    results = {
+        'version': RESULTS_VERSION,
+        'seed': seed,
+        'repeat': repeat,
+        'startedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': environment(),
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory(prefix='catalog-bench-', dir=workdir) as root:
+        for size in sizes:
+            if log is not None:
+                log(f"📦 {size} منتج")
+            results['results'].append(run_size(root, size, seed, repeat, stages, log))
+            shutil.rmtree(Path(root) / f'bench-{size}', ignore_errors=True)
+    return results
+
+
+def _sizes(value):
+    sizes = []
+    for part in value.split(','):
+        part = part.strip().lower().replace('_', '')
+        multiplier = 1
+        if part.endswith('k'):
+            part, multiplier = part[:-1], 1_000
+        elif part.endswith('m'):
+            part, multiplier = part[:-1], 1_000_000
+        sizes.append(int(float(part) * multiplier))
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools.bench',
+                                     description="قياس أداء أدوات الكتالوج على كتالوجات اصطناعية")
+    parser.add_argument('--sizes', type=_sizes, default=list(DEFAULT_SIZES),
+                        help="أحجام الكتالوجات مفصولة بفواصل (مثل 1k,10k,1m)")
+    parser.add_argument('--seed', type=int, default=0, help="بذرة المولد (نفس البذرة = نفس الكتالوج)")
+    parser.add_argument('--repeat', type=int, default=3, help="عدد تكرارات كل مرحلة")
+    parser.add_argument('--stages', default=','.join(STAGE_NAMES),
+                        help="المراحل المطلوبة مفصولة بفواصل: " + ', '.join(STAGE_NAMES))
+    parser.add_argument('--workdir', help="مجلد الملفات المؤقتة (الافتراضي مجلد النظام المؤقت)")
+    parser.add_argument('--output', '-o', help="ملف النتائج JSON (الافتراضي stdout)")
+    args = parser.parse_args(argv)
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stages if name not in STAGE_NAMES]
+    if unknown:
+        parser.error(f"مراحل غير معروفة: {', '.join(unknown)}")
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    results = run(args.sizes, args.seed, max(1, args.repeat), stages, args.workdir, log)
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        log(f"✅ تم حفظ النتائج: {args.output}")
+    else:
+        print(text)
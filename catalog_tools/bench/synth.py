@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""توليد كتالوجات اصطناعية حتمية بشكل public/assets/nawaem/store.json.
+
+نفس البذرة (seed) ونفس العدد يعطيان نفس الملف بايتاً ببايت، فيمكن مقارنة
+نتائج القياس بين التشغيلات والأجهزة. المنتجات تُولد واحداً تلو الآخر
+وتُكتب بـ StoreWriter، فتوليد مليون منتج لا يحتاج الكتالوج كاملاً في الذاكرة.
+"""
+
+import json
+import random
+
+from ..stream import StoreWriter
+
+CATEGORIES = ('فساتين سهرة', 'فساتين يومية', 'فساتين رسمية', 'عبايات فاخرة',
+              'حجاب حريري', 'حقائب جلدية', 'ملابس أطفال', 'عطور', 'مستحضرات تجميل')
+NOUNS = ('فستان', 'عباية', 'حجاب', 'حقيبة', 'طقم', 'بلوزة', 'تنورة', 'وشاح', 'عطر', 'كريم')
+ADJECTIVES = ('راقي', 'فاخر', 'أنيق', 'كلاسيكي', 'عصري', 'ناعم', 'مطرز', 'حريري', 'يومي', 'مميز')
+COLORS = (('ذهبي', '#F59E0B'), ('فضي', '#9CA3AF'), ('وردي', '#F472B6'), ('أسود', '#111827'),
+          ('أبيض', '#FFFFFF'), ('أزرق', '#3B82F6'), ('أخضر', '#10B981'), ('بنفسجي', '#8B5CF6'))
+SIZES = ('XS', 'S', 'M', 'L', 'XL', 'XXL')
+BADGES = ('جديد', 'تخفيضات', 'أكثر مبيعاً', 'أكثر طلباً', 'أكثر إعجاباً', 'أكثر مشاهدة', '')
+
+
+def generate_product(rng, index, store_id=1, slug='bench'):
+    """منتج اصطناعي واحد بنفس حقول منتجات نواعم"""
+    noun = rng.choice(NOUNS)
+    name = f"{noun} {rng.choice(ADJECTIVES)} {rng.choice(COLORS)[0]}"
+    price = rng.randrange(20, 2000, 5)
+    discounted = rng.random() < 0.4
+    sizes = sorted(rng.sample(SIZES, rng.randint(1, len(SIZES))), key=SIZES.index)
+    colors = rng.sample(COLORS, rng.randint(1, 4))
+    quantity = rng.choice((0, rng.randint(1, 5), rng.randint(6, 200)))
+    return {
+        'id': 1000 + index,
+        'storeId': store_id,
+        'name': name,
+        'description': f"{name} من تشكيلة {slug} بجودة عالية وتصميم مميز",
+        'price': price,
+        'originalPrice': round(price * rng.uniform(1.05, 1.6)) if discounted else price,
+        'sizes': sizes,
+        'availableSizes': sizes[:max(1, len(sizes) - rng.randint(0, 2))],
+        'colors': [{'name': color, 'value': value} for color, value in colors],
+        'category': rng.choice(CATEGORIES),
+        'inStock': quantity > 0,
+        'isAvailable': quantity > 0,
+        'images': [f"/assets/{slug}/product{index % 500 + 1}_{n}.jpg"
+                   for n in range(1, rng.randint(1, 4) + 1)],
+        'rating': round(rng.uniform(3.0, 5.0), 1),
+        'reviews': rng.randint(0, 500),
+        'views': rng.randint(0, 5000),
+        'likes': rng.randint(0, 1000),
+        'orders': rng.randint(0, 300),
+        'quantity': quantity,
+        'badge': rng.choice(BADGES),
+    }
+
+
+def iter_products(count, seed=0, store_id=1, slug='bench'):
+    """توليد count منتجاً اصطناعياً بترتيب ثابت"""
+    rng = random.Random(f'{seed}:{slug}')
+    for index in range(count):
+        yield generate_product(rng, index, store_id, slug)
+
+
+def store_header(slug='bench', store_id=1):
+    """حقول المتجر التي تسبق products في store.json"""
+    return {
+        'id': 1763895960000 + store_id,
+        'storeId': store_id,
+        'slug': slug,
+        'name': 'متجر القياس',
+        'subdomain': slug,
+        'storeSlug': slug,
+        'nameAr': 'متجر القياس',
+        'nameEn': 'Benchmark Store',
+        'description': 'متجر اصطناعي لقياس أداء أدوات الكتالوج',
+        'icon': '📦',
+        'color': 'from-amber-400 to-yellow-600',
+        'logo': f'/assets/stores/{slug}.webp',
+        'categories': list(CATEGORIES),
+    }
+
+
+def store_trailer(slug='bench'):
+    """حقول المتجر التي تلي products في store.json"""
+    return {
+        'sliderImages': [{
+            'id': f'{slug}-banner{n}',
+            'title': 'تشكيلة جديدة',
+            'subtitle': '',
+            'buttonText': 'تسوق الآن',
+            'image': f'/assets/{slug}/banner{n}.jpg',
+        } for n in range(1, 4)],
+        'status': 'active',
+        'createdAt': '2025-11-24T10:45:00.000Z',
+    }
+
+
+def write_store(path, count, seed=0, slug='bench', store_id=1):
+    """كتابة store.json اصطناعي بـ count منتجاً متدفقاً"""
+    with StoreWriter(path) as writer:
+        writer.write_fields(store_header(slug, store_id))
+        writer.begin_products()
+        for product in iter_products(count, seed, store_id, slug):
+            writer.write_product(product)
+        writer.end_products()
+        writer.write_fields(store_trailer(slug))
+    return path
+
+
+def _ts_value(value):
+    if isinstance(value, dict):
+        return '{ ' + ', '.join(f'{key}: {_ts_value(item)}' for key, item in value.items()) + ' }'
+    if isinstance(value, list):
+        return '[' + ', '.join(_ts_value(item) for item in value) + ']'
+    if isinstance(value, str):
+        return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+    return json.dumps(value)
+
+
+def write_products_ts(path, count, seed=0, slug='bench', store_id=1):
+    """كتابة products.ts بنفس المنتجات بصيغة src/data/stores/*/products.ts"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("import type { Product } from '../../storeProducts';\n\n")
+        f.write(f"const STORE_ID = {store_id};\n\n")
+        f.write(f"export const {slug}Products: Product[] = [\n")
+        for product in iter_products(count, seed, store_id, slug):
+            f.write(f"  {_ts_value(product)},\n")
+        f.write("];\n")
+    return path
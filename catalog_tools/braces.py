@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""فحص توازن الأقواس {} () [] في ملفات TS/TSX/JS (كان .tmp_brace_check.py).
+
+الفحص بمسح واحد للنص يفهم بنية المصدر، فالأقواس داخل هذه لا تُحسب:
+النصوص '...' و "..."، التعليقات، التعبيرات النمطية /.../، الأجزاء النصية من
+القوالب `...` (مع حساب ${...})، ونصوص JSX بين الوسوم (مع حساب {...}).
+التعبير النمطي ووسم JSX يُميَّزان عن القسمة والمقارنة بالرمز السابق: بعد
+معامل (اسم، رقم، ")" ...) تكون "/" قسمة و "<" مقارنة.
+
+يُستخدم مكدس للأقواس فيُبلَّغ عن أول خطأ بسطره وعموده: إغلاق بلا فتح، إغلاق
+لا يطابق آخر قوس مفتوح، أو قوس بقي مفتوحاً حتى نهاية الملف. يمكن فحص مجلد
+src/ كله على عدة عمليات، فيصلح كفحص قبل الإيداع (pre-commit):
+
+    python -m catalog_tools lint-braces [src/pages/Foo.tsx ...] [-j 0]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from .paths import ROOT
+
+DEFAULT_PATHS = (ROOT / 'src',)
+EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+JSX_EXTENSIONS = ('.tsx', '.jsx')
+SKIP_DIRS = frozenset(('node_modules', 'dist', 'build', '.git'))
+
+# (الاسم، الفتح، الإغلاق)
+PAIRS = (('curly', '{', '}'), ('paren', '(', ')'), ('square', '[', ']'))
+CLOSERS = {closer: opener for _, opener, closer in PAIRS}
+
+Issue = namedtuple('Issue', 'kind char line column message')
+
+# كلمات يليها تعبير، فـ "/" أو "<" بعدها بداية تعبير نمطي أو وسم JSX
+_EXPRESSION_KEYWORDS = frozenset(
+    'return typeof instanceof in of new delete void throw case do else yield await'.split())
+
+_CODE_SKIP = re.compile(r'[^{}()\[\]\'"`/<]+')
+_CODE_SKIP_NO_JSX = re.compile(r'[^{}()\[\]\'"`/]+')
+_STRINGS = {
+    "'": re.compile(r"'(?:[^'\\\n]|\\.)*'", re.S),
+    '"': re.compile(r'"(?:[^"\\\n]|\\.)*"', re.S),
+}
+_LINE_COMMENT = re.compile(r'//[^\n]*')
+_BLOCK_COMMENT = re.compile(r'/\*.*?(?:\*/|\Z)', re.S)
+_REGEX_LITERAL = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_TEMPLATE_TEXT = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*', re.S)
+_PREVIOUS_WORD = re.compile(r'[\w$]+$')
+
+_JSX_OPEN = re.compile(r'<(?:(?=>)|[A-Za-z_$][\w$.:-]*(?=[\s/>{]))')
+_TAG_SKIP = re.compile(r'(?:\s+|[\w$:.-]+|=|"[^"]*"|\'[^\']*\')+')
+_JSX_TEXT = re.compile(r'[^{<]+')
+_JSX_CLOSE = re.compile(r'</[^>]*>?')
+
+# أوضاع المسح
+CODE, TEMPLATE, TAG, CHILDREN = 'code', 'template', 'tag', 'children'
+_UNTERMINATED = {TEMPLATE: ('`', "قالب نصي غير مغلق"),
+                 TAG: ('<', "وسم JSX غير مغلق"),
+                 CHILDREN: ('<', "عنصر JSX بدون وسم إغلاق")}
+
+
+def _after_operand(text, pos):
+    """هل الرمز السابق لـ pos معامل (فتكون / قسمة و < مقارنة)"""
+    i = pos - 1
+    while i >= 0 and text[i] in ' \t\r\n':
+        i -= 1
+    if i < 0:
+        return False
+    ch = text[i]
+    if ch in ')]}\'"`':
+        return True
+    if ch.isalnum() or ch in '_$':
+        word = _PREVIOUS_WORD.search(text, max(0, i - 32), i + 1).group()
+        return word not in _EXPRESSION_KEYWORDS
+    return False
+
+
+def scan(text, jsx=True, start=0, until_closed=False):
+    """أول خطأ كـ (النوع، الحرف، الإزاحة، إزاحة القوس المقابل أو None)، أو None للنص المتوازن
+
+    مع until_closed يبدأ المسح من start (في سياق شيفرة) ويتوقف عند إغلاق
+    أول قوس فيعيد ('closed', الحرف، إزاحة الإغلاق، إزاحة الفتح).
+    """
+    code_skip = (_CODE_SKIP if jsx else _CODE_SKIP_NO_JSX).match
+    length = len(text)
+    # عناصر المكدس: (القوس، الإزاحة، هل فُتح وضع مسح جديد معه)
+    brackets = []
+    # عناصر الأوضاع: (الوضع، إزاحة البداية)
+    modes = [(CODE, start)]
+    mode = CODE
+    pos = start
+
+    while pos < length:
+        if mode == CODE:
+            m = code_skip(text, pos)
+            if m:
+                pos = m.end()
+                if pos >= length:
+                    break
+            ch = text[pos]
+            if ch in '{([':
+                brackets.append((ch, pos, False))
+                pos += 1
+            elif ch in '})]':
+                opener = CLOSERS[ch]
+                if not brackets:
+                    return 'unexpected', ch, pos, None
+                top, top_pos, pushed = brackets[-1]
+                if top != opener:
+                    return 'mismatch', ch, pos, top_pos
+                brackets.pop()
+                if until_closed and not brackets:
+                    return 'closed', ch, pos, top_pos
+                pos += 1
+                if pushed:
+                    modes.pop()
+                    mode = modes[-1][0]
+            elif ch in '\'"':
+                m = _STRINGS[ch].match(text, pos)
+                pos = m.end() if m else pos + 1
+            elif ch == '`':
+                modes.append((TEMPLATE, pos))
+                mode = TEMPLATE
+                pos += 1
+            elif ch == '/':
+                nxt = text[pos + 1:pos + 2]
+                if nxt == '/':
+                    pos = _LINE_COMMENT.match(text, pos).end()
+                elif nxt == '*':
+                    pos = _BLOCK_COMMENT.match(text, pos).end()
+                else:
+                    m = None if _after_operand(text, pos) else _REGEX_LITERAL.match(text, pos)
+                    pos = m.end() if m else pos + 1
+            else:  # '<' في ملفات JSX
+                m = None if _after_operand(text, pos) else _JSX_OPEN.match(text, pos)
+                if m:
+                    modes.append((TAG, pos))
+                    mode = TAG
+                    pos = m.end()
+                else:
+                    pos += 1
+
+        elif mode == TEMPLATE:
+            pos = _TEMPLATE_TEXT.match(text, pos).end()
+            if pos >= length:
+                break
+            if text[pos] == '`':
+                modes.pop()
+                mode = modes[-1][0]
+                pos += 1
+            else:  # '${'
+                brackets.append(('{', pos + 1, True))
+                modes.append((CODE, pos))
+                mode = CODE
+                pos += 2
+
+        elif mode == TAG:
+            m = _TAG_SKIP.match(text, pos)
+            if m:
+                pos = m.end()
+                if pos >= length:
+                    break
+            ch = text[pos]
+            if ch == '{':
+                brackets.append(('{', pos, True))
+                modes.append((CODE, pos))
+                mode = CODE
+                pos += 1
+            elif text.startswith('/>', pos):
+                modes.pop()
+                mode = modes[-1][0]
+                pos += 2
+            elif ch == '>':
+                modes[-1] = (CHILDREN, modes[-1][1])
+                mode = CHILDREN
+                pos += 1
+            else:
+                pos += 1
+
+        else:  # CHILDREN
+            m = _JSX_TEXT.match(text, pos)
+            if m:
+                pos = m.end()
+                if pos >= length:
+                    break
+            if text[pos] == '{':
+                brackets.append(('{', pos, True))
+                modes.append((CODE, pos))
+                mode = CODE
+                pos += 1
+            elif text.startswith('</', pos):
+                pos = _JSX_CLOSE.match(text, pos).end()
+                modes.pop()
+                mode = modes[-1][0]
+            else:
+                m = _JSX_OPEN.match(text, pos)
+                if m:
+                    modes.append((TAG, pos))
+                    mode = TAG
+                    pos = m.end()
+                else:
+                    pos += 1
+
+    if brackets:
+        # أعمق قوس مفتوح: ما بعده كان متوازناً
+        top, top_pos, _ = brackets[-1]
+        return 'unclosed', top, top_pos, None
+    if len(modes) > 1:
+        kind, start = modes[-1]
+        return 'unterminated', _UNTERMINATED[kind][0], start, kind
+    return None
+
+
+def find_closing(text, pos, jsx=True):
+    """إزاحة القوس الذي يغلق القوس الموجود عند pos، أو None إذا لم يُغلق"""
+    if text[pos:pos + 1] not in ('{', '(', '['):
+        raise ValueError(f"لا يوجد قوس فتح عند الإزاحة {pos}")
+    found = scan(text, jsx, start=pos, until_closed=True)
+    if found is None or found[0] != 'closed':
+        return None
+    return found[2]
+
+
+def check_text(text, jsx=True):
+    """أول خطأ في النص كـ Issue (بسطر وعمود)، أو None"""
+    from .srcpos import SourceIndex
+
+    found = scan(text, jsx)
+    if found is None:
+        return None
+    kind, char, offset, related = found
+    index = SourceIndex(text)
+    if kind == 'unexpected':
+        message = f"'{char}' بدون قوس فتح"
+    elif kind == 'mismatch':
+        message = f"'{char}' لا يطابق '{text[related]}' المفتوح عند {index.describe(related)}"
+    elif kind == 'unclosed':
+        message = f"'{char}' غير مغلق حتى نهاية الملف"
+    else:
+        message = _UNTERMINATED[related][1]
+    line, column = index.line_col(offset)
+    return Issue(kind, char, line, column, message)
+
+
+def check_file(path):
+    path = Path(path)
+    return check_text(path.read_text(encoding='utf-8-sig'), jsx=path.suffix in JSX_EXTENSIONS)
+
+
+def is_balanced(result):
+    return result is None
+
+
+def iter_sources(paths):
+    """ملفات المصدر في المسارات المعطاة (المجلدات تُمسح بشكل متكرر)"""
+    for path in paths:
+        path = Path(path)
+        if not path.is_dir():
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+            for name in sorted(filenames):
+                if name.endswith(EXTENSIONS):
+                    yield Path(dirpath) / name
+
+
+def _display(path):
+    try:
+        return Path(path).resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def main(argv=None):
+    from .parallel import add_jobs_argument, map_stores, resolve_jobs
+
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools lint-braces',
+                                     description="فحص توازن الأقواس في ملفات المصدر")
+    parser.add_argument('paths', nargs='*', default=list(DEFAULT_PATHS),
+                        help="ملفات أو مجلدات (الافتراضي src/)")
+    add_jobs_argument(parser)
+    parser.set_defaults(jobs=0)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    files = list(iter_sources(args.paths))
+    results = map_stores(check_file, [(str(path), (path,)) for path in files], resolve_jobs(args.jobs))
+
+    failed = 0
+    for result in results:
+        if not result.ok:
+            failed += 1
+            print(f"{_display(result.key)}: ERROR - {result.error.splitlines()[0]}")
+        elif result.value is not None:
+            failed += 1
+            issue = result.value
+            print(f"{_display(result.key)}:{issue.line}:{issue.column}: {issue.message}")
+    elapsed = time.perf_counter() - started
+    print(f"{len(files)} ملف، {failed} بأخطاء ({elapsed:.2f}s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""تشغيل مجموعات قواعد إعادة الكتابة (codemods) على شجرة المصدر.
+
+القاعدة (Rule) تعبير نمطي يُجمَّع مرة واحدة مع نص الاستبدال وشروط:
+
+- guard: نص يجب أن يحتويه الملف (فحص سريع قبل تشغيل التعبير)، أو دالة
+  تستقبل النص وتعيد True إذا وجب تطبيق القاعدة.
+- files: أنماط fnmatch لمسارات الملفات (نسبية لجذر المشروع).
+
+مجموعة القواعد (RuleSet) تُعرَّف في وحدة Python كمتغير RULES وتُحمَّل بـ
+"module" أو "module:attr". كل ملف يُقرأ مرة وتُطبق عليه كل القواعد في
+الذاكرة ثم يُكتب مرة واحدة (ذرياً) إذا تغير. الملفات تُوزع على عمليات في
+دفعات، وكل عملية تحمّل القواعد مرة واحدة. مع --dry-run يُطبع فرق unified.
+
+    python -m catalog_tools codemod fix_errors [src/ ...] [--dry-run] [-j 0]
+"""
+
+import argparse
+import difflib
+import re
+import sys
+import time
+from collections import Counter
+from fnmatch import fnmatch
+from importlib import import_module
+from pathlib import Path
+
+from .braces import iter_sources
+from .parallel import add_jobs_argument, map_stores, resolve_jobs
+from .paths import ROOT
+from .storeio import atomic_write
+
+# عدد الدفعات لكل عملية: دفعات أصغر توزع الحمل أفضل، وأكبر تقلل تكلفة التوزيع
+CHUNKS_PER_JOB = 4
+
+
+class Rule:
+    """قاعدة إعادة كتابة واحدة"""
+
+    def __init__(self, name, pattern, replacement, flags=0, guard=None, files=None, description=''):
+        self.name = name
+        self.pattern = re.compile(pattern, flags)
+        self.replacement = replacement
+        self.guard = guard
+        self.files = tuple(files) if files else None
+        self.description = description
+
+    def applies_to(self, relative_path, text):
+        if self.files is not None and not any(fnmatch(relative_path, pattern) for pattern in self.files):
+            return False
+        if self.guard is None:
+            return True
+        if isinstance(self.guard, str):
+            return self.guard in text
+        return self.guard(text)
+
+    def apply(self, text):
+        """(النص الجديد، عدد الاستبدالات)"""
+        return self.pattern.subn(self.replacement, text)
+
+
+class RuleSet:
+    """مجموعة قواعد تُطبق بالترتيب على كل ملف"""
+
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = list(rules)
+
+    def apply(self, relative_path, text):
+        """(النص الجديد، {اسم القاعدة: عدد الاستبدالات})"""
+        counts = {}
+        for rule in self.rules:
+            if not rule.applies_to(relative_path, text):
+                continue
+            text, count = rule.apply(text)
+            if count:
+                counts[rule.name] = count
+        return text, counts
+
+
+_loaded = {}
+
+
+def load_rule_set(spec):
+    """تحميل مجموعة قواعد من "module" أو "module:attr" (الافتراضي RULES)"""
+    if spec not in _loaded:
+        module_name, _, attr = spec.partition(':')
+        root = str(ROOT)
+        if root not in sys.path:
+            sys.path.insert(0, root)
+        rule_set = getattr(import_module(module_name), attr or 'RULES')
+        if not isinstance(rule_set, RuleSet):
+            raise TypeError(f"{spec} ليست RuleSet")
+        _loaded[spec] = rule_set
+    return _loaded[spec]
+
+
+def _relative(path):
+    try:
+        return Path(path).resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return Path(path).as_posix()
+
+
+def apply_to_file(rule_set, path, dry_run=False):
+    """تطبيق القواعد على ملف واحد وإرجاع (العدادات، الفرق أو None، هل تغير)"""
+    path = Path(path)
+    relative = _relative(path)
+    original = path.read_bytes()
+    text = original.decode('utf-8')
+    new_text, counts = rule_set.apply(relative, text)
+    if new_text == text:
+        return counts, None, False
+    diff = None
+    if dry_run:
+        old_label, new_label = (relative, relative) if relative.startswith('/') else (f'a/{relative}', f'b/{relative}')
+        diff = ''.join(difflib.unified_diff(text.splitlines(True), new_text.splitlines(True), old_label, new_label))
+    else:
+        atomic_write(path, new_text.encode('utf-8'))
+    return counts, diff, True
+
+
+def _apply_chunk(spec, paths, dry_run):
+    rule_set = load_rule_set(spec)
+    return [(str(path),) + apply_to_file(rule_set, path, dry_run) for path in paths]
+
+
+def run_codemod(spec, paths, dry_run=False, jobs=1):
+    """تطبيق مجموعة القواعد على كل الملفات، وإرجاع (عدد الملفات، النتائج، الأخطاء)"""
+    load_rule_set(spec)
+    files = [str(path) for path in iter_sources(paths)]
+    jobs = resolve_jobs(jobs)
+    chunk_count = max(1, min(len(files), jobs * CHUNKS_PER_JOB)) if jobs > 1 else 1
+    chunks = [files[i::chunk_count] for i in range(chunk_count)]
+    results = map_stores(_apply_chunk,
+                         [(f'chunk-{i}', (spec, chunk, dry_run)) for i, chunk in enumerate(chunks) if chunk],
+                         jobs)
+    outcomes = []
+    errors = {}
+    for result in results:
+        if result.ok:
+            outcomes.extend(result.value)
+        else:
+            errors[result.key] = result.error.splitlines()[0]
+    outcomes.sort(key=lambda outcome: outcome[0])
+    return len(files), outcomes, errors
+
+
+def main(argv=None, rule_set=None):
+    """واجهة الأوامر؛ rule_set يثبت مجموعة القواعد (لسكربت مجموعة قواعد واحدة)"""
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools codemod',
+                                     description="تطبيق مجموعة قواعد إعادة كتابة على ملفات المصدر")
+    if rule_set is None:
+        parser.add_argument('rules', help="وحدة مجموعة القواعد: module أو module:attr")
+    parser.add_argument('paths', nargs='*', default=[str(ROOT / 'src')], help="ملفات أو مجلدات (الافتراضي src/)")
+    parser.add_argument('--dry-run', '-n', action='store_true', help="عرض الفرق بدون كتابة")
+    add_jobs_argument(parser)
+    parser.set_defaults(jobs=0)
+    args = parser.parse_args(argv)
+    spec = rule_set or args.rules
+
+    started = time.perf_counter()
+    total, outcomes, errors = run_codemod(spec, args.paths, args.dry_run, resolve_jobs(args.jobs))
+    totals = Counter()
+    changed = 0
+    for path, counts, diff, file_changed in outcomes:
+        totals.update(counts)
+        if not file_changed:
+            continue
+        changed += 1
+        if diff:
+            sys.stdout.write(diff)
+        summary = ', '.join(f"{name}×{count}" for name, count in counts.items())
+        print(f"{'~' if args.dry_run else 'OK'} - {_relative(path)}: {summary}", file=sys.stderr)
+    for key, error in errors.items():
+        print(f"ERROR - {key}: {error}", file=sys.stderr)
+
+    rules = load_rule_set(spec)
+    for rule in rules.rules:
+        print(f"   {rule.name}: {totals.get(rule.name, 0)} استبدال", file=sys.stderr)
+    verb = "سيتغير" if args.dry_run else "تغير"
+    print(f"{rules.name}: {verb} {changed} من {total} ملف ({time.perf_counter() - started:.2f}s)",
+          file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""إعداد مخرجات الطرفية المشتركة بين السكربتات وواجهة الأوامر."""
+
+import io
+import sys
+
+
+def utf8_stdout():
+    """جعل stdout بترميز UTF-8 (للنصوص العربية على ويندوز)
+
+    تُستدعى من main() بدلاً من وقت الاستيراد، وتكرار الاستدعاء لا يعيد تغليف
+    stdout، فيمكن استيراد السكربتات وتشغيلها من واجهة الأوامر الموحدة.
+    """
+    if (getattr(sys.stdout, 'encoding', '') or '').lower().replace('-', '') == 'utf8':
+        return
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except AttributeError:
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
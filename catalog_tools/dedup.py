@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""كشف الصور المكررة بالمحتوى تحت public/assets وتوحيد مراجعها.
+
+مجلدات المتاجر فيها نسخ متطابقة (sheirine و sherine، delta و delta-store،
+وصور منسوخة بين المتاجر و banks/partners)، وهو ما كانت تعالجه
+scripts/cleanup-duplicate-assets.js لمتجر واحد في كل مرة. هنا للأسطول كله:
+
+- الملف الذي لا يشاركه أي ملف آخر في الحجم لا يمكن أن يكون مكرراً، فلا يُقرأ.
+- الباقي يُجزأ (SHA-1 بقراءة متدفقة) على عدة عمليات، وتُخزن البصمات في
+  .catalog-cache/hashes.json مع الحجم ووقت التعديل، فلا يُعاد تجزئة ملف لم يتغير.
+- لكل مجموعة متطابقة يُختار مسار معتمد: المسار المكتوب في src/ أولاً (لا
+  يُعاد كتابته)، ثم الأكثر مراجع في المتاجر، ثم ما كان داخل مجلد متجر
+  مسجل، ثم الأقصر.
+- مع --rewrite تُعاد كتابة store.json (ونسخة dist) للمتاجر التي تشير إلى
+  نسخة غير معتمدة فقط. لا يُحذف أي ملف: بعض المراجع تُبنى ديناميكياً في
+  الكود (`/assets/banks/${...}`) ولا يمكن التأكد من أن النسخة غير مستخدمة.
+
+    python -m catalog_tools dedup [--rewrite] [--dry-run] [--format text|json] [-j 0]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+from .assets import MEDIA_EXTENSIONS, AssetCache, fleet_refs, is_generated, replace_refs, source_refs
+from .parallel import add_jobs_argument, map_stores, resolve_jobs
+from .paths import CACHE_DIR, ROOT
+from .registry import discover_stores
+from .storeio import write_if_changed
+from .stream import file_sha1, rewrite_store
+
+CACHE_PATH = CACHE_DIR / 'hashes.json'
+CACHE_VERSION = 1
+
+# جذر الأصول الذي يُفحص (dist نسخة منه ولا يُعد تكراراً)
+ASSET_ROOT = 'public'
+
+# عدد الدفعات لكل عملية (كما في codemod)
+CHUNKS_PER_JOB = 4
+
+
+class HashCache:
+    """بصمات الملفات مخزنة مع (الحجم، وقت التعديل)"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.files = {}
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.files = data.get('files', {})
+
+    def get(self, name, stat):
+        cached = self.files.get(name)
+        if cached is not None and cached[0] == stat[0] and cached[1] == stat[1]:
+            return cached[2]
+        return None
+
+    def put(self, name, stat, digest):
+        self.files[name] = [stat[0], stat[1], digest]
+        self.dirty = True
+
+    def prune(self, names):
+        """حذف بصمات الملفات غير الموجودة في names"""
+        for name in list(self.files):
+            if name not in names:
+                del self.files[name]
+                self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        payload = json.dumps({'version': CACHE_VERSION, 'files': self.files},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        write_if_changed(self.path, payload)
+
+
+def _hash_chunk(paths):
+    return [(name, file_sha1(ROOT / ASSET_ROOT / name)) for name in paths]
+
+
+def media_files(cache):
+    """{المسار النسبي 'assets/...': (الحجم، وقت التعديل)} لملفات الوسائط"""
+    files = {}
+    base = ROOT / ASSET_ROOT
+    for name in cache.walk(ASSET_ROOT):
+        if is_generated(name) or os.path.splitext(name)[1].lower() not in MEDIA_EXTENSIONS:
+            continue
+        try:
+            stat = os.stat(base / name)
+        except FileNotFoundError:
+            continue
+        files[name] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def hash_files(files, jobs=1):
+    """{المسار: البصمة} للملفات التي تشارك غيرها في الحجم، مع الأخطاء"""
+    by_size = defaultdict(list)
+    for name, stat in files.items():
+        by_size[stat[0]].append(name)
+    candidates = sorted(name for names in by_size.values() if len(names) > 1 for name in names)
+
+    cache = HashCache()
+    digests = {}
+    stale = []
+    for name in candidates:
+        digest = cache.get(name, files[name])
+        if digest is None:
+            stale.append(name)
+        else:
+            digests[name] = digest
+
+    errors = {}
+    if stale:
+        jobs = resolve_jobs(jobs)
+        chunk_count = max(1, min(len(stale), jobs * CHUNKS_PER_JOB)) if jobs > 1 else 1
+        chunks = [stale[i::chunk_count] for i in range(chunk_count)]
+        results = map_stores(_hash_chunk, [(f'chunk-{i}', (chunk,)) for i, chunk in enumerate(chunks)], jobs)
+        for result in results:
+            if not result.ok:
+                errors[result.key] = result.error.splitlines()[0]
+                continue
+            for name, digest in result.value:
+                if digest is not None:
+                    digests[name] = digest
+                    cache.put(name, files[name], digest)
+    cache.prune(set(candidates))
+    cache.save()
+    return digests, errors
+
+
+def _canonical_key(name, store_counts, fixed, store_folders):
+    folder = name.split('/')[1] if name.count('/') > 1 else ''
+    return (name not in fixed, -store_counts.get(name, 0), folder not in store_folders, len(name), name)
+
+
+def find_duplicates(jobs=1):
+    """مجموعات الملفات المتطابقة مع المسار المعتمد لكل منها ومراجع المتاجر"""
+    cache = AssetCache()
+    files = media_files(cache)
+    refs, errors = fleet_refs(cache, jobs)
+    cache.save()
+    digests, hash_errors = hash_files(files, jobs)
+    errors.update(hash_errors)
+
+    by_digest = defaultdict(list)
+    for name, digest in digests.items():
+        by_digest[digest].append(name)
+
+    store_counts = defaultdict(int)
+    for store_ref_list in refs.values():
+        for ref in store_ref_list:
+            store_counts[ref] += 1
+    fixed = source_refs()
+    store_folders = {entry.folder for entry in discover_stores()}
+
+    groups = []
+    for digest, names in by_digest.items():
+        if len(names) < 2:
+            continue
+        names.sort(key=lambda name: _canonical_key(name, store_counts, fixed, store_folders))
+        canonical, duplicates = names[0], names[1:]
+        groups.append({
+            'hash': digest,
+            'size': files[canonical][0],
+            'canonical': canonical,
+            'duplicates': duplicates,
+            # نسخ غير معتمدة مكتوبة في src/ لا تُوحد
+            'fixed': [name for name in duplicates if name in fixed],
+        })
+    groups.sort(key=lambda group: (-group['size'] * len(group['duplicates']), group['canonical']))
+    return {'files': len(files), 'hashed': len(digests), 'groups': groups, 'refs': refs, 'errors': errors}
+
+
+def canonical_mapping(groups):
+    """{نسخة مكررة: المسار المعتمد} للنسخ التي يمكن توحيد مراجعها"""
+    mapping = {}
+    for group in groups:
+        for name in group['duplicates']:
+            if name not in group['fixed']:
+                mapping[name] = group['canonical']
+    return mapping
+
+
+def rewrite_store_refs(store_path, dist_path, mapping):
+    """توحيد مراجع متجر واحد وإرجاع (عدد الاستبدالات، هل كُتب)"""
+    replaced = [0]
+
+    def fields(values):
+        replaced[0] += replace_refs(values, mapping)[1]
+
+    def transform(batches):
+        for batch in batches:
+            for product in batch:
+                replaced[0] += replace_refs(product, mapping)[1]
+            yield batch
+
+    written, mirrored = rewrite_store(store_path, dist_path if os.path.exists(dist_path) else None,
+                                      transform=transform, fields=fields)
+    return replaced[0], written or mirrored
+
+
+def rewrite(report, jobs=1, dry_run=False):
+    """توحيد المراجع في المتاجر المتأثرة فقط: {المتجر: {'refs', 'replaced', 'written'}}"""
+    mapping = canonical_mapping(report['groups'])
+    entries = {entry.folder: entry for entry in discover_stores()}
+    affected = {folder: sorted(ref for ref in store_ref_list if ref in mapping)
+                for folder, store_ref_list in report['refs'].items()}
+    affected = {folder: found for folder, found in affected.items() if found and folder in entries}
+    if dry_run:
+        return {folder: {'refs': found, 'replaced': None, 'written': False} for folder, found in affected.items()}
+
+    tasks = [(folder, (entries[folder].path, str(entries[folder].dist_path), mapping)) for folder in affected]
+    results = {}
+    for result in map_stores(rewrite_store_refs, tasks, jobs):
+        if result.ok:
+            replaced, written = result.value
+            results[result.key] = {'refs': affected[result.key], 'replaced': replaced, 'written': written}
+        else:
+            results[result.key] = {'refs': affected[result.key], 'error': result.error.splitlines()[0]}
+    return results
+
+
+def wasted_bytes(groups):
+    return sum(group['size'] * len(group['duplicates']) for group in groups)
+
+
+def format_text(report, rewritten=None, dry_run=False):
+    lines = []
+    groups = report['groups']
+    duplicates = sum(len(group['duplicates']) for group in groups)
+    for group in groups:
+        lines.append(f"{group['size']:>10,}  /{group['canonical']}")
+        for name in group['duplicates']:
+            mark = '  (src/)' if name in group['fixed'] else ''
+            lines.append(f"{'':>10}  = /{name}{mark}")
+    lines.append(f"{report['files']} ملف وسائط، جُزئ {report['hashed']}: {len(groups)} مجموعة متطابقة،"
+                 f" {duplicates} نسخة مكررة ({wasted_bytes(groups) / 1_048_576:.1f} MB)")
+    if rewritten is not None:
+        for folder, result in rewritten.items():
+            if 'error' in result:
+                lines.append(f"ERROR - {folder}: {result['error']}")
+            elif dry_run:
+                lines.append(f"~ {folder}: سيُوحد {len(result['refs'])} مسار")
+            else:
+                status = "تم الحفظ" if result['written'] else "بدون تغيير"
+                lines.append(f"OK - {folder}: {result['replaced']} استبدال في {len(result['refs'])} مسار - {status}")
+        if not rewritten:
+            lines.append("لا توجد مراجع لنسخ مكررة في المتاجر")
+    for key, error in report['errors'].items():
+        lines.append(f"ERROR - {key}: {error}")
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools dedup',
+                                     description="كشف الصور المكررة بالمحتوى وتوحيد مراجعها في المتاجر")
+    parser.add_argument('--rewrite', action='store_true', help="توحيد مراجع store.json إلى المسار المعتمد")
+    parser.add_argument('--dry-run', '-n', action='store_true', help="عرض ما سيتغير بدون كتابة")
+    parser.add_argument('--format', '-f', choices=('text', 'json'), default='text', help="صيغة المخرجات")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    jobs = resolve_jobs(args.jobs)
+    report = find_duplicates(jobs)
+    rewritten = rewrite(report, jobs, args.dry_run) if args.rewrite else None
+
+    failed = report['errors'] or any('error' in result for result in (rewritten or {}).values())
+    if args.format == 'json':
+        payload = {key: value for key, value in report.items() if key != 'refs'}
+        payload['wastedBytes'] = wasted_bytes(report['groups'])
+        if rewritten is not None:
+            payload['rewritten'] = rewritten
+        sys.stdout.write(json.dumps(payload, ensure_ascii=False, indent=2) + '\n')
+    else:
+        sys.stdout.write(format_text(report, rewritten, args.dry_run))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""توليد أحجام WebP متجاوبة لصور المنتجات من كل store.json.
+
+resize-images.js يعالج صور الشرائح فقط بأحجام ومجلدات ثابتة، بينما صور
+المنتجات تُعرض بدقتها الكاملة في شبكات المنتجات. هنا لكل صورة منتج في
+أي متجر تُولد الأحجام في VARIANTS (thumb, card, detail) داخل مربع بعرض
+محدد مع الحفاظ على النسبة وبدون تكبير.
+
+- أسماء الملفات مشتقة من بصمة المحتوى: public/assets/variants/<بصمة>-<العرض>.webp،
+  فالصورة المكررة في عدة متاجر تُولد مرة واحدة، والحجم الموجود لنفس
+  المحتوى لا يُعاد توليده. البصمات مخزنة في .catalog-cache/variants.json
+  مع الحجم ووقت التعديل فلا يُعاد قراءة الأصل الذي لم يتغير.
+- فك الصور وترميزها على عدة عمليات، وكل صورة تُفتح مرة واحدة لكل أحجامها
+  (JPEG يُفك بمقياس مصغر عبر draft).
+- يُكتب في كل منتج الحقل imageVariants:
+      {"/assets/nawaem/dress1.jpg": {"thumb": "/assets/variants/….webp", ...}}
+  وتُعاد كتابة store.json (ونسخة dist) متدفقاً ولا يُكتب إلا ما تغير.
+
+يتطلب Pillow مع دعم WebP، ويُستورد عند الحاجة فقط.
+
+    python -m catalog_tools variants [--store FOLDER] [--dry-run] [--no-map] [-j 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+from importlib.util import find_spec
+
+from .assets import collect_refs, is_generated
+from .dedup import CHUNKS_PER_JOB, HashCache
+from .parallel import add_jobs_argument, map_stores, resolve_jobs
+from .paths import CACHE_DIR, ROOT
+from .registry import discover_stores
+from .storeio import temp_path
+from .stream import file_sha1, rewrite_store
+
+CACHE_PATH = CACHE_DIR / 'variants.json'
+
+VARIANTS_DIR = 'assets/variants'
+VARIANTS_FIELD = 'imageVariants'
+
+# الاسم: أقصى عرض وارتفاع بالبكسل
+VARIANTS = {'thumb': 160, 'card': 480, 'detail': 1200}
+WEBP_QUALITY = 80
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.avif')
+
+# طول البصمة في اسم الملف (64 بت تكفي لكتالوج بهذا الحجم)
+_NAME_HASH = 16
+
+
+def variant_name(digest, width):
+    return f'{VARIANTS_DIR}/{digest[:_NAME_HASH]}-{width}.webp'
+
+
+def image_urls(product):
+    """روابط الصور في images و image (النص المفرد كقائمة، وما ليس نصاً يُتجاهل)"""
+    urls = []
+    for value in (product.get('images'), product.get('image')):
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            urls.extend(url for url in value if isinstance(url, str))
+    return urls
+
+
+def product_images(product):
+    """مراجع الصور النقطية في منتج واحد ('assets/...')"""
+    refs = set()
+    for url in image_urls(product):
+        collect_refs(url, refs)
+    return {ref for ref in refs
+            if ref.lower().endswith(SOURCE_EXTENSIONS) and not is_generated(ref)}
+
+
+def store_images(store_path):
+    """كل صور المنتجات في store.json بالقارئ المتدفق"""
+    from .stream import StoreReader
+
+    found = set()
+    with StoreReader(store_path) as reader:
+        for product in reader.products():
+            found |= product_images(product)
+    return sorted(found)
+
+
+def _render(source, names, quality):
+    """توليد الأحجام الناقصة من صورة واحدة: names = {العرض: المسار النسبي}"""
+    from PIL import Image
+
+    with Image.open(source) as img:
+        img.draft('RGB', (max(names), max(names)))
+        img.load()
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+        # من الأكبر للأصغر: كل حجم يُصغر من سابقه بدلاً من الأصل
+        current = img
+        for width in sorted(names, reverse=True):
+            resized = current.copy()
+            resized.thumbnail((width, width), Image.Resampling.LANCZOS)
+            target = ROOT / 'public' / names[width]
+            os.makedirs(target.parent, exist_ok=True)
+            tmp = temp_path(target)
+            resized.save(tmp, 'WEBP', quality=quality, method=4)
+            os.replace(tmp, target)
+            current = resized
+
+
+def _process_chunk(items, widths, quality, dry_run):
+    """لكل (المرجع، البصمة المخزنة أو None): (المرجع، البصمة، عدد المولد، الخطأ)"""
+    results = []
+    for ref, digest in items:
+        source = ROOT / 'public' / ref
+        try:
+            if digest is None:
+                digest = file_sha1(source)
+                if digest is None:
+                    raise FileNotFoundError(f"الصورة غير موجودة: /{ref}")
+            missing = {width: variant_name(digest, width) for width in widths
+                       if not (ROOT / 'public' / variant_name(digest, width)).exists()}
+            if missing and not dry_run:
+                _render(source, missing, quality)
+            results.append((ref, digest, len(missing), None))
+        except (OSError, ValueError) as e:
+            results.append((ref, digest, 0, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def generate(refs, jobs=1, dry_run=False, variants=None, quality=WEBP_QUALITY):
+    """توليد الأحجام لكل المراجع وإرجاع ({المرجع: البصمة}، عدد المولد، الأخطاء)"""
+    variants = variants or VARIANTS
+    cache = HashCache(CACHE_PATH)
+    items = []
+    stats = {}
+    for ref in refs:
+        try:
+            stat = os.stat(ROOT / 'public' / ref)
+        except FileNotFoundError:
+            stats[ref] = None
+            items.append((ref, None))
+            continue
+        stats[ref] = (stat.st_size, stat.st_mtime_ns)
+        items.append((ref, cache.get(ref, stats[ref])))
+
+    jobs = resolve_jobs(jobs)
+    chunk_count = max(1, min(len(items), jobs * CHUNKS_PER_JOB)) if jobs > 1 else 1
+    chunks = [items[i::chunk_count] for i in range(chunk_count)]
+    widths = sorted(set(variants.values()))
+    results = map_stores(_process_chunk,
+                         [(f'chunk-{i}', (chunk, widths, quality, dry_run)) for i, chunk in enumerate(chunks) if chunk],
+                         jobs)
+
+    digests = {}
+    rendered = 0
+    errors = {}
+    for result in results:
+        if not result.ok:
+            errors[result.key] = result.error.splitlines()[0]
+            continue
+        for ref, digest, count, error in result.value:
+            if error is not None:
+                errors['/' + ref] = error
+                continue
+            digests[ref] = digest
+            rendered += count
+            if stats[ref] is not None:
+                cache.put(ref, stats[ref], digest)
+    cache.prune(set(refs))
+    cache.save()
+    return digests, rendered, errors
+
+
+def variant_map(product, digests, variants=None):
+    """قيمة imageVariants لمنتج، أو None إذا لم يكن له صور مولدة"""
+    variants = variants or VARIANTS
+    mapping = {}
+    for url in image_urls(product):
+        refs = collect_refs(url, set())
+        digest = digests.get(next(iter(refs))) if refs else None
+        if digest is not None:
+            mapping[url] = {name: '/' + variant_name(digest, width) for name, width in variants.items()}
+    return mapping or None
+
+
+def write_variant_map(store_path, dist_path, digests, variants=None):
+    """كتابة imageVariants في منتجات متجر وإرجاع (عدد المنتجات المحدثة، هل كُتب)"""
+    updated = [0]
+
+    def transform(batches):
+        for batch in batches:
+            for product in batch:
+                mapping = variant_map(product, digests, variants)
+                if product.get(VARIANTS_FIELD) == mapping:
+                    continue
+                if mapping is None:
+                    del product[VARIANTS_FIELD]
+                else:
+                    product[VARIANTS_FIELD] = mapping
+                updated[0] += 1
+            yield batch
+
+    written, mirrored = rewrite_store(store_path, dist_path if os.path.exists(dist_path) else None,
+                                      transform=transform)
+    return updated[0], written or mirrored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools variants',
+                                     description="توليد أحجام WebP لصور المنتجات وكتابة imageVariants")
+    parser.add_argument('--store', '-s', action='append', metavar='FOLDER',
+                        help="متجر محدد (يمكن تكراره؛ الافتراضي كل المتاجر)")
+    parser.add_argument('--dry-run', '-n', action='store_true', help="عرض عدد الأحجام الناقصة بدون توليد أو كتابة")
+    parser.add_argument('--no-map', action='store_true', help="توليد الملفات فقط بدون تعديل store.json")
+    add_jobs_argument(parser)
+    parser.set_defaults(jobs=0)
+    args = parser.parse_args(argv)
+
+    if find_spec('PIL') is None:
+        print("ERROR - variants يتطلب Pillow: pip install Pillow", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    jobs = resolve_jobs(args.jobs)
+    entries = [entry for entry in discover_stores() if not args.store or entry.folder in args.store]
+    failed = False
+    store_refs = {}
+    for result in map_stores(store_images, [(entry.folder, (entry.path,)) for entry in entries], jobs):
+        if result.ok:
+            store_refs[result.key] = result.value
+        else:
+            failed = True
+            print(f"ERROR - {result.key}: {result.error.splitlines()[0]}")
+    refs = sorted({ref for found in store_refs.values() for ref in found})
+
+    digests, rendered, errors = generate(refs, jobs, args.dry_run)
+    for key, error in errors.items():
+        failed = True
+        print(f"ERROR - {key}: {error}")
+    verb = "ناقص" if args.dry_run else "مولد"
+    print(f"{len(refs)} صورة منتج في {len(store_refs)} متجر: {rendered} حجم {verb}"
+          f" ({len(VARIANTS)} أحجام لكل صورة)")
+
+    if not args.dry_run and not args.no_map:
+        tasks = [(entry.folder, (entry.path, str(entry.dist_path), digests))
+                 for entry in entries if entry.folder in store_refs]
+        for result in map_stores(write_variant_map, tasks, jobs):
+            if not result.ok:
+                failed = True
+                print(f"ERROR - {result.key}: {result.error.splitlines()[0]}")
+                continue
+            updated, written = result.value
+            status = "تم الحفظ" if written else "بدون تغيير"
+            print(f"OK - {result.key}: {updated} منتج بخريطة أحجام جديدة - {status}")
+    print(f"({time.perf_counter() - started:.2f}s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""فهرس معرفات المنتجات عبر ملفات TS في src/data وكل store.json.
+
+يربط كل معرف منتج بمواضعه: المتجر، الملف، إزاحة البايت ورقم السطر. يُحفظ
+الفهرس في .catalog-cache/ids.json ويُحدَّث تدريجياً: الملفات التي لم يتغير
+حجمها ووقت تعديلها لا يُعاد تحليلها. البحث بقاموس في الذاكرة (O(1)).
+
+التعارضات (collisions) نوعان:
+    conflict   - نفس المعرف لمنتجات في متاجر مختلفة (storeId مختلف)
+    duplicate  - نفس المعرف أكثر من مرة في ملف واحد
+تكرار المنتج نفسه في عدة ملفات لنفس المتجر (TS و store.json) طبيعي.
+
+    python -m catalog_tools ids 2001 4005
+    python -m catalog_tools ids --collisions
+"""
+
+import argparse
+import json
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from .paths import CACHE_DIR, ROOT
+from .storeio import write_if_changed
+
+INDEX_PATH = CACHE_DIR / 'ids.json'
+INDEX_VERSION = 1
+TS_SOURCES_DIR = ROOT / 'src' / 'data'
+
+Location = namedtuple('Location', 'id store_id store source offset line')
+
+
+def _relative(path):
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _resolve_store_id(value, constants):
+    if isinstance(value, dict) and '$ref' in value:
+        value = constants.get(value['$ref'], value['$ref'])
+    return value
+
+
+def scan_ts(path):
+    """مواضع المنتجات في ملف TS كقائمة [id, storeId, إزاحة البايت، السطر]"""
+    from .srcpos import byte_offsets
+    from .tsparse import load_parsed
+
+    parsed = load_parsed(path)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    entries = parsed['products']
+    offsets = byte_offsets(text, [entry['offset'] for entry in entries])
+    return [
+        [entry['product'].get('id'),
+         _resolve_store_id(entry['product'].get('storeId'), parsed['constants']),
+         offset, entry['line']]
+        for entry, offset in zip(entries, offsets)
+    ]
+
+
+def scan_store(path):
+    """مواضع المنتجات في store.json بالقارئ المتدفق"""
+    from .stream import StoreReader
+
+    with StoreReader(path, track_offsets=True) as reader:
+        default_store_id = reader.header.get('storeId')
+        return [[product.get('id'), product.get('storeId', default_store_id), offset, line]
+                for offset, line, product in reader.products_with_offsets()]
+
+
+class ProductIndex:
+    """فهرس المعرفات مع تحديث تزايدي حسب الملفات المتغيرة"""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.sources = {}
+        self._by_id = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.sources = data.get('sources', {})
+
+    def _candidates(self):
+        """(المسار النسبي، المسار، النوع، StoreEntry أو None) لكل ملف مصدر"""
+        from .registry import discover_stores
+
+        for path in sorted(TS_SOURCES_DIR.rglob('*.ts')):
+            yield _relative(path), path, 'ts', None
+        for entry in discover_stores():
+            yield _relative(entry.path), Path(entry.path), 'store', entry
+
+    def refresh(self):
+        """تحديث الملفات المتغيرة وحفظ الفهرس، وإرجاع قائمة الملفات المعاد فحصها"""
+        from .tsparse import TSSyntaxError
+
+        sources = {}
+        rescanned = []
+        for key, path, kind, store in self._candidates():
+            stat = path.stat()
+            cached = self.sources.get(key)
+            if (cached is not None and cached['size'] == stat.st_size
+                    and cached['mtime_ns'] == stat.st_mtime_ns):
+                sources[key] = cached
+                continue
+            try:
+                products = scan_ts(path) if kind == 'ts' else scan_store(path)
+            except (TSSyntaxError, ValueError) as e:
+                print(f"WARNING: تخطي {key}: {e}")
+                continue
+            sources[key] = {'kind': kind, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                            'store': store and store.folder, 'storeId': store and store.store_id,
+                            'products': products}
+            rescanned.append(key)
+
+        changed = bool(rescanned) or set(sources) != set(self.sources)
+        self.sources = sources
+        if changed:
+            self.save()
+        self._by_id = None
+        return rescanned
+
+    def save(self):
+        payload = json.dumps({'version': INDEX_VERSION, 'sources': self.sources},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        write_if_changed(self.path, payload)
+
+    def _store_names(self):
+        """storeId -> مجلد المتجر، من ملفات store.json المفهرسة"""
+        return {source['storeId']: source['store'] for source in self.sources.values()
+                if source['kind'] == 'store' and source['storeId'] is not None}
+
+    def _build(self):
+        names = self._store_names()
+        by_id = {}
+        for key, source in self.sources.items():
+            for product_id, store_id, offset, line in source['products']:
+                store = source['store'] or names.get(store_id)
+                by_id.setdefault(str(product_id), []).append(
+                    Location(product_id, store_id, store, key, offset, line))
+        self._by_id = by_id
+
+    def lookup(self, product_id):
+        """كل مواضع المعرف (قائمة فارغة إذا لم يوجد)"""
+        if self._by_id is None:
+            self._build()
+        return self._by_id.get(str(product_id), [])
+
+    def locations_in(self, source):
+        """مواضع منتجات ملف واحد (مسار نسبي لجذر المشروع)"""
+        names = self._store_names()
+        entry = self.sources.get(_relative(ROOT / source), {'products': [], 'store': None})
+        return [Location(product_id, store_id, entry['store'] or names.get(store_id), source, offset, line)
+                for product_id, store_id, offset, line in entry['products']]
+
+    def __len__(self):
+        if self._by_id is None:
+            self._build()
+        return len(self._by_id)
+
+    def collisions(self):
+        """{id: (نوع التعارض، المواضع)} للمعرفات المتعارضة"""
+        if self._by_id is None:
+            self._build()
+        result = {}
+        for product_id, locations in self._by_id.items():
+            if len({location.store_id for location in locations}) > 1:
+                result[product_id] = ('conflict', locations)
+                continue
+            sources = [location.source for location in locations]
+            if len(sources) != len(set(sources)):
+                result[product_id] = ('duplicate', locations)
+        return result
+
+
+def load_index(refresh=True):
+    """فهرس المعرفات بعد تحديث الملفات المتغيرة"""
+    index = ProductIndex()
+    if refresh:
+        index.refresh()
+    return index
+
+
+def _describe(location):
+    return (f"store={location.store or '?'} storeId={location.store_id}"
+            f" {location.source}:{location.line} (byte {location.offset})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools ids',
+                                     description="البحث عن مواضع معرفات المنتجات وكشف التعارضات")
+    parser.add_argument('ids', nargs='*', help="معرفات المنتجات")
+    parser.add_argument('--collisions', action='store_true', help="عرض المعرفات المتعارضة")
+    parser.add_argument('--json', action='store_true', help="مخرجات JSON")
+    args = parser.parse_args(argv)
+
+    index = load_index()
+    if args.collisions:
+        collisions = index.collisions()
+        if args.json:
+            print(json.dumps({product_id: {'kind': kind, 'locations': [l._asdict() for l in locations]}
+                              for product_id, (kind, locations) in collisions.items()},
+                             ensure_ascii=False, indent=2))
+        else:
+            for product_id, (kind, locations) in sorted(collisions.items()):
+                print(f"{kind} - {product_id}:")
+                for location in locations:
+                    print(f"   {_describe(location)}")
+            print(f"المجموع: {len(collisions)} معرف متعارض من {len(index)}")
+        return 1 if collisions else 0
+
+    missing = 0
+    results = {}
+    for product_id in args.ids:
+        locations = index.lookup(product_id)
+        missing += not locations
+        results[product_id] = [location._asdict() for location in locations]
+        if not args.json:
+            if not locations:
+                print(f"WARNING: المعرف {product_id} غير موجود")
+            for location in locations:
+                print(f"{product_id}: {_describe(location)}")
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
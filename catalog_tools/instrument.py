@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""قياس زمن وذاكرة مراحل سكربتات الصيانة وتصديرها كتقرير JSON-lines.
+
+    from catalog_tools import instrument
+
+    instrument.configure('apply_badges', args.report)
+    with instrument.stage('load'):
+        ...
+        instrument.count('products', len(products))
+
+بدون تقرير (الحالة الافتراضية) لا تفعل الدوال شيئاً تقريباً. مع `--report
+PATH` أو متغير البيئة CATALOG_REPORT يُضاف سطر JSON لكل مرحلة عند انتهائها
+وسطر `run` في نهاية السكربت بالإجماليات. الحقول بنفس أسماء MemorySnapshot في
+backend/src/services/memoryMonitoringService.ts (timestamp, rss ...) لتُغذى
+نفس لوحات المراقبة.
+
+ذروة الذاكرة لكل مرحلة تُقاس بـ tracemalloc (يبطئ التنفيذ قليلاً، ويمكن
+إيقافه بـ CATALOG_REPORT_MEMORY=0). العمليات الفرعية في وضع --jobs ترث
+الإعداد من البيئة وتكتب في نفس الملف بنفس معرف التشغيل.
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+REPORT_ENV = 'CATALOG_REPORT'
+MEMORY_ENV = 'CATALOG_REPORT_MEMORY'
+SCRIPT_ENV = 'CATALOG_REPORT_SCRIPT'
+RUN_ENV = 'CATALOG_REPORT_RUN'
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _peak_rss():
+    """أعلى استخدام للذاكرة المقيمة للعملية بالبايت (0 إذا لم يكن متاحاً)"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # لينكس يعيد كيلوبايت و macOS يعيد بايت
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class _Frame:
+    __slots__ = ('name', 'start', 'cpu', 'peak', 'counters')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.cpu = time.process_time()
+        self.peak = 0
+        self.counters = {}
+
+
+class Recorder:
+    """مسجل المراحل والعدادات لتشغيل سكربت واحد"""
+
+    def __init__(self, script, report=None, memory=True):
+        self.script = script
+        self.report = report
+        self.memory = memory and report is not None
+        self.run_id = os.environ.get(RUN_ENV) or f'{int(time.time() * 1000)}-{os.getpid()}'
+        self.counters = {}
+        self.stages = []
+        self._stack = []
+        self._peak = 0
+        self._start = time.perf_counter()
+        self._cpu = time.process_time()
+        self._finished = False
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def enabled(self):
+        return self.report is not None
+
+    def _emit(self, record):
+        if self.report is None:
+            return
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        if self.report == '-':
+            sys.stderr.write(line)
+            return
+        # سطر واحد بكتابة واحدة في وضع الإلحاق، فلا تتداخل أسطر العمليات المتوازية
+        fd = os.open(self.report, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def _base(self, event):
+        return {
+            'event': event,
+            'timestamp': _timestamp(),
+            'script': self.script,
+            'run': self.run_id,
+            'pid': os.getpid(),
+        }
+
+    def _fold_peak(self, reset=True):
+        """ضم ذروة tracemalloc منذ آخر تصفير إلى كل المراحل المفتوحة وذروة التشغيل
+
+        تُستدعى قبل كل reset_peak، وإلا ضاعت ذروة المرحلة الأم التي سبقت بدء مرحلة
+        متداخلة.
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._stack:
+            frame.peak = max(frame.peak, peak)
+        self._peak = max(self._peak, peak)
+        if reset:
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        frame = _Frame(name)
+        if self.memory:
+            self._fold_peak()
+        self._stack.append(frame)
+        try:
+            yield frame
+        finally:
+            if self.memory:
+                self._fold_peak()
+            self._stack.pop()
+            seconds = time.perf_counter() - frame.start
+            cpu_seconds = time.process_time() - frame.cpu
+            path = '/'.join([f.name for f in self._stack] + [name])
+            self.stages.append((path, seconds))
+            record = self._base('stage')
+            record.update({
+                'stage': path,
+                'seconds': round(seconds, 6),
+                'cpuSeconds': round(cpu_seconds, 6),
+                'peakBytes': frame.peak if self.memory else None,
+                'rss': _peak_rss(),
+                'counters': frame.counters,
+            })
+            self._emit(record)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+        for frame in self._stack:
+            frame.counters[name] = frame.counters.get(name, 0) + value
+
+    def finish(self, status='ok'):
+        if self._finished:
+            return
+        self._finished = True
+        if self.memory:
+            self._fold_peak(reset=False)
+        record = self._base('run')
+        record.update({
+            'status': status,
+            'seconds': round(time.perf_counter() - self._start, 6),
+            'cpuSeconds': round(time.process_time() - self._cpu, 6),
+            'peakBytes': self._peak if self.memory else None,
+            'rss': _peak_rss(),
+            'counters': self.counters,
+        })
+        self._emit(record)
+
+
+_recorder = None
+
+
+def configure(script, report=None, memory=None):
+    """تهيئة التقرير للسكربت الحالي (report=None يعني قراءة CATALOG_REPORT)
+
+    تُصدَّر الإعدادات إلى البيئة لترثها العمليات الفرعية في وضع --jobs، ويُكتب
+    سطر `run` تلقائياً عند خروج السكربت.
+    """
+    global _recorder
+    if report is None:
+        report = os.environ.get(REPORT_ENV) or None
+    if memory is None:
+        memory = os.environ.get(MEMORY_ENV, '1') != '0'
+    _recorder = Recorder(script, report, memory)
+    if report is not None:
+        os.environ[REPORT_ENV] = report
+        os.environ[MEMORY_ENV] = '1' if memory else '0'
+        os.environ[SCRIPT_ENV] = script
+        os.environ[RUN_ENV] = _recorder.run_id
+        atexit.register(_recorder.finish)
+        _hook_exceptions(_recorder)
+    return _recorder
+
+
+def _hook_exceptions(rec):
+    """تسجيل التشغيل بحالة error عند انتهاء السكربت باستثناء غير معالج"""
+    previous = sys.excepthook
+
+    def hook(exc_type, exc, tb):
+        rec.finish('error')
+        previous(exc_type, exc, tb)
+
+    sys.excepthook = hook
+
+
+def recorder():
+    """المسجل الحالي، ويُهيأ من البيئة عند أول استخدام (في العمليات الفرعية)"""
+    global _recorder
+    if _recorder is None:
+        script = os.environ.get(SCRIPT_ENV) or os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0]
+        report = os.environ.get(REPORT_ENV) or None
+        _recorder = Recorder(script, report, os.environ.get(MEMORY_ENV, '1') != '0')
+    return _recorder
+
+
+def stage(name):
+    """مدير سياق لقياس مرحلة (المراحل المتداخلة تُسجل كمسار a/b)"""
+    return recorder().stage(name)
+
+
+def count(name, value=1):
+    """زيادة عداد (منتجات معالجة، شارات متغيرة ...) في المرحلة الحالية والإجمالي"""
+    recorder().count(name, value)
+
+
+def add_report_argument(parser):
+    """إضافة خيار --report الموحد إلى argparse"""
+    parser.add_argument('--report', metavar='PATH', default=None,
+                        help=f"إلحاق تقرير JSON-lines بالأزمنة والذاكرة بهذا الملف ('-' = stderr،"
+                             f" أو متغير البيئة {REPORT_ENV})")
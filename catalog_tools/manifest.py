@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""بيان (manifest) الشارات لكل متجر لإعادة الحساب التزايدية.
+
+يحفظ البيان بصمة لمدخلات الشارة لكل منتج (quantity, price, originalPrice,
+orders, likes, views ووجود rating الذي يحدد أهلية المنتج) مع الشارة الناتجة. عند التشغيل التالي يُعاد حساب
+المنتجات التي تغيرت بصمتها فقط.
+"""
+
+import hashlib
+import json
+
+from .badges import STAT_FIELDS, apply_badges_to_catalogs
+from .paths import CACHE_DIR
+from .storeio import write_if_changed
+
+MANIFEST_DIR = CACHE_DIR / 'badges'
+MANIFEST_VERSION = 2
+
+# كل ما يقرؤه compute_badges، و rating لأنه من الحقول المطلوبة للأهلية
+FINGERPRINT_FIELDS = STAT_FIELDS + ('rating',)
+
+
+def product_key(product, index):
+    """مفتاح المنتج داخل البيان (المعرف إن وجد وإلا موقعه)"""
+    product_id = product.get('id')
+    return str(product_id) if product_id is not None else f'#{index}'
+
+
+def fingerprint(product, with_color=False):
+    """بصمة مدخلات الشارة والشارة الحالية لمنتج واحد"""
+    # وجود الحقل جزء من البصمة: حذفه يغير أهلية المنتج حتى لو كانت قيمته None
+    values = [(field in product, product.get(field)) for field in FINGERPRINT_FIELDS]
+    values.append(product.get('badge'))
+    if with_color:
+        values.append(product.get('badgeColor'))
+    return hashlib.blake2b(repr(values).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class BadgeManifest:
+    """بيان الشارات لمتجر واحد"""
+
+    def __init__(self, store_key, profile='default', with_color=False):
+        self.store_key = store_key
+        self.profile = profile
+        self.with_color = with_color
+        self.path = MANIFEST_DIR / f'{store_key}.{profile}.json'
+        self.fingerprints = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        # تغيير ملف التعريف أو لون الشارة يجعل كل المنتجات بحاجة لإعادة الحساب
+        if (data.get('version') == MANIFEST_VERSION
+                and data.get('profile') == self.profile
+                and data.get('withColor') == self.with_color):
+            self.fingerprints = data.get('products', {})
+
+    def reset(self):
+        """نسيان البصمات المحفوظة لإعادة حساب كل المنتجات"""
+        self.fingerprints = {}
+
+    def dirty(self, products, start=0):
+        """المنتجات التي تغيرت مدخلاتها منذ آخر تشغيل
+
+        `start` موقع أول منتج في الكتالوج عند تمرير دفعة من قارئ متدفق.
+        """
+        return [
+            product for index, product in enumerate(products, start)
+            if self.fingerprints.get(product_key(product, index))
+            != fingerprint(product, self.with_color)
+        ]
+
+    def fingerprint_all(self, products, start=0):
+        """بصمات المنتجات كقاموس {مفتاح: بصمة}"""
+        return {
+            product_key(product, index): fingerprint(product, self.with_color)
+            for index, product in enumerate(products, start)
+        }
+
+    def update(self, products):
+        """تسجيل بصمات المنتجات بعد حساب شاراتها"""
+        self.fingerprints = self.fingerprint_all(products)
+
+    def save(self):
+        """كتابة البيان ذرياً (تقرؤه عمليات أخرى بالتوازي)، وفقط إذا تغير"""
+        payload = json.dumps({
+            'version': MANIFEST_VERSION,
+            'profile': self.profile,
+            'withColor': self.with_color,
+            'products': self.fingerprints,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return write_if_changed(self.path, payload)
+
+
+def rebadge_incremental(catalogs, manifests, required=(), jobs=1):
+    """إعادة حساب شارات المنتجات المتغيرة فقط في عدة متاجر
+
+    `catalogs` قائمة منتجات لكل متجر و `manifests` البيان المقابل لكل منها
+    (بنفس ملف التعريف). تُحسب المنتجات المتغيرة من كل المتاجر في استدعاء
+    واحد للمحرك، وتُعاد قائمة أزواج (عدد الشارات المتغيرة، عدد المنتجات
+    التي أعيد حسابها) لكل متجر. يجب حفظ البيانات بعد كتابة الملفات.
+    """
+    if not manifests:
+        return []
+    manifest = manifests[0]
+    dirty = [m.dirty(products) for products, m in zip(catalogs, manifests)]
+    changed = apply_badges_to_catalogs(dirty, manifest.profile, manifest.with_color, required, jobs)
+    for products, m in zip(catalogs, manifests):
+        m.update(products)
+    return list(zip(changed, (len(d) for d in dirty)))
+
+
+def rebadge_batches(batches, manifest, required=(), jobs=1, stats=None):
+    """إعادة حساب الشارات دفعة دفعة لقارئ متدفق (StoreReader.batches)
+
+    تُعاد كل دفعة بعد تحديث شاراتها لتُكتب مباشرة، فلا يوجد الكتالوج كاملاً
+    في الذاكرة. تُجمع الإحصائيات في القاموس `stats` (updated, recomputed,
+    total) ولا تُستبدل بصمات البيان إلا بعد استهلاك كل الدفعات.
+    """
+    if stats is None:
+        stats = {}
+    for field in ('updated', 'recomputed', 'total'):
+        stats.setdefault(field, 0)
+    fingerprints = {}
+    for batch in batches:
+        start = stats['total']
+        dirty = manifest.dirty(batch, start)
+        changed, = apply_badges_to_catalogs([dirty], manifest.profile, manifest.with_color, required, jobs)
+        fingerprints.update(manifest.fingerprint_all(batch, start))
+        stats['updated'] += changed
+        stats['recomputed'] += len(dirty)
+        stats['total'] += len(batch)
+        yield batch
+    manifest.fingerprints = fingerprints
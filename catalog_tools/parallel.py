@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""تشغيل مهام الصيانة لكل متجر على مجموعة عمليات (process pool).
+
+كل متجر مهمة مستقلة في عملية منفصلة، وتُجمع النتائج والأخطاء في ملخص
+واحد بدلاً من الطباعة من داخل العمليات.
+"""
+
+import os
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+StoreResult = namedtuple('StoreResult', 'key ok value error')
+
+
+def default_jobs():
+    """عدد العمليات الافتراضي عند تمرير --jobs 0"""
+    return os.cpu_count() or 1
+
+
+def resolve_jobs(jobs):
+    """تحويل قيمة --jobs إلى عدد عمليات فعلي (0 = عدد المعالجات)"""
+    if jobs is None:
+        return 1
+    return default_jobs() if jobs <= 0 else jobs
+
+
+def add_jobs_argument(parser):
+    """إضافة خيار --jobs الموحد إلى argparse"""
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="عدد العمليات المتوازية (0 = عدد المعالجات، 1 = تسلسلي)")
+
+
+def _call(func, key, args):
+    try:
+        return StoreResult(key, True, func(*args), None)
+    except Exception as e:
+        return StoreResult(key, False, None, f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+
+
+def map_stores(func, tasks, jobs=1):
+    """تشغيل func(*args) لكل مهمة (key, args) وإرجاع StoreResult بنفس الترتيب
+
+    يجب أن تكون func دالة على مستوى الوحدة (قابلة للتسلسل بـ pickle).
+    """
+    tasks = list(tasks)
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1 or len(tasks) <= 1:
+        return [_call(func, key, args) for key, args in tasks]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        futures = [pool.submit(_call, func, key, args) for key, args in tasks]
+        return [future.result() for future in futures]
+
+
+def print_summary(results, describe, verbose_errors=False):
+    """طباعة سطر لكل متجر ثم ملخص إجمالي، وإرجاع عدد المهام الناجحة"""
+    succeeded = 0
+    for result in results:
+        if result.ok:
+            succeeded += 1
+            print(f"OK - {result.key}: {describe(result.value)}")
+        else:
+            message = result.error if verbose_errors else result.error.split('\n', 1)[0]
+            print(f"ERROR - {result.key}: {message}")
+    failed = len(results) - succeeded
+    print(f"المجموع: {succeeded} ناجح، {failed} فشل من {len(results)} متجر")
+    return succeeded
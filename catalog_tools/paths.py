@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""مسارات المشروع المشتركة بين أدوات الكتالوج."""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC_ASSETS = ROOT / 'public' / 'assets'
+DIST_ASSETS = ROOT / 'dist' / 'assets'
+
+
+def store_json_paths(assets_dir=PUBLIC_ASSETS):
+    """جميع ملفات store.json الموجودة تحت public/assets مرتبة حسب اسم المجلد"""
+    return sorted(Path(assets_dir).glob('*/store.json'))
+
+
+def dist_path_for(store_path):
+    """مسار نسخة dist المقابلة لملف store.json في public"""
+    return DIST_ASSETS / Path(store_path).parent.name / 'store.json'
+
+# ذاكرة تخزين مؤقت محلية للأدوات (بيانات قابلة لإعادة التوليد، غير متتبعة في git)
+CACHE_DIR = ROOT / '.catalog-cache'
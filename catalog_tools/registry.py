@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""سجل المتاجر: اكتشاف كل public/assets/*/store.json مع فهرس مخزن مؤقتاً.
+
+يحفظ الفهرس (.catalog-cache/stores.json) لكل متجر معرفه و slug واسمه وعدد
+منتجاته مع حجم الملف ووقت تعديله. عند التحديث:
+
+- إذا لم يتغير وقت تعديل مجلد public/assets فمجموعة المجلدات لم تتغير
+  (إنشاء متجر جديد يضيف مجلداً)، فلا يُعاد سرد المجلد.
+- لكل متجر معروف يُفحص store.json بـ stat فقط، ولا يُقرأ إلا إذا تغير
+  حجمه أو وقت تعديله. الحقول العلوية تُقرأ بالقارئ المتدفق، وعدد المنتجات
+  من ترويسة اللقطة العمودية إن كانت حديثة.
+
+بهذا تغطي الأدوات كل المتاجر (ومنها التي ينشئها storeGeneratorService.ts)
+بدون قوائم ثابتة وبدون تحليل كل الملفات في كل تشغيل.
+"""
+
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from .paths import CACHE_DIR, PUBLIC_ASSETS, dist_path_for
+from .storeio import write_if_changed
+
+INDEX_PATH = CACHE_DIR / 'stores.json'
+INDEX_VERSION = 1
+
+
+class StoreEntry(namedtuple('StoreEntry', 'folder path store_id id slug name products size mtime_ns')):
+    """بيانات متجر واحد في الفهرس"""
+    __slots__ = ()
+
+    @property
+    def dist_path(self):
+        return dist_path_for(self.path)
+
+
+def _count_products(path, stat):
+    from .snapshot import read_header, snapshot_path
+
+    header = read_header(snapshot_path(path))
+    if header is not None:
+        _, rows, _, size, mtime_ns = header
+        if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+            return rows
+    from .stream import StoreReader
+
+    with StoreReader(path) as reader:
+        return sum(1 for _ in reader.products())
+
+
+def read_entry(folder, path, stat=None):
+    """قراءة بيانات متجر واحد من store.json"""
+    from .stream import StoreReader
+
+    path = Path(path)
+    stat = stat or path.stat()
+    with StoreReader(path) as reader:
+        header = dict(reader.header)
+    return StoreEntry(
+        folder=folder,
+        path=str(path),
+        store_id=header.get('storeId'),
+        id=header.get('id'),
+        slug=header.get('slug') or folder,
+        name=header.get('nameAr') or header.get('name') or folder,
+        products=_count_products(path, stat),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+    )
+
+
+def _sort_key(entry):
+    # المتاجر ذات المعرف أولاً بترتيب storeId ثم حسب اسم المجلد
+    store_id = entry.store_id if isinstance(entry.store_id, int) else None
+    return (store_id is None, store_id or 0, entry.folder)
+
+
+class StoreRegistry:
+    """فهرس المتاجر الموجودة تحت مجلد assets"""
+
+    def __init__(self, assets_dir=PUBLIC_ASSETS, index_path=INDEX_PATH):
+        self.assets_dir = Path(assets_dir)
+        self.index_path = Path(index_path)
+        self.assets_mtime_ns = None
+        self.entries = {}
+        # مجلدات بدون store.json مع وقت تعديلها، لاكتشاف متجر يُنشأ مجلده قبل ملفه
+        self.other_dirs = {}
+        self.refreshed = []
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or data.get('assetsDir') != str(self.assets_dir):
+            return
+        self.assets_mtime_ns = data.get('assetsMtimeNs')
+        self.other_dirs = data.get('otherDirs', {})
+        self.entries = {folder: StoreEntry(**fields) for folder, fields in data.get('stores', {}).items()}
+
+    def _folders(self, assets_mtime_ns):
+        """مجلدات المتاجر، بدون سرد public/assets إذا لم يتغير"""
+        if assets_mtime_ns == self.assets_mtime_ns:
+            folders = list(self.entries)
+            for name, mtime_ns in list(self.other_dirs.items()):
+                try:
+                    current = os.stat(self.assets_dir / name).st_mtime_ns
+                except FileNotFoundError:
+                    del self.other_dirs[name]
+                    continue
+                if current != mtime_ns:
+                    self.other_dirs[name] = current
+                    folders.append(name)
+            return folders
+        folders = []
+        self.other_dirs = {}
+        with os.scandir(self.assets_dir) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                if os.path.isfile(os.path.join(entry.path, 'store.json')):
+                    folders.append(entry.name)
+                else:
+                    self.other_dirs[entry.name] = entry.stat().st_mtime_ns
+        return folders
+
+    def refresh(self):
+        """تحديث الفهرس للمجلدات المتغيرة فقط وحفظه، وإرجاع المتاجر المتغيرة"""
+        self.refreshed = []
+        try:
+            assets_mtime_ns = self.assets_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.entries = {}
+            return self.refreshed
+
+        entries = {}
+        for folder in self._folders(assets_mtime_ns):
+            path = self.assets_dir / folder / 'store.json'
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                if path.parent.is_dir():
+                    self.other_dirs[folder] = path.parent.stat().st_mtime_ns
+                continue
+            self.other_dirs.pop(folder, None)
+            cached = self.entries.get(folder)
+            if cached is not None and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+                entries[folder] = cached
+                continue
+            try:
+                entries[folder] = read_entry(folder, path, stat)
+            except ValueError as e:
+                print(f"WARNING: تخطي {path}: {e}")
+                continue
+            self.refreshed.append(folder)
+
+        changed = bool(self.refreshed) or set(self.entries) != set(entries) or assets_mtime_ns != self.assets_mtime_ns
+        self.entries = entries
+        self.assets_mtime_ns = assets_mtime_ns
+        if changed:
+            self.save()
+        return self.refreshed
+
+    def save(self):
+        payload = json.dumps({
+            'version': INDEX_VERSION,
+            'assetsDir': str(self.assets_dir),
+            'assetsMtimeNs': self.assets_mtime_ns,
+            'otherDirs': dict(sorted(self.other_dirs.items())),
+            'stores': {folder: entry._asdict() for folder, entry in sorted(self.entries.items())},
+        }, ensure_ascii=False, indent=2).encode('utf-8')
+        write_if_changed(self.index_path, payload)
+
+    def stores(self):
+        """كل المتاجر مرتبة حسب storeId"""
+        return sorted(self.entries.values(), key=_sort_key)
+
+    def get(self, folder):
+        return self.entries.get(folder)
+
+    def by_store_id(self):
+        """قاموس {storeId: StoreEntry} للمتاجر ذات المعرف"""
+        return {entry.store_id: entry for entry in self.stores() if entry.store_id is not None}
+
+
+def discover_stores(assets_dir=PUBLIC_ASSETS):
+    """كل متاجر assets_dir بعد تحديث الفهرس"""
+    registry = StoreRegistry(assets_dir)
+    registry.refresh()
+    return registry.stores()
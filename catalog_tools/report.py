@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""تقرير كتالوج موحد لكل المتاجر في مرور واحد.
+
+لكل متجر تُقرأ اللقطة العمودية (بدون تحليل JSON) وتُحسب المجاميع بعمليات
+NumPy على الأعمدة: توزيع الشارات، حالة المخزون، شرائح التخفيض، وعدد
+المنتجات في كل فئة. المتاجر تُوزع على عمليات مع --jobs، ثم تُجمع النتائج
+في إجمالي للأسطول. المخرجات نص أو JSON أو CSV.
+
+    python -m catalog_tools report [--format text|json|csv] [--store nawaem] [-j 0]
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+
+import numpy as np
+
+from .parallel import add_jobs_argument, map_stores, resolve_jobs
+from .registry import discover_stores
+from .snapshot import open_snapshot
+
+# حالة المخزون حسب الكمية، بنفس حدود قواعد الشارات (غير متوفر / متوفر < 5)
+STOCK_LEVELS = (
+    ('outOfStock', 'غير متوفر'),
+    ('lowStock', 'كمية منخفضة'),
+    ('inStock', 'متوفر'),
+)
+LOW_STOCK_LIMIT = 5
+
+# شرائح نسبة التخفيض (originalPrice مقابل price) كحدود دنيا بالمئة
+DISCOUNT_EDGES = (0, 10, 25, 50)
+DISCOUNT_BUCKETS = ('none', '0-10', '10-25', '25-50', '50+')
+
+SECTIONS = (
+    ('badges', 'توزيع الشارات'),
+    ('stock', 'حالة المخزون'),
+    ('discounts', 'شرائح التخفيض (%)'),
+    ('categories', 'الفئات'),
+)
+
+UNLABELED = 'بدون'
+
+
+def _histogram(snapshot, column):
+    """عدد المنتجات لكل قيمة نصية في عمود (عبر فهارس جدول النصوص)"""
+    indices = snapshot.array(column)
+    if not len(indices):
+        return {}
+    counts = np.bincount(indices, minlength=snapshot.string_count)
+    return {(snapshot.string(int(i)) or UNLABELED): int(counts[i]) for i in np.flatnonzero(counts)}
+
+
+def _stock(quantity):
+    out = int(np.count_nonzero(quantity <= 0))
+    low = int(np.count_nonzero((quantity > 0) & (quantity < LOW_STOCK_LIMIT)))
+    return {'outOfStock': out, 'lowStock': low, 'inStock': len(quantity) - out - low}
+
+
+def _discounts(price, original):
+    discounted = (original > 0) & (original > price)
+    safe = np.where(original > 0, original, 1)
+    percent = (original - price) / safe * 100
+    buckets = np.searchsorted(DISCOUNT_EDGES, percent[discounted], side='left')
+    counts = np.bincount(buckets, minlength=len(DISCOUNT_BUCKETS))
+    result = {'none': int(len(price) - np.count_nonzero(discounted))}
+    result.update({name: int(count) for name, count in zip(DISCOUNT_BUCKETS[1:], counts[1:])})
+    return result
+
+
+def summarize_store(folder, name, store_path):
+    """مجاميع متجر واحد من لقطته العمودية"""
+    with open_snapshot(store_path) as snapshot:
+        return {
+            'store': folder,
+            'name': name,
+            'products': len(snapshot),
+            'badges': _histogram(snapshot, 'badge'),
+            'stock': _stock(snapshot.array('quantity')),
+            'discounts': _discounts(snapshot.array('price'), snapshot.array('originalPrice')),
+            'categories': _histogram(snapshot, 'category'),
+            'orders': int(snapshot.array('orders').sum()),
+            'likes': int(snapshot.array('likes').sum()),
+            'views': int(snapshot.array('views').sum()),
+        }
+
+
+def _merge_counts(target, counts):
+    for key, value in counts.items():
+        target[key] = target.get(key, 0) + value
+
+
+def fleet_totals(summaries):
+    """جمع مجاميع المتاجر في إجمالي واحد للأسطول"""
+    total = {'store': '*', 'name': 'الإجمالي', 'products': 0, 'orders': 0, 'likes': 0, 'views': 0}
+    for section, _ in SECTIONS:
+        total[section] = {}
+    for summary in summaries:
+        for field in ('products', 'orders', 'likes', 'views'):
+            total[field] += summary[field]
+        for section, _ in SECTIONS:
+            _merge_counts(total[section], summary[section])
+    return total
+
+
+def build_report(stores=None, jobs=1):
+    """تقرير لكل المتاجر (أو المجلدات المحددة في stores) مع الإجمالي والأخطاء"""
+    entries = discover_stores()
+    if stores:
+        wanted = set(stores)
+        entries = [entry for entry in entries if entry.folder in wanted or entry.slug in wanted]
+    results = map_stores(summarize_store,
+                         [(entry.folder, (entry.folder, entry.name, entry.path)) for entry in entries],
+                         jobs)
+    summaries = [result.value for result in results if result.ok]
+    errors = {result.key: result.error.split('\n', 1)[0] for result in results if not result.ok}
+    return {'stores': summaries, 'fleet': fleet_totals(summaries), 'errors': errors}
+
+
+def _label(section, key):
+    if section == 'stock':
+        return dict(STOCK_LEVELS).get(key, key)
+    if section == 'discounts':
+        return 'بدون تخفيض' if key == 'none' else key
+    return key
+
+
+def format_text(report):
+    out = io.StringIO()
+    for summary in report['stores'] + [report['fleet']]:
+        out.write('=' * 60 + '\n')
+        out.write(f"{summary['name']} ({summary['store']}): {summary['products']} منتج"
+                  f" | طلبات {summary['orders']} | إعجابات {summary['likes']}"
+                  f" | مشاهدات {summary['views']}\n")
+        for section, title in SECTIONS:
+            counts = summary[section]
+            if not counts:
+                continue
+            out.write(f"   {title}:\n")
+            items = counts.items() if section in ('stock', 'discounts') else \
+                sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            for key, count in items:
+                out.write(f"      • {_label(section, key)}: {count}\n")
+    for store, error in report['errors'].items():
+        out.write(f"ERROR - {store}: {error}\n")
+    return out.getvalue()
+
+
+def format_json(report):
+    return json.dumps(report, ensure_ascii=False, indent=2) + '\n'
+
+
+def format_csv(report):
+    """صيغة طويلة: store,section,key,count (صف لكل قيمة)"""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(('store', 'section', 'key', 'count'))
+    for summary in report['stores'] + [report['fleet']]:
+        for field in ('products', 'orders', 'likes', 'views'):
+            writer.writerow((summary['store'], 'totals', field, summary[field]))
+        for section, _ in SECTIONS:
+            for key, count in summary[section].items():
+                writer.writerow((summary['store'], section, key, count))
+    return out.getvalue()
+
+
+FORMATS = {'text': format_text, 'json': format_json, 'csv': format_csv}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools report',
+                                     description="تقرير الشارات والمخزون والتخفيضات والفئات لكل المتاجر")
+    parser.add_argument('--format', '-f', choices=sorted(FORMATS), default='text', help="صيغة المخرجات")
+    parser.add_argument('--store', '-s', action='append', metavar='FOLDER',
+                        help="متجر محدد (يمكن تكراره)، الافتراضي كل المتاجر")
+    parser.add_argument('--output', '-o', help="ملف المخرجات (الافتراضي stdout)")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    report = build_report(args.store, resolve_jobs(args.jobs))
+    text = FORMATS[args.format](report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""لقطة عمودية ثنائية (columnar snapshot) لكتالوج كل متجر.
+
+تحفظ الأعمدة الرقمية التي تحتاجها أدوات الفحص والتحليل كمصفوفات ثابتة
+النوع، والنصوص (الاسم، الفئة، الشارة) كفهارس في جدول نصوص مشترك بدون
+تكرار. الملف يُفتح بـ mmap ويُقرأ كل عمود كـ memoryview بدون تحليل JSON،
+فتكلفة الفتح والذاكرة شبه ثابتة مهما كبر المتجر.
+
+تنسيق الملف (كل قسم محاذى على 8 بايت، والأعمدة بترتيب بايتات الجهاز وهو
+little-endian في كل الأجهزة التي نشغل عليها الأدوات):
+    الترويسة    MAGIC ثم <IIIQq: الإصدار، عدد الصفوف، عدد النصوص،
+                حجم ملف المصدر، وقت تعديل المصدر (ns)
+    الأعمدة     بترتيب COLUMNS، كل عمود rows عنصراً من نوعه
+    النصوص      n_strings+1 إزاحة uint32 ثم بايتات UTF-8
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from .paths import CACHE_DIR
+from .storeio import atomic_write
+from .stream import StoreReader
+
+SNAPSHOT_DIR = CACHE_DIR / 'snapshots'
+MAGIC = b'STORECOL'
+VERSION = 1
+_HEADER = struct.Struct('<IIIQq')
+
+# (اسم العمود، رمز النوع في array/memoryview)
+NUMERIC_COLUMNS = (
+    ('id', 'q'),
+    ('price', 'd'),
+    ('originalPrice', 'd'),
+    ('quantity', 'q'),
+    ('orders', 'q'),
+    ('likes', 'q'),
+    ('views', 'q'),
+)
+STRING_COLUMNS = ('name', 'category', 'badge')
+COLUMNS = NUMERIC_COLUMNS + tuple((name, 'I') for name in STRING_COLUMNS)
+
+MISSING_ID = -1
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _number(value, integer, default=0):
+    """قيمة خلية رقمية، و default للناقص أو غير الرقمي أو ما لا يتسع في العمود
+
+    `1e400` يُقرأ من JSON كـ inf، والمعرف قد يكون أكبر من int64، وكلاهما
+    لا يُكتب في عمود ثابت النوع.
+    """
+    if value is None or isinstance(value, bool):
+        return default
+    try:
+        number = int(value) if integer else float(value)
+    except (TypeError, ValueError, OverflowError):
+        return default
+    if integer:
+        return number if _INT64_MIN <= number <= _INT64_MAX else default
+    return number if math.isfinite(number) else default
+
+
+def snapshot_path(store_path):
+    """مسار اللقطة المقابلة لملف store.json"""
+    return SNAPSHOT_DIR / f'{Path(store_path).parent.name}.cols'
+
+
+class SnapshotBuilder:
+    """بناء لقطة منتجاً منتجاً (مع القارئ المتدفق) بدون الاحتفاظ بالمنتجات"""
+
+    def __init__(self):
+        self.rows = 0
+        self._numeric = {name: array(code) for name, code in NUMERIC_COLUMNS}
+        self._string_columns = {name: array('I') for name in STRING_COLUMNS}
+        self._strings = []
+        self._interned = {}
+
+    def _intern(self, value):
+        value = '' if value is None else str(value)
+        index = self._interned.get(value)
+        if index is None:
+            index = self._interned[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def add(self, product):
+        self.rows += 1
+        product_id = product.get('id')
+        self._numeric['id'].append(_number(product_id, True, MISSING_ID))
+        for name, code in NUMERIC_COLUMNS[1:]:
+            self._numeric[name].append(_number(product.get(name), code == 'q'))
+        for name in STRING_COLUMNS:
+            self._string_columns[name].append(self._intern(product.get(name)))
+
+    def to_bytes(self, source_stat=None):
+        sections = [self._numeric[name].tobytes() for name, _ in NUMERIC_COLUMNS]
+        sections += [self._string_columns[name].tobytes() for name in STRING_COLUMNS]
+
+        encoded = [value.encode('utf-8') for value in self._strings]
+        offsets = array('I', [0])
+        total = 0
+        for blob in encoded:
+            total += len(blob)
+            offsets.append(total)
+        sections.append(offsets.tobytes() + b''.join(encoded))
+
+        size, mtime_ns = (source_stat.st_size, source_stat.st_mtime_ns) if source_stat else (0, 0)
+        parts = [MAGIC, _HEADER.pack(VERSION, self.rows, len(self._strings), size, mtime_ns)]
+        position = len(MAGIC) + _HEADER.size
+        for section in sections:
+            padding = _align(position) - position
+            parts.append(b'\0' * padding)
+            parts.append(section)
+            position += padding + len(section)
+        return b''.join(parts)
+
+
+def build_snapshot(store_data, source_stat=None):
+    """تحويل بيانات متجر إلى بايتات اللقطة"""
+    builder = SnapshotBuilder()
+    for product in store_data.get('products', []):
+        builder.add(product)
+    return builder.to_bytes(source_stat)
+
+
+def write_snapshot(store_path, store_data=None, builder=None):
+    """كتابة لقطة متجر بعد حفظ store.json (تُستدعى من storeio.save_store)
+
+    تُبنى اللقطة من store_data أو من builder مُعبأ مسبقاً، وإلا يُقرأ
+    store.json بالقارئ المتدفق فلا يُحمَّل الكتالوج كاملاً في الذاكرة.
+    """
+    store_path = Path(store_path)
+    if builder is None:
+        if store_data is not None:
+            payload = build_snapshot(store_data, store_path.stat())
+        else:
+            builder = SnapshotBuilder()
+            with StoreReader(store_path) as reader:
+                for product in reader.products():
+                    builder.add(product)
+    if builder is not None:
+        payload = builder.to_bytes(store_path.stat())
+    target = snapshot_path(store_path)
+    atomic_write(target, payload)
+    return target
+
+
+def read_header(path):
+    """ترويسة ملف لقطة (version, rows, n_strings, size, mtime_ns) أو None"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(len(MAGIC) + _HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(data) < len(MAGIC) + _HEADER.size or data[:len(MAGIC)] != MAGIC:
+        return None
+    return _HEADER.unpack_from(data, len(MAGIC))
+
+
+def refresh_snapshot(store_path, store_data=None, force=False, builder=None):
+    """إعادة كتابة اللقطة إذا تغير store.json منذ بنائها (أو دائماً مع force)"""
+    if not force:
+        header = read_header(snapshot_path(store_path))
+        if header is not None:
+            version, _, _, size, mtime_ns = header
+            stat = os.stat(store_path)
+            if version == VERSION and size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+                return False
+    write_snapshot(store_path, store_data, builder)
+    return True
+
+
+def refresh_or_discard(store_path, store_data=None, force=False, builder=None):
+    """refresh_snapshot بعد حفظ store.json دون أن يُفشل الحفظ
+
+    اللقطة ذاكرة مؤقتة فقط: إذا تعذر بناؤها تُحذف اللقطة القديمة (فلا تُقرأ
+    بيانات لا تطابق الملف) وتُبنى من جديد عند أول open_snapshot.
+    """
+    try:
+        return refresh_snapshot(store_path, store_data, force, builder)
+    except (OSError, ValueError, OverflowError) as e:
+        try:
+            os.remove(snapshot_path(store_path))
+        except OSError:
+            pass
+        print(f"WARNING: تعذر تحديث لقطة {store_path}: {e}", file=sys.stderr)
+        return False
+
+
+class Snapshot:
+    """لقطة متجر مفتوحة بـ mmap
+
+    الأعمدة الرقمية تُعاد كـ memoryview (أو مصفوفات NumPy عبر `array`) بدون
+    نسخ، والنصوص تُفك عند الطلب فقط.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if bytes(self._view[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise ValueError(f"ليس ملف لقطة: {self.path}")
+        (version, self.rows, self.string_count,
+         self.source_size, self.source_mtime_ns) = _HEADER.unpack_from(self._view, len(MAGIC))
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"إصدار لقطة غير مدعوم: {version}")
+
+        self._columns = {}
+        position = len(MAGIC) + _HEADER.size
+        for name, code in COLUMNS:
+            position = _align(position)
+            nbytes = self.rows * struct.calcsize(code)
+            self._columns[name] = (position, code, nbytes)
+            position += nbytes
+        position = _align(position)
+        offsets_bytes = (self.string_count + 1) * 4
+        self._string_offsets = self._view[position:position + offsets_bytes].cast('I')
+        self._string_base = position + offsets_bytes
+        self._string_cache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    def close(self):
+        for attr in ('_string_offsets', '_view'):
+            view = getattr(self, attr, None)
+            if view is not None:
+                view.release()
+                setattr(self, attr, None)
+        self._columns = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            # مصفوفات NumPy من array() ما زالت تشير إلى الملف
+            pass
+
+    def is_fresh(self, store_path):
+        """هل اللقطة مبنية من النسخة الحالية من store.json"""
+        try:
+            stat = os.stat(store_path)
+        except FileNotFoundError:
+            return False
+        return stat.st_size == self.source_size and stat.st_mtime_ns == self.source_mtime_ns
+
+    def column(self, name):
+        """عمود كـ memoryview بدون نسخ (فهارس نصوص للأعمدة النصية)"""
+        position, code, nbytes = self._columns[name]
+        return self._view[position:position + nbytes].cast(code)
+
+    def array(self, name):
+        """عمود كمصفوفة NumPy للقراءة فقط (يتطلب NumPy)"""
+        import numpy as np
+
+        position, code, nbytes = self._columns[name]
+        return np.frombuffer(self._mmap, dtype=np.dtype(code),
+                             count=self.rows, offset=position)
+
+    def string(self, index):
+        """نص من جدول النصوص حسب فهرسه"""
+        value = self._string_cache.get(index)
+        if value is None:
+            start = self._string_base + self._string_offsets[index]
+            end = self._string_base + self._string_offsets[index + 1]
+            value = self._string_cache[index] = str(self._view[start:end], 'utf-8')
+        return value
+
+    def strings(self, name):
+        """عمود نصي مفكوك كقائمة"""
+        return [self.string(index) for index in self.column(name)]
+
+    def row(self, index):
+        """صف واحد كقاموس (للعينات والعرض)"""
+        result = {name: self.column(name)[index] for name, _ in NUMERIC_COLUMNS}
+        for name in STRING_COLUMNS:
+            result[name] = self.string(self.column(name)[index])
+        return result
+
+
+def open_snapshot(store_path):
+    """فتح لقطة متجر، مع إعادة بنائها من store.json إذا كانت قديمة أو غير موجودة"""
+    target = snapshot_path(store_path)
+    try:
+        snapshot = Snapshot(target)
+    except (FileNotFoundError, ValueError):
+        snapshot = None
+    if snapshot is not None:
+        if snapshot.is_fresh(store_path):
+            return snapshot
+        snapshot.close()
+    write_snapshot(store_path)
+    return Snapshot(target)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""تعديلات بنيوية متعددة على ملف مصدر في مرور واحد (بدلاً من حذف أسطر بأرقام ثابتة).
+
+كل تعديل يحدد منطقة بمرساة (نص أو تعبير نمطي) بدلاً من أرقام الأسطر:
+
+- start فقط: سطر المرساة.
+- start و end: من سطر start حتى سطر end (أول ظهور بعد start).
+- start مع block=True: من سطر start حتى سطر القوس الذي يغلق أول قوس بعد
+  المرساة (حدود مكوّن أو قسم JSX)، بفحص يفهم النصوص والتعليقات وJSX.
+
+المناطق كلها تُحدد على النص الأصلي أولاً، فلا يؤثر تعديل على مواقع ما بعده،
+ثم يُبنى الناتج بمرور واحد ويُكتب ذرياً. المرساة الغائبة أو المتكررة (بدون
+occurrence) أو المناطق المتداخلة خطأ، ولا يُكتب شيء. unless_contains يجعل
+التعديل آمناً للتكرار: إذا احتوت المنطقة النص المحدد يُتخطى التعديل.
+
+    python -m catalog_tools splice edits.json [--dry-run]
+
+حيث edits.json:
+    {"file": "src/pages/Foo.tsx",
+     "edits": [{"start": "{activeSection === 'old' && (", "block": true}]}
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from .paths import ROOT
+from .srcpos import SourceIndex
+from .storeio import atomic_write
+
+Region = namedtuple('Region', 'edit start end first_line last_line skipped')
+
+
+class SpliceError(ValueError):
+    """مرساة غير موجودة أو ملتبسة أو مناطق متداخلة"""
+
+
+class Edit:
+    """تعديل واحد: المنطقة المحددة بالمراسي تُستبدل بـ replace (الافتراضي حذفها)"""
+
+    def __init__(self, start, end=None, replace='', block=False, regex=False,
+                 occurrence=None, unless_contains=None, label=None):
+        self.start = start
+        self.end = end
+        self.replace = replace
+        self.block = block
+        self.regex = regex
+        self.occurrence = occurrence
+        self.unless_contains = unless_contains
+        self.label = label or start.strip()[:60]
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def _matches(self, text, anchor):
+        if self.regex:
+            return [(m.start(), m.end()) for m in re.finditer(anchor, text)]
+        found = []
+        i = text.find(anchor)
+        while i != -1:
+            found.append((i, i + len(anchor)))
+            i = text.find(anchor, i + 1)
+        return found
+
+    def locate(self, text, index, jsx=True):
+        """تحديد منطقة التعديل (بداية السطر حتى نهاية السطر الأخير) في text"""
+        matches = self._matches(text, self.start)
+        if not matches:
+            raise SpliceError(f"المرساة غير موجودة: {self.label!r}")
+        if self.occurrence is None:
+            if len(matches) > 1:
+                lines = ', '.join(str(index.line_of(start)) for start, _ in matches[:10])
+                raise SpliceError(f"المرساة {self.label!r} متكررة {len(matches)} مرات (الأسطر {lines})، حدد occurrence")
+            match_start, match_end = matches[0]
+        elif not 1 <= self.occurrence <= len(matches):
+            raise SpliceError(f"المرساة {self.label!r} تظهر {len(matches)} مرات فقط")
+        else:
+            match_start, match_end = matches[self.occurrence - 1]
+
+        first_line = index.line_of(match_start)
+        if self.block:
+            from .braces import find_closing
+
+            opener = re.compile(r'[{(\[]').search(text, match_start)
+            closing = find_closing(text, opener.start(), jsx) if opener else None
+            if closing is None:
+                raise SpliceError(f"لا يوجد قوس مغلق للكتلة بعد المرساة {self.label!r}")
+            last_line = index.line_of(closing)
+        elif self.end is not None:
+            if self.regex:
+                found = re.compile(self.end).search(text, match_end)
+                end_pos = found.start() if found else -1
+            else:
+                end_pos = text.find(self.end, match_end)
+            if end_pos == -1:
+                raise SpliceError(f"مرساة النهاية غير موجودة بعد {self.label!r}: {self.end!r}")
+            last_line = index.line_of(end_pos)
+        else:
+            last_line = first_line
+
+        start = index.line_span(first_line)[0]
+        end = index.line_span(last_line)[1]
+        skipped = self.unless_contains is not None and self.unless_contains in text[start:end]
+        return Region(self, start, end, first_line, last_line, skipped)
+
+
+def plan(text, edits, jsx=True):
+    """مناطق التعديلات مرتبة حسب الموقع، مع رفض المتداخلة"""
+    index = SourceIndex(text)
+    regions = sorted((edit.locate(text, index, jsx) for edit in edits), key=lambda region: region.start)
+    for previous, region in zip(regions, regions[1:]):
+        if region.start < previous.end:
+            raise SpliceError(f"تعديلان متداخلان: {previous.edit.label!r} (الأسطر {previous.first_line}-"
+                              f"{previous.last_line}) و {region.edit.label!r} (الأسطر {region.first_line}-"
+                              f"{region.last_line})")
+    return regions
+
+
+def splice_text(text, regions):
+    """بناء النص الجديد بمرور واحد على المناطق المرتبة"""
+    parts = []
+    cursor = 0
+    for region in regions:
+        if region.skipped:
+            continue
+        parts.append(text[cursor:region.start])
+        parts.append(region.edit.replace)
+        cursor = region.end
+    parts.append(text[cursor:])
+    return ''.join(parts)
+
+
+def splice_file(path, edits, dry_run=False, encoding='utf-8'):
+    """تطبيق التعديلات على ملف وإرجاع (المناطق، فرق الحجم بالبايت، هل كُتب)"""
+    path = Path(path)
+    original = path.read_bytes()
+    text = original.decode(encoding)
+    regions = plan(text, edits, jsx=path.suffix in ('.tsx', '.jsx'))
+    payload = splice_text(text, regions).encode(encoding)
+    written = not dry_run and payload != original
+    if written:
+        atomic_write(path, payload)
+    return regions, len(payload) - len(original), written
+
+
+def describe(regions):
+    lines = []
+    for region in regions:
+        status = "تخطي (مطبق مسبقاً)" if region.skipped else (
+            "استبدال" if region.edit.replace else "حذف")
+        lines.append(f"   {status}: الأسطر {region.first_line}-{region.last_line}"
+                     f" ({region.last_line - region.first_line + 1} سطر) - {region.edit.label}")
+    return '\n'.join(lines)
+
+
+def run(path, edits, dry_run=False):
+    """تطبيق التعديلات مع طباعة ملخص، وإرجاع رمز الخروج"""
+    try:
+        regions, delta, written = splice_file(path, edits, dry_run)
+    except SpliceError as e:
+        print(f"ERROR - {path}: {e}")
+        return 1
+    print(f"{path}:")
+    print(describe(regions))
+    status = "تمت الكتابة" if written else ("تجربة بدون كتابة" if dry_run else "بدون تغيير")
+    print(f"فرق الحجم: {delta:+,} بايت - {status}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools splice',
+                                     description="تطبيق تعديلات محددة بمراسٍ على ملف مصدر في مرور واحد")
+    parser.add_argument('spec', help="ملف JSON فيه file و edits")
+    parser.add_argument('--file', help="الملف المطلوب تعديله (بدلاً من file في المواصفات)")
+    parser.add_argument('--dry-run', '-n', action='store_true', help="عرض المناطق وفرق الحجم بدون كتابة")
+    args = parser.parse_args(argv)
+
+    with open(args.spec, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    path = Path(args.file or spec['file'])
+    if not path.is_absolute():
+        path = ROOT / path
+    return run(path, [Edit.from_dict(edit) for edit in spec['edits']], args.dry_run)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
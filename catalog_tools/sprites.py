@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""بناء أطالس (sprite atlases) لشعارات البنوك والدفع والشحن.
+
+صفحة الدفع تحمّل نحو 50 شعاراً صغيراً من data/banks و data/payment و
+data/transport كل منها بطلب مستقل. هنا تُجمع شعارات كل مجموعة في صورة
+WebP واحدة مع خريطة إحداثيات JSON و CSS:
+
+- كل شعار يُقص من الحواف الشفافة ويُصغر ليتسع في LOGO_BOX (بكثافة SCALE
+  لشاشات retina) ثم تُرتب الشعارات بخوارزمية MaxRects (أسفل-يسار) مع
+  تجربة عدة عروض واختيار الأطلس الأصغر مساحة.
+- SVG يُرسم في الأطلس إذا كانت cairosvg مثبتة، وإلا يُنسخ كما هو ويأخذ
+  صنف CSS خاصاً به (standalone).
+- لكل مجموعة مفتاح من أسماء الملفات وأحجامها وأوقات تعديلها وإعدادات
+  البناء، محفوظ في sprites.json، فالمجموعة التي لم يتغير أي من مدخلاتها
+  لا يُعاد بناؤها. رابط الأطلس فيه ?v=<بصمة المحتوى> لتخزين CDN طويل.
+
+المخرجات في public/assets/sprites: <المجموعة>.webp و sprites.json و
+sprites.css، والاستخدام:
+
+    <span class="logo-sprite logo-banks-jussor"></span>
+
+يتطلب Pillow، ويُستورد عند الحاجة فقط.
+
+    python -m catalog_tools sprites [--force] [-j 0]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from importlib.util import find_spec
+
+from .parallel import add_jobs_argument, map_stores, resolve_jobs
+from .paths import ROOT
+from .storeio import temp_path, write_if_changed
+
+SOURCE_DIR = ROOT / 'data'
+GROUPS = ('banks', 'payment', 'transport')
+OUTPUT_DIR = ROOT / 'public' / 'assets' / 'sprites'
+URL_PREFIX = '/assets/sprites'
+
+# أقصى عرض وارتفاع للشعار بوحدات CSS، والأطلس يُرسم بكثافة SCALE
+LOGO_BOX = (96, 48)
+SCALE = 2
+# أحجام الشعارات والفراغ بينها مضاعفات SCALE، فكل إحداثيات CSS أعداد صحيحة
+PADDING = SCALE
+WEBP_QUALITY = 90
+ATLAS_WIDTHS = (256, 384, 512, 768, 1024, 1536, 2048)
+
+# عند تكرار اسم الشعار بامتدادين يُفضل الأول في هذا الترتيب
+EXTENSIONS = ('.png', '.webp', '.jpg', '.jpeg', '.svg')
+
+BUILD_VERSION = 2
+
+
+def _slug(stem):
+    return re.sub(r'[^a-z0-9]+', '-', stem.lower()).strip('-')
+
+
+def group_sources(group):
+    """({الاسم: المسار}، [الملفات المتجاهلة لتكرار الاسم]) لمجموعة واحدة"""
+    directory = SOURCE_DIR / group
+    if not directory.is_dir():
+        return {}, []
+    files = sorted((path for path in directory.iterdir() if path.suffix.lower() in EXTENSIONS),
+                   key=lambda path: (_slug(path.stem), EXTENSIONS.index(path.suffix.lower()), path.name))
+    sources = {}
+    ignored = []
+    for path in files:
+        name = _slug(path.stem)
+        if name in sources:
+            ignored.append(path.relative_to(ROOT).as_posix())
+        else:
+            sources[name] = path
+    return sources, ignored
+
+
+def inputs_key(sources, can_rasterize_svg):
+    """بصمة مدخلات المجموعة: الملفات (الحجم ووقت التعديل) وإعدادات البناء"""
+    entries = []
+    for name, path in sorted(sources.items()):
+        stat = path.stat()
+        entries.append([name, path.name, stat.st_size, stat.st_mtime_ns])
+    params = [BUILD_VERSION, LOGO_BOX, SCALE, PADDING, WEBP_QUALITY, can_rasterize_svg]
+    payload = json.dumps([params, entries], separators=(',', ':')).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+
+def pack(sizes, width):
+    """مواضع (x, y) لكل مستطيل (w, h) داخل عرض ثابت بخوارزمية MaxRects، أو None"""
+    free = [(0, 0, width, 1 << 30)]
+    positions = [None] * len(sizes)
+    # الأعلى ثم الأعرض أولاً
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        w, h = sizes[i]
+        best = None
+        for fx, fy, fw, fh in free:
+            if w <= fw and h <= fh and (best is None or (fy + h, fx) < best):
+                best = (fy + h, fx)
+        if best is None:
+            return None
+        x, y = best[1], best[0] - h
+        positions[i] = (x, y)
+
+        # تقسيم كل مستطيل حر يتقاطع مع المستطيل المستخدم إلى ما حوله
+        split = []
+        for fx, fy, fw, fh in free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                split.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                split.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                split.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                split.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                split.append((fx, y + h, fw, fy + fh - y - h))
+        # حذف المستطيلات المحتواة في غيرها
+        free = [a for k, a in enumerate(split)
+                if not any(j != k and b[0] <= a[0] and b[1] <= a[1] and a[0] + a[2] <= b[0] + b[2]
+                           and a[1] + a[3] <= b[1] + b[3] and (b != a or j < k)
+                           for j, b in enumerate(split))]
+    return positions
+
+
+def best_layout(sizes):
+    """(العرض، الارتفاع، المواضع) لأصغر أطلس بين ATLAS_WIDTHS"""
+    widest = max(w for w, _ in sizes)
+    best = None
+    for width in sorted({max(widest, width) for width in ATLAS_WIDTHS}):
+        positions = pack(sizes, width)
+        if positions is None:
+            continue
+        used_width = max(x + w for (x, _), (w, _) in zip(positions, sizes))
+        height = max(y + h for (_, y), (_, h) in zip(positions, sizes))
+        # الأصغر مساحة ثم الأقرب للمربع
+        score = (used_width * height, abs(used_width - height))
+        if best is None or score < best[0]:
+            best = (score, used_width, height, positions)
+    return best[1], best[2], best[3]
+
+
+def _load_logo(path):
+    from PIL import Image
+
+    box = (LOGO_BOX[0] * SCALE, LOGO_BOX[1] * SCALE)
+    if path.suffix.lower() == '.svg':
+        import io
+
+        import cairosvg
+
+        png = cairosvg.svg2png(url=str(path), output_width=box[0] * 4)
+        img = Image.open(io.BytesIO(png))
+    else:
+        img = Image.open(path)
+        img.draft('RGB', box)
+    img = img.convert('RGBA')
+    bbox = img.getchannel('A').getbbox()
+    if bbox:
+        img = img.crop(bbox)
+    img.thumbnail(box, Image.Resampling.LANCZOS)
+    return _pad_to_scale(img)
+
+
+def _pad_to_scale(img):
+    """توسيع الصورة بحواف شفافة (يمين وأسفل) إلى مضاعف SCALE"""
+    from PIL import Image
+
+    width, height = -(-img.width // SCALE) * SCALE, -(-img.height // SCALE) * SCALE
+    if (width, height) == img.size:
+        return img
+    padded = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    padded.paste(img, (0, 0))
+    return padded
+
+
+def _offset(value):
+    return f'-{value:g}px' if value else '0'
+
+
+def build_group(group, sources, ignored, key, can_rasterize_svg):
+    """بناء أطلس مجموعة واحدة وإرجاع مدخلها في sprites.json"""
+    from PIL import Image
+
+    rasters = {name: path for name, path in sources.items()
+               if can_rasterize_svg or path.suffix.lower() != '.svg'}
+    standalone = {}
+    for name, path in sources.items():
+        if name in rasters:
+            continue
+        target = OUTPUT_DIR / group / path.name
+        os.makedirs(target.parent, exist_ok=True)
+        shutil.copyfile(path, target)
+        standalone[name] = {'url': f'{URL_PREFIX}/{group}/{path.name}',
+                            'source': path.relative_to(ROOT).as_posix()}
+
+    entry = {'key': key, 'atlas': None, 'width': 0, 'height': 0, 'logos': {},
+             'standalone': standalone, 'ignored': ignored}
+    if not rasters:
+        return entry
+
+    names = sorted(rasters)
+    images = [_load_logo(rasters[name]) for name in names]
+    sizes = [(img.width + PADDING, img.height + PADDING) for img in images]
+    width, height, positions = best_layout(sizes)
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    for img, (x, y) in zip(images, positions):
+        atlas.paste(img, (x, y))
+
+    target = OUTPUT_DIR / f'{group}.webp'
+    os.makedirs(target.parent, exist_ok=True)
+    tmp = temp_path(target)
+    atlas.save(tmp, 'WEBP', quality=WEBP_QUALITY, method=6)
+    with open(tmp, 'rb') as f:
+        version = hashlib.sha1(f.read()).hexdigest()[:10]
+    os.replace(tmp, target)
+
+    entry.update({
+        'atlas': f'{URL_PREFIX}/{group}.webp?v={version}',
+        'width': width / SCALE,
+        'height': height / SCALE,
+        'logos': {name: {'x': x / SCALE, 'y': y / SCALE, 'w': img.width / SCALE, 'h': img.height / SCALE,
+                         'source': rasters[name].relative_to(ROOT).as_posix()}
+                  for name, img, (x, y) in zip(names, images, positions)},
+    })
+    return entry
+
+
+def render_css(manifest):
+    lines = ["/* مولد بواسطة python -m catalog_tools sprites - لا يُعدل يدوياً */",
+             ".logo-sprite{display:inline-block;background-repeat:no-repeat}"]
+    for group, entry in manifest['groups'].items():
+        if entry['atlas']:
+            selectors = ','.join(f'.logo-{group}-{name}' for name in entry['logos'])
+            lines.append(f"{selectors}{{background-image:url({entry['atlas']});"
+                         f"background-size:{entry['width']:g}px {entry['height']:g}px}}")
+            for name, logo in entry['logos'].items():
+                lines.append(f".logo-{group}-{name}{{width:{logo['w']:g}px;height:{logo['h']:g}px;"
+                             f"background-position:{_offset(logo['x'])} {_offset(logo['y'])}}}")
+        for name, logo in entry['standalone'].items():
+            lines.append(f".logo-{group}-{name}{{background-image:url({logo['url']});"
+                         f"background-size:contain;background-position:center;"
+                         f"width:{LOGO_BOX[0]}px;height:{LOGO_BOX[1]}px}}")
+    return '\n'.join(lines) + '\n'
+
+
+def load_manifest():
+    try:
+        with open(OUTPUT_DIR / 'sprites.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'groups': {}}
+    return manifest if isinstance(manifest.get('groups'), dict) else {'groups': {}}
+
+
+def _is_current(entry, key):
+    if entry is None or entry.get('key') != key:
+        return False
+    if entry.get('atlas') and not (OUTPUT_DIR / entry['atlas'].split('?')[0].rsplit('/', 1)[1]).exists():
+        return False
+    return all((ROOT / 'public' / logo['url'].lstrip('/')).exists()
+               for logo in entry.get('standalone', {}).values())
+
+
+def build(groups=GROUPS, force=False, jobs=1):
+    """بناء الأطالس المتغيرة فقط وإرجاع (الأطلس، المبني، الأخطاء)"""
+    can_rasterize_svg = find_spec('cairosvg') is not None
+    manifest = load_manifest()
+    tasks = []
+    for group in groups:
+        sources, ignored = group_sources(group)
+        if not sources:
+            manifest['groups'].pop(group, None)
+            continue
+        key = inputs_key(sources, can_rasterize_svg)
+        if force or not _is_current(manifest['groups'].get(group), key):
+            tasks.append((group, (group, sources, ignored, key, can_rasterize_svg)))
+
+    built = []
+    errors = {}
+    for result in map_stores(build_group, tasks, jobs):
+        if result.ok:
+            manifest['groups'][result.key] = result.value
+            built.append(result.key)
+        else:
+            errors[result.key] = result.error.splitlines()[0]
+
+    order = list(GROUPS) + sorted(group for group in manifest['groups'] if group not in GROUPS)
+    manifest = {'version': BUILD_VERSION, 'scale': SCALE,
+                'groups': {group: manifest['groups'][group] for group in order if group in manifest['groups']}}
+    write_if_changed(OUTPUT_DIR / 'sprites.json',
+                     (json.dumps(manifest, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+    write_if_changed(OUTPUT_DIR / 'sprites.css', render_css(manifest).encode('utf-8'))
+    return manifest, built, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools sprites',
+                                     description="بناء أطالس شعارات البنوك والدفع والشحن")
+    parser.add_argument('groups', nargs='*', default=list(GROUPS), help="المجموعات (الافتراضي كلها)")
+    parser.add_argument('--force', action='store_true', help="إعادة البناء حتى لو لم تتغير المدخلات")
+    add_jobs_argument(parser)
+    parser.set_defaults(jobs=0)
+    args = parser.parse_args(argv)
+
+    if find_spec('PIL') is None:
+        print("ERROR - sprites يتطلب Pillow: pip install Pillow", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    manifest, built, errors = build(tuple(args.groups), args.force, resolve_jobs(args.jobs))
+    for group, entry in manifest['groups'].items():
+        status = "أعيد بناؤه" if group in built else "بدون تغيير"
+        size = f"{entry['width']:g}x{entry['height']:g}" if entry['atlas'] else "-"
+        print(f"OK - {group}: {len(entry['logos'])} شعار في الأطلس ({size})، "
+              f"{len(entry['standalone'])} منفصل - {status}")
+        for path in entry['ignored']:
+            print(f"   تجاهل (اسم مكرر): {path}")
+    for group, error in errors.items():
+        print(f"ERROR - {group}: {error}")
+    print(f"({time.perf_counter() - started:.2f}s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
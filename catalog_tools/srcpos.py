@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""فهرس مواضع الأسطر في ملفات المصدر.
+
+يُبنى الفهرس مرة واحدة لكل نص (مواضع بدايات الأسطر) ثم يحوَّل أي موضع
+(offset) إلى سطر وعمود ببحث ثنائي بدلاً من عد الأسطر في بادئة النص لكل
+نتيجة.
+"""
+
+import re
+from bisect import bisect_right
+
+_NEWLINE_RE = re.compile('\n')
+
+
+class SourceIndex:
+    """تحويل المواضع في نص إلى (سطر، عمود) والعكس، والترقيم يبدأ من 1"""
+
+    def __init__(self, text):
+        self.length = len(text)
+        self.line_starts = [0]
+        self.line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(text))
+
+    @classmethod
+    def from_file(cls, path, encoding='utf-8'):
+        with open(path, 'r', encoding=encoding, newline='') as f:
+            return cls(f.read())
+
+    @property
+    def line_count(self):
+        return len(self.line_starts)
+
+    def line_of(self, offset):
+        """رقم السطر الذي يقع فيه الموضع"""
+        if not 0 <= offset <= self.length:
+            raise IndexError(f"الموضع {offset} خارج النص")
+        return bisect_right(self.line_starts, offset)
+
+    def line_col(self, offset):
+        """(سطر، عمود) للموضع"""
+        line = self.line_of(offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def offset_of(self, line, column=1):
+        """الموضع المقابل لسطر وعمود"""
+        if not 1 <= line <= len(self.line_starts):
+            raise IndexError(f"السطر {line} خارج النص")
+        return self.line_starts[line - 1] + column - 1
+
+    def line_span(self, line):
+        """(بداية، نهاية) السطر بما في ذلك محرف نهاية السطر"""
+        start = self.offset_of(line)
+        end = self.line_starts[line] if line < len(self.line_starts) else self.length
+        return start, end
+
+    def describe(self, offset):
+        """وصف مختصر للموضع بصيغة line:col"""
+        line, column = self.line_col(offset)
+        return f"{line}:{column}"
+
+
+def byte_offsets(text, offsets, encoding='utf-8'):
+    """تحويل مواضع المحارف في text إلى إزاحات بايت في الملف المرمز
+
+    المواضع تُعالج بترتيبها، فيُرمَّز كل جزء من النص مرة واحدة فقط.
+    """
+    result = {}
+    position = byte = 0
+    for offset in sorted(set(offsets)):
+        byte += len(text[position:offset].encode(encoding))
+        position = offset
+        result[offset] = byte
+    return [result[offset] for offset in offsets]
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""توليد إحصائيات تجريبية حتمية للمنتجات (rating, reviews, views, likes, orders, quantity).
+
+كل قيمة تُشتق من تجزئة splitmix64 للمفتاح (البذرة، المتجر، معرف المنتج،
+الحقل)، فالقيمة لا تعتمد على ترتيب المنتجات أو عددها: نفس البذرة تعطي نفس
+الكتالوج في كل تشغيل، وإضافة منتج لا تغير قيم غيره، ونتائج الشارات ثابتة.
+التوليد بعمليات NumPy على أعمدة المتجر كله (أو دفعة منه).
+
+الحقول مرتبطة حسب ملف التعريف: views ثم likes كنسبة من views ثم orders
+كنسبة من likes ثم reviews كنسبة من orders. الحقل الموجود لا يُغير (القيمة
+الناقصة فقط: مفتاح غير موجود أو None)، والحقل المولَّد يعتمد على القيمة
+الموجودة للحقل الذي يسبقه إن وجدت.
+
+أنواع التوزيعات في ملف التعريف:
+    uniform    - low..high
+    lognormal  - median و sigma
+    ratio      - of (حقل سابق) × نسبة بين low..high
+ومع كل نوع: min و max للقص، و digits (0 = عدد صحيح)، و in_stock_only
+(القيمة 0 للمنتجات غير المتوفرة).
+"""
+
+import hashlib
+import json
+from collections import Counter
+from math import pi
+
+import numpy as np
+
+DEFAULT_SEED = 1
+
+STAT_FIELDS = ('rating', 'reviews', 'views', 'likes', 'orders', 'quantity')
+
+# الترتيب مهم: الحقل الذي تُشتق منه النسبة يسبق الحقل المشتق
+DEFAULT_PROFILE = {
+    'views': {'kind': 'lognormal', 'median': 180, 'sigma': 0.45, 'min': 50, 'max': 450},
+    'likes': {'kind': 'ratio', 'of': 'views', 'low': 0.1, 'high': 0.7, 'min': 10, 'max': 300},
+    'orders': {'kind': 'ratio', 'of': 'likes', 'low': 0.15, 'high': 0.6, 'min': 5, 'max': 150},
+    'reviews': {'kind': 'ratio', 'of': 'orders', 'low': 0.3, 'high': 1.0, 'min': 10, 'max': 100},
+    'rating': {'kind': 'uniform', 'low': 4.0, 'high': 5.0, 'digits': 1},
+    'quantity': {'kind': 'uniform', 'low': 5, 'high': 50, 'in_stock_only': True},
+}
+
+_MASK = (1 << 64) - 1
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(x):
+    with np.errstate(over='ignore'):
+        x = x + _GOLDEN
+        x = (x ^ (x >> np.uint64(30))) * _MIX1
+        x = (x ^ (x >> np.uint64(27))) * _MIX2
+    return x ^ (x >> np.uint64(31))
+
+
+def _hash64(*parts):
+    digest = hashlib.blake2b(':'.join(str(part) for part in parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _id_key(product_id):
+    return type(product_id).__name__, str(product_id)
+
+
+def product_keys(products):
+    """مفتاح 64-بت لكل منتج من معرفه (المعرفات غير الرقمية تُجزأ)
+
+    المعرف الناقص أو المكرر في نفس المتجر يُضاف إليه موضع المنتج، وإلا
+    حصلت كل هذه المنتجات على نفس الإحصائيات.
+    """
+    counts = Counter(_id_key(product.get('id')) for product in products)
+    keys = np.empty(len(products), dtype=np.uint64)
+    for i, product in enumerate(products):
+        product_id = product.get('id')
+        if product_id is None or counts[_id_key(product_id)] > 1:
+            keys[i] = _hash64('id', *_id_key(product_id), 'at', i)
+        elif isinstance(product_id, int) and not isinstance(product_id, bool):
+            keys[i] = product_id & _MASK
+        else:
+            keys[i] = _hash64('id', product_id, '')
+    return keys
+
+
+def uniforms(keys, seed, store, field, stream=0):
+    """أعداد منتظمة في [0, 1) حتمية لكل مفتاح"""
+    base = np.uint64(_hash64(seed, store, field, stream))
+    bits = _splitmix64(keys ^ base)
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def _normals(keys, seed, store, field):
+    # Box-Muller من تيارين منتظمين
+    u1 = 1.0 - uniforms(keys, seed, store, field, 1)
+    u2 = uniforms(keys, seed, store, field, 2)
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2 * pi * u2)
+
+
+def _column(products, field):
+    """(القيم كـ float مع NaN للناقص، قناع الناقص)"""
+    values = np.array([product.get(field) if isinstance(product.get(field), (int, float)) else np.nan
+                       for product in products], dtype=np.float64)
+    missing = np.array([product.get(field) is None for product in products], dtype=bool)
+    return values, missing
+
+
+def _generate(spec, keys, seed, store, field, columns, in_stock):
+    kind = spec['kind']
+    if kind == 'uniform':
+        low, high = spec['low'], spec['high']
+        if spec.get('digits', 0) == 0:
+            # أعداد صحيحة low..high شاملة
+            values = low + np.floor(uniforms(keys, seed, store, field) * (high - low + 1))
+        else:
+            values = low + uniforms(keys, seed, store, field) * (high - low)
+    elif kind == 'lognormal':
+        values = spec['median'] * np.exp(spec['sigma'] * _normals(keys, seed, store, field))
+    elif kind == 'ratio':
+        source = columns[spec['of']]
+        ratio = spec['low'] + uniforms(keys, seed, store, field) * (spec['high'] - spec['low'])
+        values = np.nan_to_num(source) * ratio
+    else:
+        raise ValueError(f"نوع توزيع غير معروف للحقل {field}: {kind}")
+
+    if 'min' in spec or 'max' in spec:
+        values = np.clip(values, spec.get('min', -np.inf), spec.get('max', np.inf))
+    digits = spec.get('digits', 0)
+    values = np.round(values, digits)
+    if spec.get('in_stock_only'):
+        values = np.where(in_stock, values, 0)
+    return values
+
+
+def fill_products(products, store, seed=DEFAULT_SEED, profile=None):
+    """ملء الحقول الناقصة فقط في قائمة منتجات، وإرجاع {الحقل: عدد القيم المملوءة}
+
+    نفس (البذرة، المتجر، معرف المنتج) تعطي نفس القيم سواء عولج المتجر كاملاً أو على دفعات،
+    ما عدا المعرفات الناقصة أو المكررة التي يعتمد مفتاحها على موضع المنتج في القائمة.
+    """
+    profile = profile or DEFAULT_PROFILE
+    if not products:
+        return {}
+    keys = product_keys(products)
+    in_stock = np.array([bool(product.get('inStock')) for product in products], dtype=bool)
+    columns = {}
+    filled = {}
+    for field, spec in profile.items():
+        values, missing = _column(products, field)
+        if missing.any():
+            generated = _generate(spec, keys, seed, store, field, columns, in_stock)
+            values = np.where(missing, generated, values)
+            as_int = spec.get('digits', 0) == 0
+            for i in np.flatnonzero(missing):
+                value = values[i]
+                products[i][field] = int(value) if as_int else float(value)
+            filled[field] = int(missing.sum())
+        columns[field] = values
+    return filled
+
+
+def load_profile(path):
+    """ملف تعريف من JSON بنفس بنية DEFAULT_PROFILE (الحقول غير المذكورة من الافتراضي)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    profile = {field: dict(spec) for field, spec in DEFAULT_PROFILE.items()}
+    for field, spec in overrides.items():
+        profile[field] = spec
+    return profile
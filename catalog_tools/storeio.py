@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""قراءة وكتابة ملفات store.json بنفس التنسيق الذي تستخدمه السكربتات.
+
+الكتابة ذرية: تُكتب البايتات إلى ملف مؤقت في نفس المجلد ثم يُستبدل الملف
+الأصلي بـ os.replace، فلا يُقدَّم ملف نصف مكتوب أبداً حتى لو توقف السكربت
+أثناء الكتابة. يُحوَّل المتجر إلى JSON مرة واحدة وتُملأ نسخة dist من نفس
+البايتات (أو بنسخ reflink عندما يدعمه نظام الملفات).
+"""
+
+import json
+import os
+from pathlib import Path
+
+# ioctl FICLONE في لينكس (نسخ copy-on-write على btrfs/xfs)
+_FICLONE = 0x40049409
+
+
+def load_store(path):
+    """تحميل ملف store.json"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_store(store_data):
+    """تحويل بيانات المتجر إلى بايتات بنفس تنسيق json.dump(indent=2)"""
+    return json.dumps(store_data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def read_bytes(path):
+    """قراءة محتوى الملف أو None إذا لم يكن موجوداً"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def temp_path(path):
+    """مسار ملف مؤقت في نفس مجلد path (ليكون os.replace ذرياً)"""
+    return path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+
+
+def atomic_write(path, payload):
+    """كتابة البايتات عبر ملف مؤقت ثم استبدال الملف الأصلي"""
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_if_changed(path, payload):
+    """كتابة البايتات (ذرياً) فقط إذا اختلفت عن محتوى الملف الحالي
+
+    تعيد True إذا تمت الكتابة و False إذا كان الملف مطابقاً.
+    """
+    if read_bytes(path) == payload:
+        return False
+    atomic_write(path, payload)
+    return True
+
+
+def reflink(src, dst):
+    """نسخ src إلى dst بـ reflink، وإرجاع False إذا لم يكن مدعوماً"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    dst = Path(dst)
+    tmp = temp_path(dst)
+    try:
+        with open(src, 'rb') as s, open(tmp, 'wb') as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        os.replace(tmp, dst)
+        return True
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        return False
+
+
+def mirror(src_path, dist_path, payload, verified=False):
+    """تحديث نسخة dist لتطابق payload المكتوب في src_path
+
+    `verified` تعني أن src_path يحتوي payload بالفعل فلا داعي لقراءته.
+    يُستخدم reflink عندما يكون متاحاً، وإلا تُكتب نفس البايتات ذرياً. لا
+    تُستخدم الروابط الصلبة (hardlinks) لأن التعديل المباشر على ملف public
+    سيغير نسخة dist أيضاً دون المرور بالسكربتات.
+    """
+    if read_bytes(dist_path) == payload:
+        return False
+    os.makedirs(Path(dist_path).parent, exist_ok=True)
+    if (verified or read_bytes(src_path) == payload) and reflink(src_path, dist_path):
+        return True
+    atomic_write(dist_path, payload)
+    return True
+
+
+def save_store(store_path, store_data, dist_path=None, snapshot=True):
+    """حفظ المتجر ونسخة dist من تحويل JSON واحد
+
+    مع snapshot=True تُحدَّث أيضاً اللقطة العمودية للمتجر (catalog_tools.snapshot)
+    إذا تغير الملف أو كانت اللقطة قديمة. تعيد زوج (تمت كتابة public، تمت كتابة dist).
+    """
+    payload = dump_store(store_data)
+    written = write_if_changed(store_path, payload)
+    mirrored = mirror(store_path, dist_path, payload, verified=True) if dist_path is not None else False
+    if snapshot:
+        from .snapshot import refresh_or_discard
+        refresh_or_discard(store_path, store_data, force=written)
+    return written, mirrored
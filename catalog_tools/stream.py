@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""قراءة وكتابة store.json بشكل متدفق (streaming).
+
+StoreReader يقرأ الملف على أجزاء ويُخرج منتجات مصفوفة `products` واحداً
+تلو الآخر، فالذاكرة المستخدمة لا تعتمد على حجم الكتالوج. الحقول التي تسبق
+`products` في الملف (id, slug, name ...) متاحة فوراً في `header`، والحقول
+التي بعدها (sliderImages, status ...) في `trailer` بعد انتهاء المنتجات.
+
+StoreWriter يكتب نفس التنسيق الذي ينتجه json.dump(indent=2) بايتاً ببايت،
+عبر ملف مؤقت يُستبدل به الملف الأصلي فقط إذا تغير محتواه.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+from .storeio import reflink, temp_path
+
+CHUNK_SIZE = 1 << 16
+PRODUCTS_KEY = 'products'
+
+_WS_RE = re.compile(r'[ \t\n\r]*')
+
+
+class StoreReader:
+    """قارئ متدفق لملف store.json"""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE, track_offsets=False):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        # مع track_offsets تُحسب إزاحة البايت ورقم السطر لكل منتج تدريجياً
+        self.track_offsets = track_offsets
+        self._mark_pos = 0
+        self._mark_byte = 0
+        self._mark_line = 1
+        # newline='' يحفظ \r\n كما هي فتبقى إزاحات البايت صحيحة في ملفات CRLF
+        self._file = open(self.path, 'r', encoding='utf-8', newline='')
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self.header = {}
+        self.trailer = {}
+        self.has_products = False
+        self._state = 'header'
+        self._expect('{')
+        self._read_fields(self.header, stop_at_products=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    # -- إدارة المخزن المؤقت --------------------------------------------
+
+    def _fill(self, size):
+        """قراءة جزء إضافي، وإرجاع False عند نهاية الملف"""
+        if self._eof:
+            return False
+        chunk = self._file.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos > len(self._buf) // 2:
+            if self.track_offsets:
+                self._advance(self._pos)
+                self._mark_pos = 0
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def _advance(self, pos):
+        """تقديم علامة الموضع (بايت، سطر) حتى pos في المخزن الحالي"""
+        segment = self._buf[self._mark_pos:pos]
+        self._mark_byte += len(segment.encode('utf-8'))
+        self._mark_line += segment.count('\n')
+        self._mark_pos = pos
+
+    def _skip_ws(self):
+        while True:
+            self._pos = _WS_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill(self.chunk_size):
+                return
+
+    def _peek(self):
+        self._skip_ws()
+        if self._pos >= len(self._buf):
+            raise ValueError(f"نهاية غير متوقعة للملف: {self.path}")
+        return self._buf[self._pos]
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"متوقع {char!r} في {self.path} وجد {self._buf[self._pos]!r}")
+        self._pos += 1
+
+    def _decode_value(self):
+        """فك قيمة JSON كاملة تبدأ عند الموضع الحالي"""
+        self._skip_ws()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                value = end = None
+            # الرقم في آخر المخزن قد يكون مقطوعاً، فلا نقبله قبل التأكد
+            if end is not None and (end < len(self._buf) or self._eof):
+                self._pos = end
+                return value
+            if not self._fill(size):
+                if end is not None:
+                    self._pos = end
+                    return value
+                raise ValueError(f"JSON غير صالح في {self.path}")
+            # مضاعفة حجم القراءة تجعل القيم الكبيرة خطية وليست تربيعية
+            size *= 2
+
+    # -- تحليل الكائن العلوي --------------------------------------------
+
+    def _read_fields(self, target, stop_at_products):
+        while True:
+            char = self._peek()
+            if char == '}':
+                self._pos += 1
+                self._state = 'done'
+                return
+            if char == ',':
+                self._pos += 1
+                continue
+            key = self._decode_value()
+            self._expect(':')
+            if stop_at_products and key == PRODUCTS_KEY and self._peek() == '[':
+                self._pos += 1
+                self.has_products = True
+                self._state = 'products'
+                return
+            target[key] = self._decode_value()
+
+    def products(self):
+        """توليد المنتجات واحداً تلو الآخر، ثم قراءة الحقول المتبقية في trailer"""
+        for _, _, product in self._products(False):
+            yield product
+
+    def products_with_offsets(self):
+        """توليد (إزاحة البايت، رقم السطر، المنتج) لكل منتج (يتطلب track_offsets)"""
+        if not self.track_offsets:
+            raise ValueError("StoreReader أنشئ بدون track_offsets")
+        return self._products(True)
+
+    def _products(self, offsets):
+        if self._state != 'products':
+            return
+        while True:
+            char = self._peek()
+            if char == ']':
+                self._pos += 1
+                break
+            if char == ',':
+                self._pos += 1
+                continue
+            if offsets:
+                self._advance(self._pos)
+                byte_offset, line = self._mark_byte, self._mark_line
+                yield byte_offset, line, self._decode_value()
+            else:
+                yield None, None, self._decode_value()
+        self._state = 'trailer'
+        self._read_fields(self.trailer, stop_at_products=False)
+
+    def batches(self, size):
+        """توليد المنتجات على دفعات (قوائم) بحجم size"""
+        batch = []
+        for product in self.products():
+            batch.append(product)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _dumps(value, indent):
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace('\n', '\n' + ' ' * indent)
+
+
+class StoreWriter:
+    """كاتب متدفق بنفس تنسيق json.dump(store, indent=2, ensure_ascii=False)
+
+    الاستخدام:
+        with StoreWriter(path, dist_path) as writer:
+            writer.write_fields(reader.header)
+            writer.begin_products()
+            for product in ...:
+                writer.write_product(product)
+            writer.end_products()
+            writer.write_fields(reader.trailer)
+
+    عند الإغلاق بدون أخطاء يُقارن الناتج بالملف الحالي ببصمته، ولا يُستبدل
+    الملف (ولا نسخة dist) إلا إذا اختلف. النتيجة في `written` و `mirrored`.
+    """
+
+    def __init__(self, path, dist_path=None, on_product=None):
+        self.path = Path(path)
+        self.dist_path = Path(dist_path) if dist_path is not None else None
+        self.on_product = on_product
+        self.written = self.mirrored = False
+        os.makedirs(self.path.parent, exist_ok=True)
+        self._tmp = temp_path(self.path)
+        self._file = open(self._tmp, 'wb')
+        self._hash = hashlib.sha1()
+        self._fields = 0
+        self._products = None
+        self._emit('{')
+
+    def _emit(self, text):
+        data = text.encode('utf-8')
+        self._hash.update(data)
+        self._file.write(data)
+
+    def _field_prefix(self):
+        self._emit(',\n  ' if self._fields else '\n  ')
+        self._fields += 1
+
+    def write_field(self, key, value):
+        self._field_prefix()
+        self._emit(f'{json.dumps(key, ensure_ascii=False)}: {_dumps(value, 2)}')
+
+    def write_fields(self, fields):
+        for key, value in fields.items():
+            self.write_field(key, value)
+
+    def begin_products(self):
+        self._field_prefix()
+        self._emit(f'{json.dumps(PRODUCTS_KEY)}: [')
+        self._products = 0
+
+    def write_product(self, product):
+        self._emit(',\n    ' if self._products else '\n    ')
+        self._emit(_dumps(product, 4))
+        self._products += 1
+        if self.on_product is not None:
+            self.on_product(product)
+
+    def end_products(self):
+        self._emit('\n  ]' if self._products else ']')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._file.close()
+            os.unlink(self._tmp)
+            return False
+        self.close()
+        return False
+
+    def close(self):
+        """إنهاء الكتابة واستبدال الملف إذا تغير المحتوى"""
+        self._emit('\n}' if self._fields else '}')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        digest = self._hash.hexdigest()
+
+        if file_sha1(self.path) == digest:
+            if self.dist_path is not None and file_sha1(self.dist_path) != digest:
+                self._copy_to_dist(self._tmp)
+                self.mirrored = True
+            os.unlink(self._tmp)
+            return
+
+        if self.dist_path is not None and file_sha1(self.dist_path) != digest:
+            self._copy_to_dist(self._tmp)
+            self.mirrored = True
+        os.replace(self._tmp, self.path)
+        self.written = True
+
+    def _copy_to_dist(self, source):
+        os.makedirs(self.dist_path.parent, exist_ok=True)
+        if reflink(source, self.dist_path):
+            return
+        tmp = temp_path(self.dist_path)
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, self.dist_path)
+
+
+def file_sha1(path):
+    """بصمة SHA-1 لملف بقراءة متدفقة، أو None إذا لم يكن موجوداً"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def iter_products(path):
+    """توليد منتجات ملف store.json بدون تحميله كاملاً"""
+    with StoreReader(path) as reader:
+        yield from reader.products()
+
+
+def rewrite_store(store_path, dist_path=None, transform=None, batch_size=10_000, snapshot=True,
+                  fields=None):
+    """إعادة كتابة store.json متدفقاً مع تمرير المنتجات على دفعات عبر transform
+
+    `transform(batches)` يستقبل مولد دفعات ويُعيد دفعات (بعد تعديلها في
+    مكانها عادة)، و `fields(dict)` يعدل الحقول العلوية والسفلية في مكانها
+    قبل كتابتها. تُحدَّث نسخة dist واللقطة العمودية بنفس المرور دون إعادة
+    قراءة الملف. تعيد زوج (تمت كتابة public، تمت كتابة dist).
+    """
+    builder = None
+    if snapshot:
+        from .snapshot import SnapshotBuilder
+        builder = SnapshotBuilder()
+
+    with StoreReader(store_path) as reader:
+        writer = StoreWriter(store_path, dist_path,
+                             on_product=builder.add if builder is not None else None)
+        with writer:
+            if fields is not None:
+                fields(reader.header)
+            writer.write_fields(reader.header)
+            if reader.has_products:
+                writer.begin_products()
+                batches = reader.batches(batch_size)
+                if transform is not None:
+                    batches = transform(batches)
+                for batch in batches:
+                    for product in batch:
+                        writer.write_product(product)
+                writer.end_products()
+                if fields is not None:
+                    fields(reader.trailer)
+                writer.write_fields(reader.trailer)
+
+    if builder is not None:
+        from .snapshot import refresh_or_discard
+        refresh_or_discard(store_path, force=writer.written, builder=builder)
+    return writer.written, writer.mirrored
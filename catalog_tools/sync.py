@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""مزامنة dist/assets مع public/assets على مستوى المنتجات.
+
+لكل متجر تُقارن بايتات public/<store>/store.json و dist/<store>/store.json
+أولاً؛ المتطابقان لا يُحللان. غير ذلك يُقرأ الملفان بالقارئ المتدفق ويُحسب
+فرق المنتجات حسب المعرف: منتجات مضافة، محذوفة، ومعدلة مع أسماء الحقول
+المتغيرة، إضافة إلى حقول المتجر العلوية. لا تُعاد كتابة نسخة dist إلا إذا
+وُجد فرق حقيقي في البيانات؛ اختلاف التنسيق وحده لا يكفي (إلا مع --exact).
+
+مع --json تُطبع قائمة الملفات التي تغيرت فعلاً، لترفع خطوة النشر
+(Vercel/Render) هذه الكتالوجات فقط وتبطل ذاكرتها المؤقتة.
+
+    python -m catalog_tools sync [--dry-run] [--store nawaem] [--json] [-j 0]
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import sys
+from collections import Counter
+
+from .parallel import add_jobs_argument, map_stores, resolve_jobs
+from .paths import DIST_ASSETS, ROOT
+from .registry import discover_stores
+from .storeio import mirror, read_bytes
+
+# عدد أسماء الحقول المعروضة في الملخص النصي لكل متجر
+TOP_FIELDS = 5
+
+_MISSING = object()
+
+
+def _key(product, position):
+    product_id = product.get('id')
+    return ('#', position) if product_id is None else product_id
+
+
+def _load_products(reader):
+    return {_key(product, position): product for position, product in enumerate(reader.products())}
+
+
+def _field_changes(old, new):
+    """أسماء الحقول المختلفة بين قاموسين (مضافة أو محذوفة أو متغيرة)"""
+    return sorted(key for key in old.keys() | new.keys() if old.get(key, _MISSING) != new.get(key, _MISSING))
+
+
+def diff_stores(public_path, dist_path):
+    """فرق المنتجات بين نسختي المتجر
+
+    يُحمَّل جانب dist فقط في الذاكرة، ومنتجات public تُقارن أثناء قراءتها.
+    """
+    from .stream import StoreReader
+
+    with StoreReader(dist_path) as reader:
+        old_products = _load_products(reader)
+        old_fields = {**reader.header, **reader.trailer}
+
+    added, changed = [], []
+    fields = Counter()
+    with StoreReader(public_path) as reader:
+        for position, product in enumerate(reader.products()):
+            key = _key(product, position)
+            old = old_products.pop(key, None)
+            if old is None:
+                added.append(key)
+            elif old != product:
+                changed.append(key)
+                fields.update(_field_changes(old, product))
+        new_fields = {**reader.header, **reader.trailer}
+
+    return {
+        'added': added,
+        'removed': list(old_products),
+        'changed': changed,
+        'fields': dict(fields.most_common()),
+        'storeFields': _field_changes(old_fields, new_fields),
+    }
+
+
+def sync_store(folder, public_path, dist_path, apply=True, exact=False):
+    """مقارنة متجر واحد ونسخه إلى dist إذا اختلف، وإرجاع ملخص الفرق"""
+    result = {'store': folder, 'dist': os.path.relpath(dist_path, ROOT), 'status': 'same', 'written': False}
+    if not os.path.exists(dist_path):
+        result['status'] = 'new'
+    elif filecmp.cmp(public_path, dist_path, shallow=False):
+        return result
+    else:
+        result.update(diff_stores(public_path, dist_path))
+        differs = any(result[key] for key in ('added', 'removed', 'changed', 'storeFields'))
+        result['status'] = 'changed' if differs else 'format'
+        if not differs and not exact:
+            return result
+
+    if apply:
+        result['written'] = mirror(public_path, dist_path, read_bytes(public_path), verified=True)
+    return result
+
+
+def orphan_stores(folders, dist_dir=DIST_ASSETS):
+    """مجلدات dist التي فيها store.json بدون متجر مقابل في public"""
+    try:
+        names = sorted(entry.name for entry in os.scandir(dist_dir) if entry.is_dir())
+    except FileNotFoundError:
+        return []
+    return [name for name in names
+            if name not in folders and os.path.isfile(os.path.join(dist_dir, name, 'store.json'))]
+
+
+def sync(stores=None, apply=True, exact=False, jobs=1):
+    """مزامنة كل المتاجر (أو المحددة) وإرجاع الملخصات والأخطاء"""
+    entries = discover_stores()
+    if stores:
+        wanted = set(stores)
+        entries = [entry for entry in entries if entry.folder in wanted or entry.slug in wanted]
+    results = map_stores(sync_store,
+                         [(entry.folder, (entry.folder, entry.path, str(entry.dist_path), apply, exact))
+                          for entry in entries],
+                         jobs)
+    return {
+        'stores': [result.value for result in results if result.ok],
+        'errors': {result.key: result.error.split('\n', 1)[0] for result in results if not result.ok},
+        'orphans': [] if stores else orphan_stores({entry.folder for entry in entries}),
+    }
+
+
+def _describe(summary):
+    status = summary['status']
+    if status == 'same':
+        return "مطابق"
+    if status == 'new':
+        return "غير موجود في dist"
+    if status == 'format':
+        return "اختلاف في التنسيق فقط"
+    parts = [f"+{len(summary['added'])}", f"-{len(summary['removed'])}", f"~{len(summary['changed'])}"]
+    fields = list(summary['fields'].items())
+    if fields:
+        shown = ', '.join(f"{name}×{count}" for name, count in fields[:TOP_FIELDS])
+        parts.append(f"({shown}{', ...' if len(fields) > TOP_FIELDS else ''})")
+    if summary['storeFields']:
+        parts.append(f"حقول المتجر: {', '.join(summary['storeFields'])}")
+    return ' '.join(parts)
+
+
+def format_text(report, apply=True):
+    lines = []
+    for summary in report['stores']:
+        mark = '✅' if summary['status'] == 'same' else ('📝' if summary['written'] else '•')
+        lines.append(f"{mark} {summary['store']}: {_describe(summary)}")
+    for name in report['orphans']:
+        lines.append(f"WARNING - {name}: موجود في dist فقط")
+    for store, error in report['errors'].items():
+        lines.append(f"ERROR - {store}: {error}")
+    written = sum(summary['written'] for summary in report['stores'])
+    pending = sum(summary['status'] in ('new', 'changed') for summary in report['stores'])
+    if apply:
+        lines.append(f"تمت مزامنة {written} من {len(report['stores'])} متجر")
+    else:
+        lines.append(f"(تجربة) {pending} من {len(report['stores'])} متجر بحاجة للمزامنة")
+    return '\n'.join(lines) + '\n'
+
+
+def format_json(report):
+    stores = []
+    for summary in report['stores']:
+        summary = dict(summary)
+        for key in ('added', 'removed', 'changed'):
+            if key in summary:
+                summary[key] = [list(item) if isinstance(item, tuple) else item for item in summary[key]]
+        stores.append(summary)
+    # مع --dry-run: الملفات التي ستتغير عند المزامنة
+    changed = [summary['dist'] for summary in report['stores']
+               if summary['written'] or summary['status'] in ('new', 'changed')]
+    return json.dumps({'changed': changed, 'stores': stores, 'orphans': report['orphans'],
+                       'errors': report['errors']}, ensure_ascii=False, indent=2) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools sync',
+                                     description="مزامنة dist/assets مع public/assets للمتاجر المتغيرة فقط")
+    parser.add_argument('--dry-run', '-n', action='store_true', help="عرض الفروق بدون كتابة")
+    parser.add_argument('--exact', action='store_true', help="نسخ الملفات المختلفة في التنسيق فقط أيضاً")
+    parser.add_argument('--store', '-s', action='append', metavar='FOLDER',
+                        help="متجر محدد (يمكن تكراره)، الافتراضي كل المتاجر")
+    parser.add_argument('--json', action='store_true', help="مخرجات JSON مع قائمة الملفات المتغيرة")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    apply = not args.dry_run
+    report = sync(args.store, apply=apply, exact=args.exact, jobs=resolve_jobs(args.jobs))
+    sys.stdout.write(format_json(report) if args.json else format_text(report, apply))
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
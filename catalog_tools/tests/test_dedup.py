@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import json
+
+from catalog_tools import snapshot
+from catalog_tools.dedup import canonical_mapping, rewrite_store_refs
+
+
+def test_rewrite_points_duplicates_at_canonical(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_DIR', tmp_path / 'snapshots')
+    mapping = canonical_mapping([{'canonical': 'assets/banks/jumhouria.png',
+                                  'duplicates': ['assets/partners/jumhouria.png', 'assets/banks/fixed.png'],
+                                  'fixed': ['assets/banks/fixed.png']}])
+    assert mapping == {'assets/partners/jumhouria.png': 'assets/banks/jumhouria.png'}
+
+    store = {'logo': '/assets/partners/jumhouria.png?v=2',
+             'products': [{'id': 1, 'images': ['/assets/partners/jumhouria.png', '/assets/banks/fixed.png']}]}
+    path = tmp_path / 'store' / 'store.json'
+    path.parent.mkdir()
+    path.write_text(json.dumps(store, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    replaced, written = rewrite_store_refs(path, str(tmp_path / 'dist' / 'store.json'), mapping)
+
+    assert (replaced, written) == (2, True)
+    result = json.loads(path.read_text(encoding='utf-8'))
+    assert result['logo'] == '/assets/banks/jumhouria.png?v=2'
+    assert result['products'][0]['images'] == ['/assets/banks/jumhouria.png', '/assets/banks/fixed.png']
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from catalog_tools.derivatives import VARIANTS, product_images, variant_map, variant_name
+
+DIGESTS = {'assets/nawaem/dress1.jpg': 'a' * 40, 'assets/nawaem/dress2.jpg': 'b' * 40}
+
+
+def test_variant_map_accepts_every_images_shape():
+    products = [
+        {'images': '/assets/nawaem/dress1.jpg'},
+        {'images': ['/assets/nawaem/dress1.jpg', None, {'url': '/assets/nawaem/dress2.jpg'}]},
+        {'images': {'main': '/assets/nawaem/dress2.jpg'}, 'image': ['/assets/nawaem/dress1.jpg']},
+        {'images': None, 'image': '/assets/nawaem/dress1.jpg'},
+    ]
+    expected = {'/assets/nawaem/dress1.jpg': {name: '/' + variant_name('a' * 40, width)
+                                              for name, width in VARIANTS.items()}}
+    for product in products:
+        assert product_images(product) == {'assets/nawaem/dress1.jpg'}
+        assert variant_map(product, DIGESTS) == expected
+
+
+def test_variant_map_without_images():
+    assert variant_map({'images': 5}, DIGESTS) is None
+    assert product_images({}) == set()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import json
+import tracemalloc
+
+from catalog_tools.instrument import Recorder
+
+MB = 1024 * 1024
+
+
+def _records(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_nested_stage_keeps_parent_peak(tmp_path):
+    report = tmp_path / 'report.jsonl'
+    rec = Recorder('test', str(report))
+    try:
+        with rec.stage('outer'):
+            # ذروة المرحلة الأم قبل بدء المرحلة المتداخلة
+            big = bytearray(8 * MB)
+            del big
+            with rec.stage('inner'):
+                small = bytearray(MB)
+                del small
+        rec.finish()
+    finally:
+        tracemalloc.stop()
+
+    records = {r.get('stage', r['event']): r for r in _records(report)}
+    assert records['outer/inner']['peakBytes'] < 4 * MB
+    assert records['outer']['peakBytes'] >= 8 * MB
+    assert records['run']['peakBytes'] >= 8 * MB
+
+
+def test_run_peak_covers_earlier_stages(tmp_path):
+    report = tmp_path / 'report.jsonl'
+    rec = Recorder('test', str(report))
+    try:
+        with rec.stage('load'):
+            big = bytearray(8 * MB)
+            del big
+        with rec.stage('write'):
+            pass
+        rec.finish()
+    finally:
+        tracemalloc.stop()
+
+    records = {r.get('stage', r['event']): r for r in _records(report)}
+    assert records['write']['peakBytes'] < 4 * MB
+    assert records['run']['peakBytes'] >= 8 * MB
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from catalog_tools import snapshot
+from catalog_tools.storeio import save_store
+
+
+@pytest.fixture
+def store_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_DIR', tmp_path / 'snapshots')
+    path = tmp_path / 'nawaem' / 'store.json'
+    path.parent.mkdir()
+    return path
+
+
+def test_unrepresentable_numbers_do_not_break_save(store_path):
+    products = json.loads('[{"id": 1, "price": 1e400, "quantity": 3},'
+                          ' {"id": 1180591620717411303424, "price": 2.5, "quantity": "123456789012345678901234"},'
+                          ' {"id": "sku-1", "price": -1e400, "orders": 5}]')
+    assert save_store(store_path, {'products': products}) == (True, False)
+
+    with snapshot.open_snapshot(store_path) as snap:
+        assert list(snap.column('id')) == [1, snapshot.MISSING_ID, snapshot.MISSING_ID]
+        assert list(snap.column('price')) == [0.0, 2.5, 0.0]
+        assert list(snap.column('quantity')) == [3, 0, 0]
+        assert list(snap.column('orders')) == [0, 0, 5]
+
+
+def test_snapshot_failure_discards_stale_file(store_path, monkeypatch, capsys):
+    save_store(store_path, {'products': [{'id': 1}]})
+    target = snapshot.snapshot_path(store_path)
+    assert target.exists()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot, 'write_snapshot', fail)
+    assert save_store(store_path, {'products': [{'id': 2}]}) == (True, False)
+    assert json.loads(store_path.read_text(encoding='utf-8'))['products'] == [{'id': 2}]
+    assert not target.exists()
+    assert 'disk full' in capsys.readouterr().err
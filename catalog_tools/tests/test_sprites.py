@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from catalog_tools.sprites import PADDING, SCALE, _pad_to_scale, best_layout
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def test_layout_coordinates_are_whole_css_pixels():
+    images = [_pad_to_scale(Image.new('RGBA', size)) for size in [(119, 47), (96, 96), (33, 191), (192, 17)]]
+    assert all(img.width % SCALE == 0 and img.height % SCALE == 0 for img in images)
+
+    width, height, positions = best_layout([(img.width + PADDING, img.height + PADDING) for img in images])
+    values = [width, height] + [value for position in positions for value in position]
+    assert all(value % SCALE == 0 for value in values)
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from catalog_tools.statgen import STAT_FIELDS, fill_products
+
+
+def _stats(product):
+    return tuple(product[field] for field in STAT_FIELDS)
+
+
+def test_duplicate_and_missing_ids_get_distinct_stats():
+    products = [{'id': 7, 'inStock': True}, {'id': 7, 'inStock': True},
+                {'inStock': True}, {'id': None, 'inStock': True},
+                {'id': 'sku-1', 'inStock': True}, {'id': 'sku-1', 'inStock': True}]
+    fill_products(products, 'nawaem')
+    assert len({_stats(product) for product in products}) == len(products)
+
+
+def test_unique_ids_do_not_depend_on_order():
+    products = [{'id': i, 'inStock': True} for i in range(20)] + [{'id': 'sku-1', 'inStock': True}]
+    reordered = [dict(product) for product in reversed(products)]
+    fill_products(products, 'nawaem')
+    fill_products(reordered, 'nawaem')
+    by_id = {product['id']: _stats(product) for product in reordered}
+    assert all(by_id[product['id']] == _stats(product) for product in products)
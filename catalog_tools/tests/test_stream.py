@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from catalog_tools.stream import StoreReader, StoreWriter, rewrite_store
+
+
+def _store(count):
+    return {
+        'id': 7,
+        'slug': 'nawaem',
+        'name': 'نواعم',
+        'products': [
+            {'id': i, 'storeId': 7, 'name': f'فستان {i}', 'price': i + 0.5,
+             'colors': [{'name': 'أحمر', 'value': '#f00'}], 'tags': [] if i % 2 else ['جديد']}
+            for i in range(count)
+        ],
+        'sliderImages': [],
+        'status': 'active',
+    }
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n'])
+@pytest.mark.parametrize('chunk_size', [7, 1 << 16])
+def test_offsets_point_at_products(tmp_path, newline, chunk_size):
+    store = _store(40)
+    path = tmp_path / 'store.json'
+    path.write_bytes(json.dumps(store, ensure_ascii=False, indent=2).replace('\n', newline).encode('utf-8'))
+    data = path.read_bytes()
+
+    with StoreReader(path, chunk_size=chunk_size, track_offsets=True) as reader:
+        found = list(reader.products_with_offsets())
+        trailer = reader.trailer
+
+    assert [product for _, _, product in found] == store['products']
+    assert trailer == {'sliderImages': [], 'status': 'active'}
+    for offset, line, product in found:
+        assert data[offset:offset + 1] == b'{'
+        assert data.count(b'\n', 0, offset) + 1 == line
+        decoded, _ = json.JSONDecoder().raw_decode(data[offset:].decode('utf-8'))
+        assert decoded == product
+
+
+@pytest.mark.parametrize('store', [
+    _store(3),
+    _store(0),
+    {'id': 1, 'name': 'بدون منتجات', 'categories': [{}, [], {'a': [1, {'b': None}]}]},
+    {'products': [{}, {'nested': {'deep': [[], [{}], 'نص "مقتبس"\n']}}]},
+    {'products': []},
+])
+def test_writer_matches_json_dump(tmp_path, store):
+    expected = json.dumps(store, ensure_ascii=False, indent=2).encode('utf-8')
+    path = tmp_path / 'store.json'
+    # نفس المحتوى بتنسيق مختلف حتى تُعاد كتابته فعلاً
+    path.write_text(json.dumps(store, ensure_ascii=False), encoding='utf-8')
+
+    with StoreReader(path) as reader:
+        with StoreWriter(path, tmp_path / 'dist' / 'store.json') as writer:
+            writer.write_fields(reader.header)
+            if reader.has_products:
+                writer.begin_products()
+                for product in reader.products():
+                    writer.write_product(product)
+                writer.end_products()
+                writer.write_fields(reader.trailer)
+
+    assert writer.written and writer.mirrored
+    assert path.read_bytes() == expected
+    assert (tmp_path / 'dist' / 'store.json').read_bytes() == expected
+
+
+def test_rewrite_store_skips_unchanged(tmp_path):
+    path = tmp_path / 'store.json'
+    path.write_bytes(json.dumps(_store(5), ensure_ascii=False, indent=2).encode('utf-8'))
+    mtime_ns = path.stat().st_mtime_ns
+
+    assert rewrite_store(path, batch_size=2, snapshot=False) == (False, False)
+    assert path.stat().st_mtime_ns == mtime_ns
+    assert not list(tmp_path.glob('.*.tmp'))
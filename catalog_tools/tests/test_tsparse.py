@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from catalog_tools.tsparse import TSSyntaxError, parse_source
+
+SOURCE = '''const STORE = 2;
+export const products: Product[] = [
+  { id: 1, storeId: STORE, name: 'فستان', price: -5, tags: ['a', ,], colors: [{ name: "x" }] },
+  { id: 2, storeId: STORE, image: getImage('x'), name: 'تالف' },
+  { id: 3, storeId: 1, name: `قالب`, ...extra } as Product,
+];
+function helper() {
+  const local = 5;
+  return { id: 9, storeId: 9 };
+}
+const AFTER = 'ok';
+'''
+
+
+def test_products_and_recovery_after_unsupported_expression():
+    parsed = parse_source(SOURCE)
+    assert parsed['constants'] == {'STORE': 2, 'AFTER': 'ok'}
+    products = [entry['product'] for entry in parsed['products']]
+    # المصفوفة الأولى فشلت عند استدعاء الدالة، فلا يبقى منها شيء
+    assert products == []
+
+
+def test_offsets_and_lines():
+    text = "const a = 1;\nconst list = [\n  { id: 1, storeId: a, price: -2.5 },\n  { id: 'x', storeId: a },\n];\n"
+    parsed = parse_source(text)
+    assert [(entry['line'], entry['product']['id']) for entry in parsed['products']] == [(3, 1), (4, 'x')]
+    for entry in parsed['products']:
+        assert text[entry['offset']] == '{'
+    assert parsed['products'][0]['product'] == {'id': 1, 'storeId': 1, 'price': -2.5}
+
+
+def test_syntax_error_is_located():
+    with pytest.raises(TSSyntaxError) as info:
+        parse_source("const a = [\n  { id: 1, storeId: 2, name: 'open\n")
+    assert '(2:' in str(info.value)
@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+"""محلل لمجموعة TypeScript الجزئية المستخدمة في ملفات src/data/*.ts.
+
+يقرأ الملف في تمريرة خطية واحدة: محلل رموز (tokenizer) يتعامل مع النصوص
+والقوالب النصية (template literals) والتعليقات وتعابير regex، ثم محلل
+تنازلي يبني القيم الحرفية (كائنات، مصفوفات، نصوص، أرقام) لكل تعريف
+`const/let/var`. الثوابت البسيطة مثل MAGNA_BEAUTY_STORE_ID تُحل تلقائياً،
+وكل كائن يحتوي على id و storeId يُعتبر منتجاً.
+
+النتيجة تُخزن في .catalog-cache/ts مفتاحها وقت تعديل الملف وبصمته، فلا يعاد
+تحليل الملف إذا لم يتغير.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from .paths import CACHE_DIR, ROOT
+from .srcpos import SourceIndex
+from .storeio import write_if_changed
+
+TS_CACHE_DIR = CACHE_DIR / 'ts'
+CACHE_VERSION = 2
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<number>0[xX][0-9a-fA-F_]+|0[bB][01_]+|0[oO][0-7_]+
+               |(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?)
+  | (?P<name>[^\W\d][\w$]*|\$[\w$]*)
+  | (?P<punct>\.\.\.|=>|\?\?=?|\?\.|\*\*=?|===?|!==?|<<=?|>>>?=?|&&=?|\|\|=?|\+\+|--
+               |[<>+\-*/%&|^]=?|[{}\[\]();,:.?~!=@\#])
+''', re.S | re.X)
+
+_REGEX_RE = re.compile(r'/(?![*/])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# الرموز التي إذا سبقت "/" فهو بداية تعبير regex وليس قسمة
+_REGEX_PREFIX_KEYWORDS = frozenset(('return', 'typeof', 'case', 'do', 'else', 'in', 'of',
+                                    'new', 'delete', 'void', 'throw', 'instanceof', 'yield',
+                                    'await'))
+
+_ESCAPE_RE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)', re.S)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v',
+                   '0': '\0', '\n': '', '\r\n': ''}
+
+
+class TSSyntaxError(ValueError):
+    """خطأ في تحليل ملف TypeScript"""
+
+    def __init__(self, message, offset):
+        super().__init__(f"{message} (offset {offset})")
+        self.message = message
+        self.offset = offset
+        self.line = self.column = None
+
+    def locate(self, index):
+        """إضافة السطر والعمود للخطأ من فهرس مواضع النص"""
+        self.line, self.column = index.line_col(self.offset)
+        self.args = (f"{self.message} ({self.line}:{self.column})",)
+
+
+def _decode_escape(match):
+    seq = match.group(1)
+    if seq in _SIMPLE_ESCAPES:
+        return _SIMPLE_ESCAPES[seq]
+    if seq.startswith('u{'):
+        return chr(int(seq[2:-1], 16))
+    if seq[0] in 'ux' and len(seq) > 1:
+        return chr(int(seq[1:], 16))
+    return seq
+
+
+def unquote(raw):
+    """فك علامات التنصيص والهروب من نص JS/TS"""
+    return _ESCAPE_RE.sub(_decode_escape, raw[1:-1])
+
+
+def _scan_template(text, pos):
+    """إيجاد نهاية قالب نصي يبدأ عند pos مع دعم ${...} المتداخلة"""
+    end = len(text)
+    i = pos + 1
+    while i < end:
+        ch = text[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '`':
+            return i + 1
+        if ch == '$' and i + 1 < end and text[i + 1] == '{':
+            i = _scan_interpolation(text, i + 2)
+            continue
+        i += 1
+    raise TSSyntaxError("قالب نصي غير مغلق", pos)
+
+
+def _scan_interpolation(text, pos):
+    """تخطي محتوى ${...} وإرجاع الموقع بعد القوس المغلق"""
+    depth = 1
+    for kind, value, start in tokenize(text, pos):
+        if value == '{':
+            depth += 1
+        elif value == '}':
+            depth -= 1
+            if depth == 0:
+                return start + 1
+    raise TSSyntaxError("تعبير ${ غير مغلق", pos)
+
+
+def tokenize(text, pos=0):
+    """توليد الرموز (kind, value, offset) مع تجاهل المسافات والتعليقات
+
+    الأنواع: string, template, regex, number, name, punct.
+    """
+    end = len(text)
+    prev = None
+    match_at = _TOKEN_RE.match
+    while pos < end:
+        ch = text[pos]
+        if ch == '`':
+            stop = _scan_template(text, pos)
+            yield 'template', text[pos:stop], pos
+            prev = ('template', None)
+            pos = stop
+            continue
+        if ch == '/' and _regex_allowed(prev):
+            m = _REGEX_RE.match(text, pos)
+            if m:
+                yield 'regex', m.group(), pos
+                prev = ('regex', None)
+                pos = m.end()
+                continue
+        m = match_at(text, pos)
+        if m is None:
+            raise TSSyntaxError(f"رمز غير متوقع {ch!r}", pos)
+        kind = m.lastgroup
+        if kind != 'ws' and kind != 'comment':
+            value = m.group()
+            yield kind, value, pos
+            prev = (kind, value)
+        pos = m.end()
+
+
+def _regex_allowed(prev):
+    if prev is None:
+        return True
+    kind, value = prev
+    if kind == 'punct':
+        return value not in (')', ']', '}', '++', '--')
+    if kind == 'name':
+        return value in _REGEX_PREFIX_KEYWORDS
+    return False
+
+
+def _parse_number(raw):
+    raw = raw.replace('_', '').rstrip('n')
+    if raw[:2] in ('0x', '0X'):
+        return int(raw, 16)
+    if raw[:2] in ('0b', '0B'):
+        return int(raw, 2)
+    if raw[:2] in ('0o', '0O'):
+        return int(raw, 8)
+    value = float(raw)
+    return int(value) if value.is_integer() and not any(c in raw for c in '.eE') else value
+
+
+class _Unsupported(Exception):
+    """تعبير خارج المجموعة الجزئية المدعومة (استدعاء دالة، دالة سهمية ...)"""
+
+    def __init__(self, offset):
+        super().__init__(offset)
+        self.offset = offset
+
+
+_LITERAL_NAMES = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+
+_EOF = ('eof', None, -1)
+
+
+class _TokenStream:
+    """الرموز من المولد مع رمز واحد للنظر المسبق، دون بناء قائمة بها
+
+    يتتبع عمق الأقواس {} لكل ما استُهلك، فيعرف المحلل هل التعريف التالي
+    في المستوى الأعلى حتى بعد تعريف فشل تحليله داخل أقواس مفتوحة.
+    """
+
+    def __init__(self, tokens):
+        self._next = iter(tokens).__next__
+        self.depth = 0
+        self.current = self._pull()
+
+    def _pull(self):
+        try:
+            return self._next()
+        except StopIteration:
+            return _EOF
+
+    def advance(self):
+        """استهلاك الرمز الحالي وإرجاعه"""
+        token = self.current
+        if token[0] == 'punct':
+            if token[1] == '{':
+                self.depth += 1
+            elif token[1] == '}' and self.depth:
+                self.depth -= 1
+        self.current = self._pull()
+        return token
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = _TokenStream(tokens)
+        self.constants = {}
+        self.products = []
+
+    def parse(self):
+        tokens = self.tokens
+        while tokens.current is not _EOF:
+            kind, value, _ = tokens.advance()
+            if kind == 'name' and value in ('const', 'let', 'var') and tokens.current[0] == 'name':
+                self._declaration(top_level=tokens.depth == 0)
+
+    def _declaration(self, top_level=True):
+        tokens = self.tokens
+        name = tokens.advance()[1]
+        self._skip_type(('=', ';'))
+        if tokens.current[1] != '=':
+            return
+        tokens.advance()
+        mark = len(self.products)
+        try:
+            value = self._value()
+        except _Unsupported:
+            # نتائج التعريف الجزئي غير موثوقة، والتحليل يستمر من موضع الفشل
+            del self.products[mark:]
+            return
+        # الثوابت المحلية داخل الدوال لا تُستخدم لحل المعرفات
+        if top_level and not isinstance(value, (dict, list)):
+            self.constants[name] = value
+
+    def _skip_type(self, stops):
+        """تخطي تعليق نوع TS (`: Product[]` أو `as const`) حتى أحد رموز التوقف"""
+        tokens = self.tokens
+        depth = 0
+        while tokens.current is not _EOF:
+            kind, value, _ = tokens.current
+            if depth == 0 and kind == 'punct' and value in stops:
+                return
+            if kind == 'punct':
+                if value in ('(', '[', '{', '<'):
+                    depth += 1
+                elif value in (')', ']', '}'):
+                    depth -= 1
+                elif value in ('>', '>>', '>>>'):
+                    # إغلاق أنواع عامة متداخلة مثل Array<Array<T>>
+                    depth -= len(value)
+                if depth < 0:
+                    return
+            tokens.advance()
+
+    def _value(self):
+        tokens = self.tokens
+        kind, value, _ = tokens.current
+        if kind == 'punct':
+            if value == '{':
+                result = self._object()
+            elif value == '[':
+                result = self._array()
+            elif value in ('-', '+'):
+                tokens.advance()
+                if tokens.current[0] != 'number':
+                    raise _Unsupported(tokens.current[2])
+                number = _parse_number(tokens.advance()[1])
+                result = -number if value == '-' else number
+            else:
+                raise _Unsupported(tokens.current[2])
+        elif kind in ('string', 'template'):
+            result = unquote(value)
+            tokens.advance()
+        elif kind == 'number':
+            result = _parse_number(value)
+            tokens.advance()
+        elif kind == 'name':
+            if value in _LITERAL_NAMES:
+                result = _LITERAL_NAMES[value]
+            elif value in self.constants:
+                result = self.constants[value]
+            else:
+                result = {'$ref': value}
+            tokens.advance()
+            if tokens.current[1] in ('(', '.', '?.', '=>', '['):
+                raise _Unsupported(tokens.current[2])
+        else:
+            raise _Unsupported(tokens.current[2])
+
+        # `as Type` و `satisfies Type` بعد القيمة
+        if tokens.current[0] == 'name' and tokens.current[1] in ('as', 'satisfies'):
+            tokens.advance()
+            self._skip_type((',', ']', '}', ';', ')'))
+        return result
+
+    def _object(self):
+        tokens = self.tokens
+        start = tokens.advance()[2]
+        result = {}
+        while True:
+            kind, value, offset = tokens.current
+            if kind == 'eof':
+                raise _Unsupported(offset)
+            if value == '}' and kind == 'punct':
+                tokens.advance()
+                break
+            if value == '...' and kind == 'punct':
+                tokens.advance()
+                result.setdefault('$spread', []).append(self._value())
+            else:
+                if kind in ('name', 'number'):
+                    key = value
+                elif kind == 'string':
+                    key = unquote(value)
+                else:
+                    raise _Unsupported(offset)
+                tokens.advance()
+                if tokens.current[1] == '?':
+                    tokens.advance()
+                nxt = tokens.current[1]
+                if nxt == ':':
+                    tokens.advance()
+                    result[key] = self._value()
+                elif nxt in (',', '}') and kind == 'name':
+                    # اختصار {name} يعني {name: name}
+                    result[key] = self.constants.get(key, {'$ref': key})
+                else:
+                    raise _Unsupported(tokens.current[2])
+            if tokens.current[1] == ',':
+                tokens.advance()
+            elif tokens.current[1] != '}':
+                raise _Unsupported(tokens.current[2])
+        if 'id' in result and 'storeId' in result:
+            self.products.append((start, result))
+        return result
+
+    def _array(self):
+        tokens = self.tokens
+        tokens.advance()
+        result = []
+        while True:
+            kind, value, offset = tokens.current
+            if kind == 'eof':
+                raise _Unsupported(offset)
+            if value == ']':
+                tokens.advance()
+                return result
+            if value == ',':
+                result.append(None)
+                tokens.advance()
+                continue
+            if value == '...':
+                tokens.advance()
+                result.append({'$spread': self._value()})
+            else:
+                result.append(self._value())
+            if tokens.current[1] == ',':
+                tokens.advance()
+            elif tokens.current[1] != ']':
+                raise _Unsupported(tokens.current[2])
+
+
+def parse_source(text):
+    """تحليل نص ملف TS وإرجاع الثوابت والمنتجات مع موضع كل منتج في النص
+
+    تعيد قاموساً:
+        {'constants': {...}, 'products': [{'offset': n, 'line': l, 'product': {...}}]}
+    """
+    index = SourceIndex(text)
+    parser = _Parser(tokenize(text))
+    try:
+        parser.parse()
+    except TSSyntaxError as exc:
+        exc.locate(index)
+        raise
+    return {
+        'constants': parser.constants,
+        'products': [{'offset': offset, 'line': index.line_of(offset), 'product': product}
+                     for offset, product in parser.products],
+    }
+
+
+def _cache_path(path):
+    try:
+        name = Path(path).resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        name = Path(path).resolve().as_posix().lstrip('/')
+    return TS_CACHE_DIR / (name.replace('/', '__') + '.json')
+
+
+def load_parsed(path, use_cache=True):
+    """تحليل ملف TS مع استخدام النسخة المخزنة إن لم يتغير الملف"""
+    path = Path(path)
+    stat = path.stat()
+    cache_path = _cache_path(path)
+    cached = None
+    if use_cache:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cached = None
+        if cached is not None and cached.get('version') != CACHE_VERSION:
+            cached = None
+        if (cached is not None and cached['mtime_ns'] == stat.st_mtime_ns
+                and cached['size'] == stat.st_size):
+            return cached['result']
+
+    data = path.read_bytes()
+    digest = hashlib.sha1(data).hexdigest()
+    if cached is not None and cached['sha1'] == digest:
+        # تغير وقت التعديل فقط (checkout مثلاً) والمحتوى نفسه
+        result = cached['result']
+    else:
+        result = parse_source(data.decode('utf-8'))
+
+    if use_cache:
+        # ذرياً: عدة عمليات (idindex، populate_stores، --jobs) قد تحلل نفس الملف
+        payload = json.dumps({'version': CACHE_VERSION, 'mtime_ns': stat.st_mtime_ns,
+                              'size': stat.st_size, 'sha1': digest, 'result': result},
+                             ensure_ascii=False).encode('utf-8')
+        write_if_changed(cache_path, payload)
+    return result
+
+
+def iter_products(path, use_cache=True):
+    """توليد قواميس المنتجات المعرفة حرفياً في ملف TS"""
+    for entry in load_parsed(path, use_cache)['products']:
+        yield entry['product']
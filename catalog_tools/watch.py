@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""وضع المراقبة: إعادة حساب الشارات ونسخة dist عند تعديل ملفات المتاجر.
+
+يراقب public/assets/*/store.json، عبر inotify في لينكس (بـ ctypes بدون
+مكتبات إضافية) أو بفحص دوري لأوقات التعديل في الأنظمة الأخرى. الأحداث
+المتتابعة تُجمع (debounce) حتى يهدأ الملف، ثم يُعاد حساب شارات المتجر
+المتغير فقط (apply_badges.rebadge_store) وتُحدَّث نسخته في dist.
+
+ملفات src/data/*.ts لا تُراقب: لا يوجد مسار يكتب منتجاتها في store.json
+(generate_store_json يعيد حساب الشارات من store.json فقط)، فإعادة الحساب
+عند تعديلها لا تغير شيئاً.
+
+كتابات المراقب نفسه لا تُعاد معالجتها: بعد كل معالجة يُسجل حجم الملف ووقت
+تعديله، والحدث الذي يطابق التسجيل يُتجاهل.
+
+    python -m catalog_tools watch [--poll] [--debounce 0.5] [--full]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from .paths import PUBLIC_ASSETS, ROOT
+
+STORE_FILE = 'store.json'
+
+DEBOUNCE_SECONDS = 0.5
+# أقصى انتظار لهدوء الأحداث أثناء تعديل متواصل قبل المعالجة
+MAX_DELAY_SECONDS = 5.0
+POLL_INTERVAL = 1.0
+
+# ثوابت inotify من <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+_FILE_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+_DIR_MASK = IN_CREATE | IN_MOVED_TO
+
+
+def _stat_key(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _watched_files():
+    from .registry import discover_stores
+
+    return [Path(entry.path) for entry in discover_stores()]
+
+
+class PollingWatcher:
+    """فحص دوري لحجم ووقت تعديل الملفات المراقبة"""
+
+    name = 'polling'
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.state = {path: _stat_key(path) for path in _watched_files()}
+
+    def close(self):
+        pass
+
+    def wait(self, timeout=None):
+        """مجموعة الملفات التي تغيرت (فارغة بعد انتهاء timeout)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in _watched_files():
+                key = _stat_key(path)
+                if self.state.get(path) != key:
+                    self.state[path] = key
+                    if key is not None:
+                        changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            delay = self.interval if deadline is None else min(self.interval, max(0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+
+class InotifyWatcher:
+    """أحداث inotify لمجلد assets ومجلدات المتاجر"""
+
+    name = 'inotify'
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or libc_name is None:
+            raise OSError("inotify غير متاح في هذا النظام")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 فشل")
+        self.dirs = {}
+        self._add(PUBLIC_ASSETS, _DIR_MASK)
+        for entry in os.scandir(PUBLIC_ASSETS):
+            if entry.is_dir():
+                self._add(entry.path, _FILE_MASK)
+
+    def _add(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch فشل: {path}")
+        self.dirs[wd] = Path(path)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _read_events(self):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b'\0')
+            pos += length
+            yield wd, mask, os.fsdecode(name)
+
+    def wait(self, timeout=None):
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return changed
+        for wd, mask, name in self._read_events():
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+            if directory == PUBLIC_ASSETS:
+                # مجلد متجر جديد: مراقبته، وقد يكون store.json قد كُتب قبل إضافة المراقبة
+                if mask & IN_ISDIR:
+                    self._add(path, _FILE_MASK)
+                    if (path / STORE_FILE).exists():
+                        changed.add(path / STORE_FILE)
+            elif name == STORE_FILE:
+                changed.add(path)
+        return changed
+
+
+def make_watcher(poll=False, interval=POLL_INTERVAL):
+    """inotify إن كان متاحاً وإلا الفحص الدوري"""
+    if not poll:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(interval)
+
+
+def debounced(watcher, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+    """دفعات الملفات المتغيرة بعد هدوء الأحداث لمدة debounce"""
+    while True:
+        changed = watcher.wait()
+        started = time.monotonic()
+        while time.monotonic() - started < max_delay:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
+
+
+class StoreWatch:
+    """معالجة دفعات التغيير مع تجاهل كتابات المراقب نفسه"""
+
+    def __init__(self, full=False):
+        self.full = full
+        self.own_writes = {}
+
+    def stores_for(self, paths):
+        folders = set()
+        for path in paths:
+            if path.name == STORE_FILE:
+                if self.own_writes.get(path) == _stat_key(path):
+                    continue
+                folders.add(path.parent.name)
+        return folders
+
+    def handle(self, paths):
+        """إعادة حساب المتاجر المتأثرة بالملفات المتغيرة، وإرجاع عددها"""
+        from apply_badges import describe_result, rebadge_store
+
+        folders = sorted(self.stores_for(paths))
+        for folder in folders:
+            store_path = PUBLIC_ASSETS / folder / STORE_FILE
+            started = time.perf_counter()
+            try:
+                result = rebadge_store(folder, self.full)
+            except Exception as e:
+                print(f"ERROR - {folder}: {e}")
+                continue
+            finally:
+                self.own_writes[store_path] = _stat_key(store_path)
+            elapsed = time.perf_counter() - started
+            print(f"OK - {folder}: {describe_result(result)} ({elapsed:.2f}s)")
+        return len(folders)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m catalog_tools watch',
+                                     description="مراقبة ملفات المتاجر وإعادة حساب الشارات عند تغيرها")
+    parser.add_argument('--poll', action='store_true', help="الفحص الدوري بدلاً من inotify")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help="الفترة بين الفحوص بالثواني مع --poll")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help="مدة الهدوء قبل المعالجة بالثواني")
+    parser.add_argument('--full', action='store_true',
+                        help="إعادة حساب كل منتجات المتجر المتغير وتجاهل بيان الشارات")
+    args = parser.parse_args(argv)
+
+    root = str(ROOT)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    os.chdir(root)
+
+    watcher = make_watcher(args.poll, args.interval)
+    state = StoreWatch(args.full)
+    print(f"مراقبة {PUBLIC_ASSETS.relative_to(ROOT)}/*/{STORE_FILE}"
+          f" ({watcher.name})، Ctrl+C للإيقاف", flush=True)
+    try:
+        for paths in debounced(watcher, args.debounce):
+            if state.handle(paths):
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
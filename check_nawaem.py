@@ -1,31 +1,44 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
-import sys
-import io
+import argparse
 
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from catalog_tools import instrument
+from catalog_tools.console import utf8_stdout
+from catalog_tools.snapshot import open_snapshot
 
-with open('public/assets/nawaem/store.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+def main(argv=None):
+    """فحص شارات وكميات منتجات نواعم"""
+    utf8_stdout()
+    parser = argparse.ArgumentParser(description="فحص شارات وكميات منتجات نواعم")
+    instrument.add_report_argument(parser)
+    args = parser.parse_args(argv)
+    instrument.configure('check_nawaem', args.report)
+    
+    with instrument.stage('snapshot'), open_snapshot('public/assets/nawaem/store.json') as snapshot:
+        names = snapshot.strings('name')
+        badges = snapshot.strings('badge')
+        quantities = list(snapshot.column('quantity'))
+        instrument.count('products', len(snapshot))
+    
+    print('🔍 فحص منتجات نواعم (عينة):')
+    print('=' * 80)
+    
+    unavailable = []
+    for name, badge, quantity in zip(names, badges, quantities):
+        badge = badge or 'جديد'
+        if badge == 'غير متوفر':
+            status = '⚠️'
+            unavailable.append((name, quantity))
+        else:
+            status = '✅'
+        print(f'{status} {name[:35]:35} | الكمية: {quantity:2} | الشارة: {badge}')
+    
+    print('=' * 80)
+    if unavailable:
+        print(f'\n⚠️  المنتجات غير المتوفرة ({len(unavailable)}):')
+        for name, quantity in unavailable:
+            print(f'   • {name} - الكمية: {quantity}')
 
-print('🔍 فحص منتجات نواعم (عينة):')
-print('=' * 80)
-
-unavailable = []
-for product in data['products']:
-    quantity = product.get('quantity', 0)
-    badge = product.get('badge', 'جديد')
-    if badge == 'غير متوفر':
-        status = '⚠️'
-        unavailable.append(product)
-    else:
-        status = '✅'
-    print(f'{status} {product["name"][:35]:35} | الكمية: {quantity:2} | الشارة: {badge}')
-
-print('=' * 80)
-if unavailable:
-    print(f'\n⚠️  المنتجات غير المتوفرة ({len(unavailable)}):')
-    for product in unavailable:
-        print(f'   • {product["name"]} - الكمية: {product.get("quantity", 0)}')
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,39 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
-import sys
-import io
+import argparse
 
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from catalog_tools import instrument
+from catalog_tools.console import utf8_stdout
+from catalog_tools.snapshot import open_snapshot
 
-with open('public/assets/pretty/store.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+def main(argv=None):
+    """فحص كميات وشارات جميع منتجات بريتي"""
+    utf8_stdout()
+    parser = argparse.ArgumentParser(description="فحص كميات وشارات جميع منتجات بريتي")
+    instrument.add_report_argument(parser)
+    args = parser.parse_args(argv)
+    instrument.configure('check_pretty', args.report)
+    
+    with instrument.stage('snapshot'), open_snapshot('public/assets/pretty/store.json') as snapshot:
+        names = snapshot.strings('name')
+        badges = snapshot.strings('badge')
+        quantities = list(snapshot.column('quantity'))
+        instrument.count('products', len(snapshot))
+    
+    print('🔍 فحص جميع منتجات بريتي:')
+    print('=' * 80)
+    
+    for name, badge, quantity in zip(names, badges, quantities):
+        badge = badge or 'جديد'
+        status = '✅' if quantity > 0 else '❌'
+        print(f'{status} {name[:35]:35} | الكمية: {quantity:2} | الشارة: {badge}')
+    
+    print('=' * 80)
+    print('\nملخص:')
+    print(f'إجمالي المنتجات: {len(quantities)}')
+    print(f'المنتجات المتوفرة: {len([q for q in quantities if q > 0])}')
+    print(f'المنتجات غير المتوفرة: {len([q for q in quantities if q <= 0])}')
 
-print('🔍 فحص جميع منتجات بريتي:')
-print('=' * 80)
-
-for product in data['products']:
-    quantity = product.get('quantity', 0)
-    badge = product.get('badge', 'جديد')
-    status = '✅' if quantity > 0 else '❌'
-    print(f'{status} {product["name"][:35]:35} | الكمية: {quantity:2} | الشارة: {badge}')
-
-print('=' * 80)
-print('\nملخص:')
-quantities = [p.get('quantity', 0) for p in data['products']]
-print(f'إجمالي المنتجات: {len(quantities)}')
-print(f'المنتجات المتوفرة: {len([q for q in quantities if q > 0])}')
-print(f'المنتجات غير المتوفرة: {len([q for q in quantities if q <= 0])}')
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,29 @@
 # -*- coding: utf-8 -*-
-import codecs
+"""حذف قسم شرائح العرض القديم (المكتوب مباشرة في الصفحة) من EnhancedMerchantDashboard.tsx
 
-# قراءة الملف
-with codecs.open('src/pages/EnhancedMerchantDashboard.tsx', 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+كان يحذف الأسطر 10417-11088 بأرقامها، فيحذف شيئاً آخر بمجرد تغير الأسطر قبله.
+الآن يُحدد القسم بمرساته وحدود كتلته، ويُتخطى إذا كان القسم الحالي هو
+SimplifiedSliderManager (أي أن الحذف طُبق مسبقاً).
+"""
 
-print(f"عدد الأسطر الأصلي: {len(lines)}")
+import sys
 
-# حذف الأسطر من 10417 إلى 11088 (0-indexed: 10416 إلى 11087)
-new_lines = lines[:10416] + lines[11088:]
+from catalog_tools.console import utf8_stdout
+from catalog_tools.splice import Edit, run
 
-print(f"عدد الأسطر بعد الحذف: {len(new_lines)}")
-print(f"تم حذف {len(lines) - len(new_lines)} سطر")
+FILE_PATH = 'src/pages/EnhancedMerchantDashboard.tsx'
 
-# كتابة الملف
-with codecs.open('src/pages/EnhancedMerchantDashboard.tsx', 'w', encoding='utf-8') as f:
-    f.writelines(new_lines)
+EDITS = [
+    Edit("{activeSection === 'settings-sliders' && (", block=True,
+         unless_contains='SimplifiedSliderManager', label="قسم settings-sliders القديم"),
+]
 
-print("تم الحذف بنجاح!")
+
+def main(argv=None):
+    utf8_stdout()
+    dry_run = '--dry-run' in (sys.argv[1:] if argv is None else argv)
+    return run(FILE_PATH, EDITS, dry_run=dry_run)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
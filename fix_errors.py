@@ -1,22 +1,45 @@
+# -*- coding: utf-8 -*-
+"""قواعد الإصلاح المتكررة في صفحات المتاجر كمجموعة قواعد codemod.
+
+كانت تُطبق على ModernStorePage.tsx بمسار ويندوز ثابت؛ الآن تعمل على كل src/
+والشروط (guards) تمنع لمس الملفات السليمة:
+
+    python fix_errors.py [--dry-run] [paths ...]
+    python -m catalog_tools codemod fix_errors
+"""
+
 import re
+import sys
+
+from catalog_tools.braces import scan
+from catalog_tools.codemod import Rule, RuleSet, main
+
+_IMPORTS_SLIDER_DATA = re.compile(r'\bimport\b[^;]*\bindeeshSliderData\b')
+
 
-file_path = r'c:\Users\dataf\Downloads\Eishro-Platform_V7\src\pages\ModernStorePage.tsx'
+def stale_slider_data(text):
+    """الملف يستخدم indeeshSliderData بدون استيرادها"""
+    return 'indeeshSliderData' in text and not _IMPORTS_SLIDER_DATA.search(text)
 
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
 
-# Fix 1: Remove indeeshSliderData references (lines 208-211)
-pattern1 = r'      if \(storeSlug === [\'"]indeesh["\']\) \{\s+console\.log\(`ℹ️ Loading indeesh slider data: \$\{indeeshSliderData\.length\} slides`\);\s+return indeeshSliderData;\s+\}'
-content = re.sub(pattern1, '', content)
+def unbalanced(text):
+    """الملف فيه أقواس غير متوازنة (لا يُلمس الملف السليم)"""
+    return scan(text) is not None
 
-# Fix 2: Fix the ternary operator ending - change ) :                         )}  to ) : null\n      }
-# This pattern finds the incorrect ternary closing
-pattern2 = r'        \)\s+\)}'
-content = re.sub(pattern2, '        ) : null\n      }', content)
 
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.write(content)
+RULES = RuleSet('fix_errors', [
+    # Fix 1: حذف فرع indeesh الذي يعيد indeeshSliderData بعد إزالة استيرادها
+    Rule('indeesh-slider-data',
+         r'[ \t]*if \(storeSlug === [\'"]indeesh[\'"]\) \{\s+console\.log\(`ℹ️ Loading indeesh slider data: '
+         r'\$\{indeeshSliderData\.length\} slides`\);\s+return indeeshSliderData;\s+\}\n?',
+         '', guard=stale_slider_data,
+         description="Removed indeeshSliderData references"),
+    # Fix 2: إغلاق الشرط الثلاثي الناقص ") )}" إلى ") : null }"
+    Rule('broken-ternary',
+         r'        \)\s+\)}',
+         '        ) : null\n      }', guard=unbalanced, files=('*.tsx',),
+         description="Fixed ternary operator syntax"),
+])
 
-print("Fixed both errors:")
-print("  1. Removed indeeshSliderData references")
-print("  2. Fixed ternary operator syntax")
+if __name__ == '__main__':
+    sys.exit(main(rule_set='fix_errors'))
@@ -1,21 +1,9 @@
-import codecs
+# -*- coding: utf-8 -*-
+"""نفس حذف delete_old_section.py (كانت نسخة بحدود أسطر أقدم: 10417-11020)"""
 
-file_path = r'src\pages\EnhancedMerchantDashboard.tsx'
+import sys
 
-# Read file
-with codecs.open(file_path, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+from delete_old_section import main
 
-print(f"Original lines: {len(lines)}")
-
-# Delete lines from 10417 to 11020 (0-indexed: 10416 to 11019)
-new_lines = lines[:10416] + lines[11020:]
-
-print(f"New lines: {len(new_lines)}")
-print(f"Deleted: {len(lines) - len(new_lines)} lines")
-
-# Write file
-with codecs.open(file_path, 'w', encoding='utf-8') as f:
-    f.writelines(new_lines)
-
-print("Done!")
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,46 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import json
-import sys
-import io
 
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-def calculate_badge(product):
-    """حساب الشارة بناءً على بيانات المنتج"""
-    quantity = product.get('quantity', 0)
-    views = product.get('views', 0)
-    likes = product.get('likes', 0)
-    orders = product.get('orders', 0)
-    original_price = product.get('originalPrice', 0)
-    price = product.get('price', 0)
-    
-    if quantity <= 0:
-        return 'غير متوفر'
-    
-    if quantity > 0 and quantity < 5:
-        return 'متوفر'
-    
-    discount_percent = ((original_price - price) / original_price * 100) if original_price > 0 else 0
-    if original_price > price and discount_percent > 10:
-        return 'تخفيضات'
-    
-    if orders > 100 and likes > 200:
-        return 'مميزة'
-    
-    if orders > 100:
-        return 'أكثر مبيعاً'
-    
-    if likes > 200:
-        return 'أكثر إعجاباً'
-    
-    if orders > 50:
-        return 'أكثر طلباً'
-    
-    if views > 400:
-        return 'أكثر مشاهدة'
-    
-    return 'جديد'
+from catalog_tools.badges import apply_badges, badge_summary
+from catalog_tools.console import utf8_stdout
+from catalog_tools.storeio import save_store
 
 pretty_products = [
     {
@@ -385,12 +349,13 @@ def load_json_file(path):
         print(f"❌ خطأ في تحميل {path}: {e}")
         return None
 
-def save_json_file(path, data):
-    """حفظ ملف JSON"""
+def save_json_file(path, data, dist_path=None):
+    """حفظ ملف JSON ذرياً مع نسخة dist اختيارية من نفس البايتات"""
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        save_store(path, data, dist_path)
         print(f"✅ تم حفظ: {path}")
+        if dist_path:
+            print(f"✅ تم تحديث: {dist_path}")
         return True
     except Exception as e:
         print(f"❌ خطأ في الحفظ {path}: {e}")
@@ -398,6 +363,7 @@ def save_json_file(path, data):
 
 def main():
     """البرنامج الرئيسي"""
+    utf8_stdout()
     print("🚀 بدء ملء متجر بريتي بالمنتجات...\n")
     
     pretty_path = 'public/assets/pretty/store.json'
@@ -410,25 +376,15 @@ def main():
     
     print(f"📋 جاري معالجة {len(pretty_products)} منتج لبريتي...")
     
+    apply_badges(pretty_products, profile='low_stock')
     for product in pretty_products:
-        badge = calculate_badge(product)
-        product['badge'] = badge
-        product['tags'] = [badge]
+        product['tags'] = [product['badge']]
     
     store_data['products'] = pretty_products
     
-    if save_json_file(pretty_path, store_data):
-        try:
-            with open(pretty_dist_path, 'w', encoding='utf-8') as f:
-                json.dump(store_data, f, ensure_ascii=False, indent=2)
-            print(f"✅ تم تحديث: {pretty_dist_path}")
-        except Exception as e:
-            print(f"⚠️  لم يتمكن من تحديث dist: {e}")
+    save_json_file(pretty_path, store_data, pretty_dist_path)
     
-    badges_summary = {}
-    for product in pretty_products:
-        badge = product.get('badge', 'جديد')
-        badges_summary[badge] = badges_summary.get(badge, 0) + 1
+    badges_summary = badge_summary(pretty_products)
     
     print("\n📊 ملخص الشارات:")
     for badge, count in sorted(badges_summary.items()):
@@ -1,16 +1,46 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import json
-import random
 from pathlib import Path
 import sys
+import argparse
 
-# Set UTF-8 encoding for output
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from catalog_tools import instrument
+from catalog_tools.console import utf8_stdout
+from catalog_tools.parallel import add_jobs_argument, map_stores, print_summary, resolve_jobs
+from catalog_tools.registry import discover_stores
+from catalog_tools.statgen import DEFAULT_SEED, fill_products, load_profile
+from catalog_tools.storeio import save_store
 
-def update_store(store_dir):
+def fill_missing_stats(store_dir, seed=DEFAULT_SEED, profile_path=None):
+    base_path = Path(__file__).parent / 'public' / 'assets' / store_dir / 'store.json'
+    
+    if not base_path.exists():
+        raise FileNotFoundError(f'File not found: {base_path}')
+    
+    with instrument.stage(f'store:{store_dir}'):
+        with instrument.stage('load'):
+            with open(base_path, 'r', encoding='utf-8') as f:
+                store = json.load(f)
+        
+        # القيم حتمية لكل (بذرة، متجر، منتج، حقل)، فإعادة التشغيل تعطي نفس الكتالوج
+        products = store.get('products', [])
+        with instrument.stage('generate'):
+            filled = fill_products(products, store_dir, seed,
+                                   load_profile(profile_path) if profile_path else None)
+        updated_count = filled.get('rating', 0)
+        for product in products:
+            if 'badge' not in product or product['badge'] is None:
+                product['badge'] = 'جديد'
+        
+        instrument.count('products', len(products))
+        instrument.count('statsFilled', sum(filled.values()))
+        with instrument.stage('save'):
+            save_store(base_path, store)
+    
+    return {'products': len(products), 'updated': updated_count, 'filled': filled}
+
+def update_store(store_dir, seed=DEFAULT_SEED, profile_path=None):
     base_path = Path(__file__).parent / 'public' / 'assets' / store_dir / 'store.json'
     
     print(f'Processing: {base_path}')
@@ -20,41 +50,41 @@ def update_store(store_dir):
         return False
     
     try:
-        with open(base_path, 'r', encoding='utf-8') as f:
-            store = json.load(f)
-        
-        updated_count = 0
-        for product in store.get('products', []):
-            if 'rating' not in product or product['rating'] is None:
-                product['rating'] = round(4 + random.random(), 1)
-                updated_count += 1
-            if 'reviews' not in product or product['reviews'] is None:
-                product['reviews'] = random.randint(10, 100)
-            if 'views' not in product or product['views'] is None:
-                product['views'] = random.randint(50, 450)
-            if 'likes' not in product or product['likes'] is None:
-                product['likes'] = random.randint(10, 300)
-            if 'orders' not in product or product['orders'] is None:
-                product['orders'] = random.randint(5, 150)
-            if 'quantity' not in product or product['quantity'] is None:
-                product['quantity'] = random.randint(5, 50) if product.get('inStock') else 0
-            if 'badge' not in product or product['badge'] is None:
-                product['badge'] = 'جديد'
-        
-        with open(base_path, 'w', encoding='utf-8') as f:
-            json.dump(store, f, ensure_ascii=False, indent=2)
-        
-        print(f'  [OK] Updated {store_dir} ({len(store.get("products", []))} products)')
+        result = fill_missing_stats(store_dir, seed, profile_path)
+        print(f'  [OK] Updated {store_dir} ({result["products"]} products{describe_filled(result)})')
         return True
     except Exception as e:
         print(f'  [ERROR] {str(e)}')
         return False
 
-if __name__ == '__main__':
+def describe_filled(result):
+    filled = ', '.join(f'{field}: {count}' for field, count in result['filled'].items())
+    return f'; filled {filled}' if filled else ''
+
+def main(argv=None):
+    # Set UTF-8 encoding for output
+    if sys.platform == 'win32':
+        utf8_stdout()
+    
+    parser = argparse.ArgumentParser(description='Fill missing product stats in store.json files')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help='seed for the generated stats (same seed = same values)')
+    parser.add_argument('--profile', help='JSON file overriding the stat distributions')
+    add_jobs_argument(parser)
+    instrument.add_report_argument(parser)
+    args = parser.parse_args(argv)
+    jobs = resolve_jobs(args.jobs)
+    instrument.configure('update_stores', args.report)
+    
+    store_dirs = [entry.folder for entry in discover_stores()]
     print('Starting store updates...\n')
-    results = [
-        update_store('nawaem'),
-        update_store('delta-store'),
-        update_store('indeesh')
-    ]
-    print(f'\n[DONE] {sum(results)}/{len(results)} stores updated successfully')
+    if jobs > 1:
+        results = map_stores(fill_missing_stats, [(d, (d, args.seed, args.profile)) for d in store_dirs], jobs)
+        succeeded = print_summary(results, lambda r: f'{r["products"]} products{describe_filled(r)}')
+        print(f'\n[DONE] {succeeded}/{len(results)} stores updated successfully')
+    else:
+        results = [update_store(d, args.seed, args.profile) for d in store_dirs]
+        print(f'\n[DONE] {sum(results)}/{len(results)} stores updated successfully')
+
+if __name__ == '__main__':
+    main()